@@ -0,0 +1,97 @@
+"""Compare SQLite insert throughput and file size for uuid4 and UUIDv7 keys.
+
+Writes the same completions into two fresh databases, one keyed with random
+uuid4 ids and one with time-ordered UUIDv7 ids, through
+SQLiteCompletionRepository.add_many, and prints inserts per second and the
+resulting file size.
+
+    poetry run python benchmarks/uuid_keys.py --completions 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from habit_tracker.domain import Completion, Habit, IdGenerator, Schedule, User, UUIDv7Generator
+from habit_tracker.infrastructure import (
+    SQLiteCompletionRepository,
+    SQLiteConnectionPool,
+    SQLiteHabitRepository,
+    SQLiteUserRepository,
+)
+
+
+class UUID4Generator(IdGenerator):
+    def new_id(self) -> UUID:
+        return uuid4()
+
+
+class _Clock:
+    def __init__(self, now: datetime) -> None:
+        self._now = now
+
+    def now(self) -> datetime:
+        return self._now
+
+
+def run(path: Path, ids: IdGenerator, completions: int, habits: int, batch_size: int) -> tuple[float, int]:
+    pool = SQLiteConnectionPool(str(path))
+    start = datetime(2020, 1, 1, tzinfo=UTC)
+    clock = _Clock(start + timedelta(days=completions))
+    user = User.create(email="bench@example.com", hashed_password="x", clock=clock, id_generator=ids)
+    SQLiteUserRepository(pool).add(user)
+    habit_repo = SQLiteHabitRepository(pool)
+    all_habits = [
+        Habit.create(name=f"h{i}", user_id=user.id, schedule=Schedule("daily"), clock=clock, id_generator=ids)[0]
+        for i in range(habits)
+    ]
+    for habit in all_habits:
+        habit_repo.add(habit)
+
+    completion_repo = SQLiteCompletionRepository(pool)
+    elapsed = 0.0
+    for first in range(0, completions, batch_size):
+        batch = [
+            Completion.record(
+                habit=all_habits[n % habits],
+                clock=clock,
+                completed_at=start + timedelta(minutes=n),
+                id_generator=ids,
+            )[0]
+            for n in range(first, min(first + batch_size, completions))
+        ]
+        began = time.perf_counter()
+        completion_repo.add_many(batch)
+        elapsed += time.perf_counter() - began
+
+    conn = pool.connection()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    pool.close()
+    size = path.stat().st_size
+    with sqlite3.connect(path) as check:
+        (count,) = check.execute("SELECT count(*) FROM completions").fetchone()
+    assert count == completions
+    return completions / elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--completions", type=int, default=1_000_000)
+    parser.add_argument("--habits", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, ids in (("uuid4", UUID4Generator()), ("uuid7", UUIDv7Generator())):
+            rate, size = run(Path(directory) / f"{name}.db", ids, args.completions, args.habits, args.batch_size)
+            print(f"{name}: {rate:,.0f} inserts/s, {size / 1_000_000:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,67 @@
-from .event_bus import EventBus
+from .dead_letters import ReplayResult, RetryingEventBus, RetryPolicy
+from .event_bus import EventBus, EventBusMetrics
+from .outbox import OutboxEventBus, OutboxRelay
+from .projections import ProjectionReplayer, ReplayClock
+from .reminder_dispatcher import ReminderDispatcher, ReminderNotifier
 from .repositories import (
     CompletionRepository,
+    DeadLetterRepository,
+    EventStore,
+    FailedDelivery,
     HabitRepository,
+    OutboxMessage,
+    OutboxRepository,
     ReminderRepository,
+    StoredEvent,
+    StreakRepository,
     UserRepository,
 )
-from .security import create_access_token, decode_access_token
+from .security import PasswordHasher, PasswordHasherBusyError, create_access_token, decode_access_token
 from .services import (
     AuthenticationService,
     EmailAlreadyRegisteredError,
     HabitTrackerService,
+    IncorrectPasswordError,
     UserRegistrationService,
 )
+from .streak_projection import StreakProjection
+from .token_cache import CachedToken, TokenCache
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "HabitRepository",
     "CompletionRepository",
+    "DeadLetterRepository",
+    "FailedDelivery",
     "ReminderRepository",
+    "StreakRepository",
     "HabitTrackerService",
     "EventBus",
+    "EventBusMetrics",
+    "EventStore",
+    "OutboxEventBus",
+    "OutboxMessage",
+    "OutboxRelay",
+    "OutboxRepository",
+    "ProjectionReplayer",
+    "ReminderDispatcher",
+    "ReminderNotifier",
+    "ReplayClock",
+    "ReplayResult",
+    "RetryingEventBus",
+    "RetryPolicy",
+    "StoredEvent",
+    "StreakProjection",
+    "TokenCache",
+    "CachedToken",
+    "UnitOfWork",
     "UserRepository",
     "UserRegistrationService",
     "EmailAlreadyRegisteredError",
+    "IncorrectPasswordError",
     "AuthenticationService",
+    "PasswordHasher",
+    "PasswordHasherBusyError",
     "create_access_token",
     "decode_access_token",
 ]
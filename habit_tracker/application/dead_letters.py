@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import traceback
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, TypeVar
+
+from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.events import DomainEvent
+
+from .event_bus import EventBus, handler_name
+from .repositories import DeadLetterRepository, FailedDelivery
+from .unit_of_work import UnitOfWork
+
+E = TypeVar("E", bound=DomainEvent)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff: base_delay after the first failure, multiplied by factor after each further one."""
+
+    base_delay: timedelta = timedelta(seconds=1)
+    factor: float = 2.0
+    max_delay: timedelta = timedelta(minutes=10)
+    # Failed attempts, the first delivery included, before automatic retries stop.
+    max_attempts: int = 10
+
+    def next_delay(self, attempts: int) -> timedelta | None:
+        """Delay before the next attempt after `attempts` failed ones, or None to stop retrying."""
+        if attempts >= self.max_attempts:
+            return None
+        return min(self.base_delay * self.factor ** (attempts - 1), self.max_delay)
+
+
+@dataclass
+class ReplayResult:
+    attempted: int = 0
+    succeeded: int = 0
+
+
+@dataclass
+class RetryingEventBus(EventBus):
+    """Event bus that keeps the events a handler raised on and retries them later.
+
+    Publishing and dispatch are left to `delivery_bus`; each subscribed handler
+    is wrapped so that an exception no longer propagates (nor stops the other
+    handlers) but stores the (event, handler) pair in `dead_letters`, in the
+    publisher's transaction. With a unit of work each call runs in a savepoint,
+    so what a failing handler wrote is rolled back before the pair is stored
+    and a retry does not apply it twice. retry_due() calls the handler again for the pairs
+    whose backoff has elapsed, following `policy`, and removes them once it
+    succeeds; run() does so in a loop, on a background thread. Pairs whose
+    retries are exhausted stay stored until replay() retries them on demand.
+
+    Failed events of a batch handler are stored and retried one by one.
+    Handlers are found again by handler_name(), so pairs stored by an earlier
+    process are retried once the same handlers have been subscribed.
+    """
+
+    delivery_bus: EventBus
+    dead_letters: DeadLetterRepository
+    clock: Clock
+    policy: RetryPolicy = field(default_factory=RetryPolicy)
+    unit_of_work: UnitOfWork | None = None
+    batch_size: int = 100
+    # handler_name() -> (subscribed handler, call with one event)
+    _handlers: dict[str, tuple[Any, Callable[[Any], None]]] = field(default_factory=dict, init=False)
+
+    def publish(self, event: DomainEvent) -> None:
+        self.delivery_bus.publish(event)
+
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        self.delivery_bus.publish_many(events)
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        name = self._register(handler, handler)
+
+        @functools.wraps(handler)
+        def guarded(event: E) -> None:
+            try:
+                with self._savepoint():
+                    handler(event)
+            except Exception as error:
+                self._dead_letter([event], name, error)
+
+        self.delivery_bus.subscribe(event_type, guarded)
+
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        name = self._register(handler, lambda event: handler([event]))
+
+        @functools.wraps(handler)
+        def guarded(events: Sequence[E]) -> None:
+            try:
+                with self._savepoint():
+                    handler(events)
+            except Exception as error:
+                self._dead_letter(events, name, error)
+
+        self.delivery_bus.subscribe_batch(event_type, guarded)
+
+    def retry_due(self) -> ReplayResult:
+        """Retry up to batch_size stored deliveries whose next attempt is due."""
+        return self._retry(self.dead_letters.list_due(self.clock.now(), self.batch_size))
+
+    def replay(self, delivery_ids: Sequence[int] | None = None) -> ReplayResult:
+        """Retry the given stored deliveries now, or the first batch_size of them, due or not."""
+        if delivery_ids is None:
+            return self._retry(self.dead_letters.list_all(self.batch_size))
+        return self._retry(self.dead_letters.get_many(delivery_ids))
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> None:
+        """Retry due deliveries every poll_interval seconds until `stop` is set."""
+        while not stop.is_set():
+            try:
+                self.retry_due()
+            except Exception:
+                logger.exception("Retrying failed event deliveries failed")
+            stop.wait(poll_interval)
+
+    def _register(self, handler: Any, call: Callable[[Any], None]) -> str:
+        name = handler_name(handler)
+        registered = self._handlers.get(name)
+        if registered is not None and registered[0] != handler:
+            raise ValueError(f"Another handler is already subscribed as {name}")
+        self._handlers[name] = (handler, call)
+        return name
+
+    def _dead_letter(self, events: Sequence[DomainEvent], name: str, error: Exception) -> None:
+        logger.warning("Handler %s failed on %d event(s); storing them for a retry", name, len(events), exc_info=error)
+        now = self.clock.now()
+        delay = self.policy.next_delay(1)
+        formatted = "".join(traceback.format_exception(error))
+        for event in events:
+            self.dead_letters.add(event, name, formatted, now, None if delay is None else now + delay)
+
+    def _retry(self, deliveries: Sequence[FailedDelivery]) -> ReplayResult:
+        result = ReplayResult()
+        for delivery in deliveries:
+            registered = self._handlers.get(delivery.handler)
+            if registered is None:
+                logger.warning("No handler %s is subscribed; keeping failed delivery %s", delivery.handler, delivery.id)
+                continue
+            result.attempted += 1
+            try:
+                with self._savepoint():
+                    registered[1](delivery.event)
+                    self.dead_letters.remove(delivery.id)
+            except Exception as error:
+                self._record_failure(delivery, error)
+            else:
+                result.succeeded += 1
+        return result
+
+    def _record_failure(self, delivery: FailedDelivery, error: Exception) -> None:
+        attempts = delivery.attempts + 1
+        now = self.clock.now()
+        delay = self.policy.next_delay(attempts)
+        if delay is None:
+            logger.error(
+                "Handler %s failed %d times on delivery %s; giving up", delivery.handler, attempts, delivery.id
+            )
+        formatted = "".join(traceback.format_exception(error))
+        with self._transaction():
+            self.dead_letters.record_failure(delivery.id, formatted, now, None if delay is None else now + delay)
+
+    def _transaction(self) -> AbstractContextManager[None]:
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.transaction()
+
+    def _savepoint(self) -> AbstractContextManager[None]:
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.savepoint()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Protocol, TypeVar
 
 from habit_tracker.domain.events import DomainEvent
@@ -18,6 +18,48 @@ class EventBus(Protocol):
         """Publish a single event to all subscribers interested in its type."""
         ...
 
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        """Publish several events, in order.
+
+        Handlers subscribed with `subscribe` are called once per event; each
+        batch handler is called once with all of the events it subscribed to.
+        """
+        ...
+
     def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
         """Subscribe a handler to a specific event type."""
         ...
+
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        """Subscribe a handler that receives a list of events of this type at a time.
+
+        publish() hands it a one-event list; publish_many() hands it every
+        matching event of the call at once, so it can handle them in one
+        repository round-trip.
+        """
+        ...
+
+
+def handler_name(handler: Callable[..., object]) -> str:
+    """Name a handler by its module and qualified name, e.g.
+    "habit_tracker.application.reminder_handlers.ReminderEventHandler.on_habit_created".
+    """
+    qualname = getattr(handler, "__qualname__", None)
+    if qualname is None:
+        return repr(handler)
+    return f"{getattr(handler, '__module__', None) or '?'}.{qualname}"
+
+
+class EventBusMetrics(Protocol):
+    """Hook through which event buses report what their handlers cost.
+
+    `handler` is the handler's handler_name().
+    """
+
+    def record_call(self, event_type: type[DomainEvent], handler: str, seconds: float, failed: bool) -> None:
+        """Record one handler call (for a batch handler, one call with a whole batch)."""
+        ...
+
+    def record_failure(self, events: Sequence[DomainEvent], handler: str, error: BaseException) -> None:
+        """Record the events a handler raised on, with the exception it raised."""
+        ...
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from typing import TypeVar
+
+from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.events import DomainEvent
+
+from .event_bus import EventBus
+from .repositories import OutboxMessage, OutboxRepository
+from .unit_of_work import UnitOfWork
+
+E = TypeVar("E", bound=DomainEvent)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxEventBus(EventBus):
+    """Event bus that stores published events in the outbox instead of delivering them.
+
+    Used as HabitTrackerService's bus, each event is written in the same
+    transaction as the entity it describes, so it survives a crash right after
+    the commit. OutboxRelay later hands it to `delivery_bus`, which is also
+    where subscriptions go.
+    """
+
+    outbox: OutboxRepository
+    delivery_bus: EventBus
+
+    def publish(self, event: DomainEvent) -> None:
+        self.outbox.add(event)
+
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        self.outbox.add_many(events)
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        self.delivery_bus.subscribe(event_type, handler)
+
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        self.delivery_bus.subscribe_batch(event_type, handler)
+
+
+@dataclass
+class OutboxRelay:
+    """Delivers outbox events to an event bus, at least once and in stored order.
+
+    Each batch hands up to batch_size pending events to the bus with one
+    publish_many() call, so batch handlers see them together, and then marks
+    them delivered with a single write. With a unit of work, what synchronous
+    handlers write commits together with those marks. If a handler raises,
+    the batch is rolled back and delivered again one event at a time, each in
+    a savepoint, so a failing delivery leaves no writes behind. Delivery stops
+    at the failing event, which is retried on the next batch; once it has
+    failed max_attempts times it is set aside in the outbox, with its error,
+    so the events behind it are no longer held up.
+
+    The delivery bus must run handlers before publish() returns; an event
+    handed to an asynchronous bus would be marked delivered before it is
+    handled.
+    """
+
+    outbox: OutboxRepository
+    event_bus: EventBus
+    clock: Clock
+    unit_of_work: UnitOfWork | None = None
+    batch_size: int = 100
+    max_attempts: int = 5
+
+    def relay_once(self) -> int:
+        """Deliver one batch of pending events; return how many were delivered."""
+        pending = self.outbox.list_pending(self.batch_size)
+        if not pending:
+            return 0
+
+        try:
+            with self._transaction():
+                self.event_bus.publish_many([message.event for message in pending])
+                self.outbox.mark_delivered([message.id for message in pending], self.clock.now())
+            return len(pending)
+        except Exception:
+            logger.exception("Failed to deliver %d outbox messages at once; delivering them one by one", len(pending))
+
+        delivered: list[int] = []
+        with self._transaction():
+            for message in pending:
+                try:
+                    with self._savepoint():
+                        self.event_bus.publish(message.event)
+                except Exception as error:
+                    if not self._record_failure(message, error):
+                        break
+                    continue
+                delivered.append(message.id)
+            self.outbox.mark_delivered(delivered, self.clock.now())
+        return len(delivered)
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> int:
+        """Relay until `stop` is set; return the total delivered.
+
+        Full batches are followed immediately by the next one; the loop only
+        sleeps for poll_interval once the outbox is empty or a delivery failed.
+        """
+        total = 0
+        while not stop.is_set():
+            delivered = self.relay_once()
+            total += delivered
+            if delivered < self.batch_size:
+                stop.wait(poll_interval)
+        return total
+
+    def _record_failure(self, message: OutboxMessage, error: Exception) -> bool:
+        """Count the failed attempt; return whether the message was given up on."""
+        give_up = message.attempts + 1 >= self.max_attempts
+        if give_up:
+            logger.error(
+                "Outbox message %s failed %d times; setting it aside",
+                message.id,
+                message.attempts + 1,
+                exc_info=error,
+            )
+        else:
+            logger.warning("Failed to deliver outbox message %s; it will be retried", message.id, exc_info=error)
+        formatted = "".join(traceback.format_exception(error))
+        self.outbox.record_failure(message.id, formatted, self.clock.now(), give_up)
+        return give_up
+
+    def _transaction(self) -> AbstractContextManager[None]:
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.transaction()
+
+    def _savepoint(self) -> AbstractContextManager[None]:
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.savepoint()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from habit_tracker.domain.events import DomainEvent
+
+from .event_bus import EventBus
+from .repositories import EventStore
+from .unit_of_work import UnitOfWork
+
+# Number of event store partitions; events of one habit always share one.
+PARTITIONS = 256
+
+
+def event_partition(event: DomainEvent) -> int:
+    """Return the event store partition of an event, from its habit_id.
+
+    Uses the id's last byte, which is random for both uuid4 and UUIDv7 ids;
+    events without a habit_id go to partition 0.
+    """
+    habit_id = getattr(event, "habit_id", None)
+    return 0 if habit_id is None else habit_id.bytes[-1] % PARTITIONS
+
+
+@dataclass
+class ReplayClock:
+    """Clock that reads the time of the event being replayed.
+
+    Handlers that stamp their writes with clock.now() then write what they
+    wrote when the event was first published.
+    """
+
+    current: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
+
+    def now(self) -> datetime:
+        return self.current
+
+
+@dataclass
+class ProjectionReplayer:
+    """Replays stored events through an event bus to rebuild projections.
+
+    The projections' handlers subscribe to event_bus with `clock` as their
+    clock. Events are read and published in chunks of chunk_size, one
+    transaction per chunk, and one at a time within it, so the clock reads
+    each event's occurred_at while its handlers run.
+    """
+
+    event_store: EventStore
+    event_bus: EventBus
+    clock: ReplayClock
+    unit_of_work: UnitOfWork | None = None
+    chunk_size: int = 1000
+
+    def replay_partition(self, partition: int) -> int:
+        """Publish every stored event of a partition, in order; return how many there were."""
+        replayed = 0
+        position = 0
+        while chunk := self.event_store.read(partition, after_position=position, limit=self.chunk_size):
+            with self._transaction():
+                for stored in chunk:
+                    self.clock.current = stored.event.occurred_at
+                    self.event_bus.publish(stored.event)
+            replayed += len(chunk)
+            position = chunk[-1].position
+        return replayed
+
+    def _transaction(self) -> AbstractContextManager[None]:
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.transaction()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Protocol
+from uuid import UUID, uuid4
+
+from habit_tracker.application.repositories import HabitRepository, ReminderRepository
+from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderNotifier(Protocol):
+    """Port for delivering a due reminder to the user (push, email, ...)."""
+
+    def notify(self, reminder: Reminder, habit: Habit) -> None:
+        """Deliver one reminder. Raising leaves it to be retried after its lease expires."""
+        ...
+
+
+def _default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+@dataclass
+class ReminderDispatcher:
+    """Delivers due reminders and schedules the next one.
+
+    Each batch leases up to batch_size due reminders to this worker, hands
+    them to the notifier and then stores the next due time of every
+    reminder that was delivered, releasing its lease. Several dispatchers can
+    share one database: a leased reminder is invisible to the others until
+    its lease runs out, which only happens if this worker dies or its
+    notifier fails.
+    """
+
+    reminder_repo: ReminderRepository
+    habit_repo: HabitRepository
+    notifier: ReminderNotifier
+    clock: Clock
+    batch_size: int = 100
+    lease: timedelta = timedelta(minutes=1)
+    worker_id: str = field(default_factory=_default_worker_id)
+
+    def dispatch_once(self) -> int:
+        """Dispatch one batch of due reminders; return how many were delivered."""
+        now = self.clock.now()
+        claimed = self.reminder_repo.claim_due(
+            now=now,
+            limit=self.batch_size,
+            worker_id=self.worker_id,
+            lease_until=now + self.lease,
+        )
+        if not claimed:
+            return 0
+
+        habits: dict[UUID, Habit] = {}
+        delivered: list[tuple[Reminder, datetime]] = []
+        for reminder in claimed:
+            habit = habits.get(reminder.habit_id)
+            if habit is None:
+                try:
+                    habit = self.habit_repo.get(reminder.habit_id)
+                except KeyError:
+                    logger.warning("Skipping reminder %s: habit %s not found", reminder.id, reminder.habit_id)
+                    continue
+                habits[habit.id] = habit
+
+            try:
+                self.notifier.notify(reminder, habit)
+            except Exception:
+                logger.exception("Failed to deliver reminder %s", reminder.id)
+                continue
+            delivered.append((reminder, habit.schedule.next_due_from(now)))
+
+        self.reminder_repo.complete_claimed(self.worker_id, delivered)
+        return len(delivered)
+
+    def run(self, stop: threading.Event, poll_interval: float = 1.0) -> int:
+        """Dispatch until `stop` is set; return the total delivered.
+
+        Full batches are followed immediately by the next one; the loop only
+        sleeps for poll_interval once nothing is due.
+        """
+        total = 0
+        while not stop.is_set():
+            delivered = self.dispatch_once()
+            total += delivered
+            if delivered < self.batch_size:
+                stop.wait(poll_interval)
+        return total
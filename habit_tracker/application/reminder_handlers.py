@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import Sequence
 from dataclasses import dataclass
-from uuid import uuid4
+from uuid import UUID
 
 from habit_tracker.application.repositories import HabitRepository, ReminderRepository
 from habit_tracker.domain.clock import Clock
 from habit_tracker.domain.events import HabitCompleted, HabitCreated
+from habit_tracker.domain.ids import IdGenerator, default_id_generator
 from habit_tracker.domain.reminder import Reminder
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ReminderEventHandler:
@@ -16,6 +21,7 @@ class ReminderEventHandler:
     habit_repo: HabitRepository
     reminder_repo: ReminderRepository
     clock: Clock
+    id_generator: IdGenerator = default_id_generator
 
     def on_habit_created(self, event: HabitCreated) -> None:
         """Create an initial reminder when a habit is created."""
@@ -28,7 +34,7 @@ class ReminderEventHandler:
             return
 
         reminder = Reminder(
-            id=uuid4(),
+            id=self.id_generator.new_id(),
             habit_id=habit.id,
             next_due_at=next_due,
             active=True,
@@ -37,19 +43,40 @@ class ReminderEventHandler:
 
     def on_habit_completed(self, event: HabitCompleted) -> None:
         """Move the next_due_at forward when the habit is completed."""
-        habit = self.habit_repo.get(event.habit_id)
+        self.on_habits_completed([event])
+
+    def on_habits_completed(self, events: Sequence[HabitCompleted]) -> None:
+        """Move next_due_at forward for every habit completed in a batch.
+
+        Habits and reminders are read and written once for the whole batch,
+        however many completions each habit has in it. Events of habits that
+        no longer exist are skipped, so they do not hold up the others.
+        """
+        habits = self.habit_repo.get_many(event.habit_id for event in events)
+        habit_ids: list[UUID] = []
+        for habit_id in dict.fromkeys(event.habit_id for event in events):
+            if habit_id in habits:
+                habit_ids.append(habit_id)
+            else:
+                logger.warning("Habit %s not found; skipping its reminder update", habit_id)
+        if not habit_ids:
+            return
+        existing = self.reminder_repo.get_many_by_habit_ids(habit_ids)
         now = self.clock.now()
-        next_due = habit.schedule.next_due_from(now)
 
-        reminder = self.reminder_repo.get_by_habit_id(habit.id)
-        if reminder is None:
-            reminder = Reminder(
-                id=uuid4(),
-                habit_id=habit.id,
-                next_due_at=next_due,
-                active=True,
-            )
-        else:
-            reminder.next_due_at = next_due
+        reminders: list[Reminder] = []
+        for habit_id in habit_ids:
+            next_due = habits[habit_id].schedule.next_due_from(now)
+            reminder = existing.get(habit_id)
+            if reminder is None:
+                reminder = Reminder(
+                    id=self.id_generator.new_id(),
+                    habit_id=habit_id,
+                    next_due_at=next_due,
+                    active=True,
+                )
+            else:
+                reminder.next_due_at = next_due
+            reminders.append(reminder)
 
-        self.reminder_repo.add(reminder)
+        self.reminder_repo.add_many(reminders)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
-from habit_tracker.domain import Completion, Habit, Reminder, User
+from habit_tracker.domain import Completion, DomainEvent, Habit, Reminder, Streak, User
 
 
 class HabitRepository(Protocol):
@@ -18,6 +20,10 @@ class HabitRepository(Protocol):
         """Return the habit with the given ID, or raise an error if not found."""
         ...
 
+    def get_many(self, habit_ids: Iterable[UUID]) -> dict[UUID, Habit]:
+        """Return the habits with the given IDs keyed by ID; IDs not found are left out."""
+        ...
+
     def get_by_user_id(self, user_id: UUID) -> Habit | None:
         """Return the habit with the given user ID, or None if not found."""
         ...
@@ -42,6 +48,10 @@ class CompletionRepository(Protocol):
         """Store a new completion."""
         ...
 
+    def add_many(self, completions: Sequence[Completion]) -> None:
+        """Store several new completions at once."""
+        ...
+
     def list_for_habit(self, habit_id: UUID) -> list[Completion]:
         """Return all completions for the given habit."""
         ...
@@ -55,6 +65,25 @@ class CompletionRepository(Protocol):
         """Return completions for a habit between start and end, inclusive."""
         ...
 
+    def iter_for_habit_newest_first(self, habit_id: UUID) -> Iterator[Completion]:
+        """Yield the completions for the given habit, most recent first.
+
+        Rows are read lazily, so callers that stop early do not load the full history.
+        """
+        ...
+
+    def get_latest_for_habit(self, habit_id: UUID) -> Completion | None:
+        """Return the most recent completion for the given habit, or None if there is none."""
+        ...
+
+
+class StreakRepository(Protocol):
+    """Port for reading streaks kept up to date as completions are recorded."""
+
+    def get_streak(self, habit: Habit) -> Streak | None:
+        """Return the habit's streak under its default rule, or None if it is not available."""
+        ...
+
 
 class ReminderRepository(Protocol):
     """Port for storing and retrieving reminders."""
@@ -63,12 +92,53 @@ class ReminderRepository(Protocol):
         """Store a new reminder or overwrite existing one for the same habit."""
         ...
 
+    def add_many(self, reminders: Sequence[Reminder]) -> None:
+        """Store several reminders with one write, as add() would one by one."""
+        ...
+
     def get_by_habit_id(self, habit_id: UUID) -> Reminder | None:
         """Return the reminder for this habit, or None if not found."""
         ...
 
-    def list_due(self, before: datetime) -> list[Reminder]:
-        """Return all reminders with next_due_at <= 'before' and active=True."""
+    def get_many_by_habit_ids(self, habit_ids: Iterable[UUID]) -> dict[UUID, Reminder]:
+        """Return the reminders of the given habits keyed by habit ID; habits without one are left out."""
+        ...
+
+    def list_due(
+        self,
+        before: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[Reminder]:
+        """Return reminders with next_due_at <= 'before' and active=True.
+
+        Results are ordered by (next_due_at, id). Pass the last reminder's
+        (next_due_at, id) of one page as `after` to get the next page; `limit`
+        caps the page size (None returns everything).
+        """
+        ...
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        worker_id: str,
+        lease_until: datetime,
+    ) -> list[Reminder]:
+        """Atomically lease up to `limit` reminders due at `now` to a worker, earliest first.
+
+        Reminders leased to another worker are skipped until their lease
+        expires, so concurrent workers never receive the same reminder.
+        """
+        ...
+
+    def complete_claimed(self, worker_id: str, completed: Sequence[tuple[Reminder, datetime]]) -> None:
+        """Store a new next_due_at for each reminder, as claim_due() returned it, and release its lease.
+
+        A reminder whose next_due_at changed since it was claimed, e.g. after
+        a completion, keeps that value; its lease is still released.
+        Reminders whose lease no longer belongs to the worker are left untouched.
+        """
         ...
 
 
@@ -94,3 +164,106 @@ class UserRepository(Protocol):
     def remove(self, user_id: UUID) -> None:
         """Remove a user (no-op if it doesn't exist)."""
         ...
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """An event waiting in the outbox; ids increase in the order events were stored."""
+
+    id: int
+    event: DomainEvent
+    attempts: int = 0  # failed delivery attempts so far
+
+
+class OutboxRepository(Protocol):
+    """Port for the transactional outbox of domain events awaiting delivery."""
+
+    def add(self, event: DomainEvent) -> None:
+        """Store an event for delivery, in the same transaction as the caller's other writes."""
+        ...
+
+    def add_many(self, events: Sequence[DomainEvent]) -> None:
+        """Store several events for delivery, in order, with one write."""
+        ...
+
+    def list_pending(self, limit: int) -> list[OutboxMessage]:
+        """Return up to `limit` undelivered messages, oldest first, leaving out those given up on."""
+        ...
+
+    def mark_delivered(self, message_ids: Sequence[int], delivered_at: datetime) -> None:
+        """Record that the given messages have been delivered."""
+        ...
+
+    def record_failure(self, message_id: int, error: str, failed_at: datetime, give_up: bool) -> None:
+        """Count a failed delivery attempt; with give_up, set the message aside so list_pending() skips it."""
+        ...
+
+
+@dataclass(frozen=True)
+class FailedDelivery:
+    """An event one of its handlers raised on, kept until a retry succeeds."""
+
+    id: int
+    event: DomainEvent
+    handler: str  # handler_name() of the handler that raised
+    attempts: int
+    last_error: str  # traceback of the latest failure
+    failed_at: datetime  # when the latest attempt failed
+    next_attempt_at: datetime | None  # None once automatic retries are exhausted
+
+
+class DeadLetterRepository(Protocol):
+    """Port for the dead-letter store of failed event deliveries."""
+
+    def add(
+        self, event: DomainEvent, handler: str, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        """Store a delivery that failed on its first attempt; next_attempt_at as for record_failure()."""
+        ...
+
+    def get_many(self, delivery_ids: Sequence[int]) -> list[FailedDelivery]:
+        """Return the stored deliveries among delivery_ids, by id; unknown ids are skipped."""
+        ...
+
+    def list_all(self, limit: int, after_id: int = 0) -> list[FailedDelivery]:
+        """Return up to `limit` deliveries with ids above after_id, by id."""
+        ...
+
+    def list_due(self, now: datetime, limit: int) -> list[FailedDelivery]:
+        """Return up to `limit` deliveries whose next attempt is at or before now, earliest first."""
+        ...
+
+    def record_failure(
+        self, delivery_id: int, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        """Count another failed attempt and schedule the next one (None: no more automatic retries)."""
+        ...
+
+    def remove(self, delivery_id: int) -> None:
+        """Forget a delivery, once a retry has succeeded."""
+        ...
+
+
+@dataclass(frozen=True)
+class StoredEvent:
+    """An event in the event store; positions increase in the order events were appended."""
+
+    position: int
+    event: DomainEvent
+
+
+class EventStore(Protocol):
+    """Port for the append-only log of published domain events.
+
+    Each event goes to one of the store's partitions (see event_partition), so
+    that all events of a habit are in the same one and can be replayed in order
+    independently of other partitions.
+    """
+
+    def append_many(self, events: Sequence[DomainEvent]) -> None:
+        """Append events, in order, with one write."""
+        ...
+
+    def read(self, partition: int, after_position: int, limit: int) -> list[StoredEvent]:
+        """Return up to `limit` events of a partition with positions above after_position, in order."""
+        ...
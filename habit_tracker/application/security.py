@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -11,6 +18,8 @@ _pwd_context = CryptContext(
     deprecated="auto",
 )
 
+logger = logging.getLogger(__name__)
+
 
 def hash_password(password: str) -> str:
     return _pwd_context.hash(password)
@@ -20,6 +29,132 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return _pwd_context.verify(password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses another scheme or bcrypt cost than new hashes get."""
+    return _pwd_context.needs_update(hashed_password)
+
+
+@functools.cache
+def calibrate_bcrypt_rounds(target_seconds: float, min_rounds: int = 12, max_rounds: int = 16) -> int:
+    """Return the bcrypt cost whose hashes take closest to, but not over, target_seconds here.
+
+    Times one hash at min_rounds and doubles the estimate per extra round,
+    which is what each round costs. Never goes below min_rounds, the
+    security floor, nor above max_rounds. Cached per process.
+    """
+    started = time.perf_counter()
+    _pwd_context.handler("bcrypt").using(rounds=min_rounds).hash("calibration")
+    estimate = time.perf_counter() - started
+    rounds = min_rounds
+    while rounds < max_rounds and estimate * 2 <= target_seconds:
+        rounds += 1
+        estimate *= 2
+    logger.info("Using bcrypt cost %d, about %.0fms per hash", rounds, estimate * 1000)
+    return rounds
+
+
+def set_bcrypt_rounds(rounds: int, min_rounds: int = 12, max_rounds: int = 16) -> None:
+    """Hash new passwords with this bcrypt cost; flag hashes outside min_rounds..max_rounds for a rehash.
+
+    Hashes at any cost within the bounds are kept, so processes that
+    calibrated to neighbouring costs do not keep rehashing each other's.
+    """
+    _pwd_context.update(
+        bcrypt__default_rounds=rounds, bcrypt__min_rounds=min_rounds, bcrypt__max_rounds=max(rounds, max_rounds)
+    )
+
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when a PasswordHasher already has max_pending hashes queued or running."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on its own bounded thread pool, for async callers.
+
+    A bcrypt hash or verify takes a few hundred milliseconds of CPU. bcrypt
+    releases the GIL meanwhile, so max_workers threads hash in parallel,
+    away from the event loop and the threadpool serving other requests.
+    At most max_pending calls wait or run at once; more raise
+    PasswordHasherBusyError right away instead of queueing up, so a burst
+    of logins gets turned away rather than slowing everyone down.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64) -> None:
+        if max_workers < 1 or max_pending < max_workers:
+            raise ValueError("Need max_workers >= 1 and max_pending >= max_workers")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def rehash_in_background(self, password: str, store: Callable[[str], None]) -> bool:
+        """Hash the password with the current settings and pass the hash to `store`, on a worker thread.
+
+        Returns False, doing nothing, if max_pending calls are already in
+        progress. Errors are logged, not raised.
+        """
+        if not self._slots.acquire(blocking=False):
+            return False
+
+        def rehash() -> None:
+            try:
+                store(hash_password(password))
+            except Exception:
+                logger.exception("Storing a rehashed password failed")
+            finally:
+                self._slots.release()
+
+        try:
+            self._executor.submit(rehash)
+        except BaseException:
+            self._slots.release()
+            raise
+        return True
+
+    def close(self) -> None:
+        """Wait for the queued calls and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyError("Too many password hashes in progress")
+        try:
+            future: Future[T] = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+
+_default_hasher: PasswordHasher | None = None
+_default_hasher_lock = threading.Lock()
+
+
+def default_password_hasher() -> PasswordHasher:
+    """Return the process-wide PasswordHasher, for callers that were not given one."""
+    global _default_hasher
+    with _default_hasher_lock:
+        if _default_hasher is None:
+            _default_hasher = PasswordHasher()
+        return _default_hasher
+
+
+async def hash_password_async(password: str) -> str:
+    return await default_password_hasher().hash(password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await default_password_hasher().verify(password, hashed_password)
+
+
 def create_access_token(
     data: dict[str, Any],
     secret_key: str,
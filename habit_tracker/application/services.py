@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, replace
 from datetime import datetime
 from uuid import UUID
 
-from habit_tracker.application.security import hash_password, verify_password
+from habit_tracker.application.security import (
+    PasswordHasher,
+    default_password_hasher,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 from habit_tracker.domain.clock import Clock
 from habit_tracker.domain.completion import Completion
-from habit_tracker.domain.events import DomainEvent
+from habit_tracker.domain.events import DomainEvent, UserDeactivated, UserUpdated
 from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.ids import IdGenerator, default_id_generator
 from habit_tracker.domain.reminder import Reminder
 from habit_tracker.domain.schedule import Schedule
 from habit_tracker.domain.streak import Streak
@@ -21,8 +30,10 @@ from .repositories import (
     CompletionRepository,
     HabitRepository,
     ReminderRepository,
+    StreakRepository,
     UserRepository,
 )
+from .unit_of_work import UnitOfWork
 
 
 @dataclass
@@ -34,6 +45,12 @@ class HabitTrackerService:
     clock: Clock
     reminder_repo: ReminderRepository | None = None
     event_bus: EventBus | None = None
+    streak_projection: StreakRepository | None = None
+    unit_of_work: UnitOfWork | None = None
+    id_generator: IdGenerator = default_id_generator
+    # Set for buses whose handlers run later on other threads (AsyncEventBus):
+    # they must only see events once the writes behind them are committed.
+    publish_after_commit: bool = False
 
     # ------------------------------
     # Habits
@@ -45,6 +62,7 @@ class HabitTrackerService:
             user_id=user_id,
             schedule=schedule,
             clock=self.clock,
+            id_generator=self.id_generator,
         )
 
         if isinstance(result, tuple):
@@ -52,8 +70,9 @@ class HabitTrackerService:
         else:
             habit, event = result, None
 
-        self.habit_repo.add(habit)
-        self._publish(event)
+        # The habit and whatever synchronous event handlers write are committed together.
+        with self._writing([event]):
+            self.habit_repo.add(habit)
         return habit
 
     def list_habits(self) -> list[Habit]:
@@ -75,6 +94,7 @@ class HabitTrackerService:
         result = Completion.record(
             habit=habit,
             clock=self.clock,
+            id_generator=self.id_generator,
         )
 
         if isinstance(result, tuple):
@@ -82,10 +102,49 @@ class HabitTrackerService:
         else:
             completion, event = result, None
 
-        self.completion_repo.add(completion)
-        self._publish(event)
+        with self._writing([event]):
+            self.completion_repo.add(completion)
         return completion
 
+    def complete_habits_bulk(
+        self,
+        items: Sequence[tuple[UUID, datetime | None]],
+        user_id: UUID,
+    ) -> list[Completion]:
+        """Record many completions at once, e.g. when a client syncs offline work.
+
+        Each item is (habit_id, completed_at); a None time means now. Nothing is
+        stored unless every habit exists, belongs to the user and every time is
+        valid. Completions are stored in one write and returned in the order of
+        the items; their HabitCompleted events are published afterwards, oldest
+        first.
+
+        :raises KeyError: If a habit does not exist.
+        :raises PermissionError: If a habit does not belong to the user.
+        :raises ValueError: If a completion time is in the future.
+        """
+        habits: dict[UUID, Habit] = {}
+        for habit_id, _completed_at in items:
+            if habit_id in habits:
+                continue
+            habit = self.habit_repo.get(habit_id)
+            if habit.user_id != user_id:
+                raise PermissionError("Habit does not belong to user")
+            habits[habit_id] = habit
+
+        recorded = [
+            Completion.record(
+                habit=habits[habit_id], clock=self.clock, completed_at=completed_at, id_generator=self.id_generator
+            )
+            for habit_id, completed_at in items
+        ]
+        completions = [completion for completion, _event in recorded]
+        events = sorted((event for _completion, event in recorded), key=lambda event: event.completed_at)
+
+        with self._writing(events):
+            self.completion_repo.add_many(completions)
+        return completions
+
     # ------------------------------
     # Streaks
     # ------------------------------
@@ -101,12 +160,22 @@ class HabitTrackerService:
         if habit.user_id != user_id:
             raise PermissionError("Habit does not belong to user")
 
-        completions = self.completion_repo.list_for_habit(habit_id)
+        if rule is None and self.streak_projection is not None:
+            # Default rule: read the incrementally maintained streak instead of rescanning.
+            streak = self.streak_projection.get_streak(habit)
+            if streak is not None:
+                return streak
+
         now = self.clock.now()
 
         if rule is None:
-            rule = make_streak_rule(habit.schedule)
+            # Walk the history newest-first; only the current run is read.
+            default_rule = make_streak_rule(habit.schedule)
+            completions_desc = self.completion_repo.iter_for_habit_newest_first(habit_id)
+            state = default_rule.state_from_newest_first(habit.id, completions_desc, now=now)
+            return default_rule.streak_from_state(state)
 
+        completions = self.completion_repo.list_for_habit(habit_id)
         streak = rule.calculate(habit=habit, completions=completions, now=now)
         return streak
 
@@ -121,61 +190,206 @@ class HabitTrackerService:
         return self.reminder_repo.get_by_habit_id(habit_id)
 
     def list_due_reminders(
-        self, before: datetime | None = None
+        self,
+        before: datetime | None = None,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[Reminder] | None:
+        """Return due reminders ordered by (next_due_at, id), one page at a time.
+
+        `after` is the (next_due_at, id) of the last reminder of the previous page.
+        """
         if self.reminder_repo is None:
             return None
 
         if before is None:
             before = self.clock.now()
 
-        return self.reminder_repo.list_due(before=before)
+        return self.reminder_repo.list_due(before=before, limit=limit, after=after)
 
     # ------------------------------
     # Internal helpers
     # ------------------------------
 
-    def _publish(self, event: DomainEvent | None) -> None:
-        """Publish an event if we have an event bus configured."""
-        if event is None:
-            return
+    def _transaction(self) -> AbstractContextManager[None]:
+        """Open a unit of work if one is configured."""
+        if self.unit_of_work is None:
+            return nullcontext()
+        return self.unit_of_work.transaction()
+
+    @contextmanager
+    def _writing(self, events: Sequence[DomainEvent | None]) -> Iterator[None]:
+        """Run the block's writes in one transaction and publish `events` for them.
+
+        Events are published at the end of the transaction, so writes made by
+        synchronous handlers commit with it, or after the commit when
+        publish_after_commit is set.
+        """
+        with self._transaction():
+            yield
+            if not self.publish_after_commit:
+                self._publish_all(events)
+        if self.publish_after_commit:
+            self._publish_all(events)
+
+    def _publish_all(self, events: Sequence[DomainEvent | None]) -> None:
+        """Publish events if we have an event bus configured.
+
+        Several events go out in one publish_many() call, so batch handlers see them together.
+        """
         if self.event_bus is None:
             return
-        self.event_bus.publish(event)
+        published = [event for event in events if event is not None]
+        if len(published) == 1:
+            self.event_bus.publish(published[0])
+        elif published:
+            self.event_bus.publish_many(published)
 
 
 class EmailAlreadyRegisteredError(Exception):
     pass
 
 
+class IncorrectPasswordError(Exception):
+    pass
+
+
 @dataclass
 class UserRegistrationService:
     user_repo: UserRepository
     clock: Clock
+    id_generator: IdGenerator = default_id_generator
+    # Receives UserUpdated and UserDeactivated, e.g. to drop cached logins.
+    event_bus: EventBus | None = None
+    # Runs the bcrypt work of the *_async methods; the process-wide one if None.
+    password_hasher: PasswordHasher | None = None
 
     def register_user(self, email: str, password: str) -> User:
-        existing = self.user_repo.get_by_email(email)
-        if existing is not None:
-            raise EmailAlreadyRegisteredError(f"Email already registered: {email}")
+        self._check_email_available(email)
 
         # TODO: you can add some simple validation:
         # if len(password) < 8: raise ValueError("Password too short")
 
-        hashed = hash_password(password)
-        user = User.create(email=email, hashed_password=hashed, clock=self.clock)
-        self.user_repo.add(user)
-        return user
+        return self._add_user(email, hash_password(password))
+
+    async def register_user_async(self, email: str, password: str) -> User:
+        """Like register_user, but hashes the password on the password hasher's threads."""
+        self._check_email_available(email)
+        hasher = self.password_hasher or default_password_hasher()
+        hashed = await hasher.hash(password)
+        # Another registration may have taken the email while we were hashing.
+        self._check_email_available(email)
+        return self._add_user(email, hashed)
 
     def list_users(self) -> list[User]:
         return self.user_repo.list_all()
 
+    def change_password(self, user_id: UUID, current_password: str, new_password: str) -> User:
+        """Replace the user's password once current_password checks out.
+
+        Raises IncorrectPasswordError if it does not, KeyError for an unknown user.
+        """
+        user = self.user_repo.get(user_id)
+        if not verify_password(current_password, user.hashed_password):
+            raise IncorrectPasswordError("Current password is incorrect")
+        return self._store_password(user, hash_password(new_password))
+
+    async def change_password_async(self, user_id: UUID, current_password: str, new_password: str) -> User:
+        """Like change_password, but verifies and hashes on the password hasher's threads."""
+        user = self.user_repo.get(user_id)
+        hasher = self.password_hasher or default_password_hasher()
+        if not await hasher.verify(current_password, user.hashed_password):
+            raise IncorrectPasswordError("Current password is incorrect")
+        hashed = await hasher.hash(new_password)
+        # Reload, so changes made while we were hashing are kept.
+        return self._store_password(self.user_repo.get(user_id), hashed)
+
+    def store_rehashed_password(self, user_id: UUID, outdated_hash: str, hashed_password: str) -> bool:
+        """Store a new hash of the same password, e.g. made with a higher bcrypt cost.
+
+        Leaves the user alone, returning False, if their hash is no longer
+        outdated_hash, i.e. the password changed since it was read.
+        """
+        user = self.user_repo.get(user_id)
+        if user.hashed_password != outdated_hash:
+            return False
+        self._store_password(user, hashed_password)
+        return True
+
+    def deactivate_user(self, user_id: UUID) -> User:
+        """Mark the user inactive; raises KeyError for an unknown user."""
+        user = self.user_repo.get(user_id)
+        if not user.is_active:
+            return user
+        user = replace(user, is_active=False)
+        self.user_repo.add(user)
+        self._publish(UserDeactivated(occurred_at=self.clock.now(), user_id=user.id))
+        return user
+
+    def _store_password(self, user: User, hashed_password: str) -> User:
+        user = replace(user, hashed_password=hashed_password)
+        self.user_repo.add(user)
+        self._publish(UserUpdated(occurred_at=self.clock.now(), user_id=user.id))
+        return user
+
+    def _check_email_available(self, email: str) -> None:
+        if self.user_repo.get_by_email(email) is not None:
+            raise EmailAlreadyRegisteredError(f"Email already registered: {email}")
+
+    def _add_user(self, email: str, hashed_password: str) -> User:
+        user = User.create(
+            email=email, hashed_password=hashed_password, clock=self.clock, id_generator=self.id_generator
+        )
+        self.user_repo.add(user)
+        return user
+
+    def _publish(self, event: DomainEvent) -> None:
+        if self.event_bus is not None:
+            self.event_bus.publish(event)
+
 
 @dataclass
 class AuthenticationService:
     user_repo: UserRepository
+    # Runs the bcrypt work of authenticate_async; the process-wide one if None.
+    password_hasher: PasswordHasher | None = None
+    # Stores rehashed passwords and publishes UserUpdated for them, like any
+    # other password change; if None they are written straight to user_repo.
+    user_registration: UserRegistrationService | None = None
 
     def authenticate(self, email: str, password: str) -> User | None:
         user = self.user_repo.get_by_email(email)
         if user is None or not verify_password(password, user.hashed_password):
             return None
+        self._rehash_if_outdated(user, password)
         return user
+
+    async def authenticate_async(self, email: str, password: str) -> User | None:
+        """Like authenticate, but verifies the password on the password hasher's threads."""
+        user = self.user_repo.get_by_email(email)
+        if user is None:
+            return None
+        hasher = self.password_hasher or default_password_hasher()
+        if not await hasher.verify(password, user.hashed_password):
+            return None
+        self._rehash_if_outdated(user, password)
+        return user
+
+    def _rehash_if_outdated(self, user: User, password: str) -> None:
+        """Replace a hash made with an older bcrypt cost, without making the login wait for it."""
+        if not password_needs_rehash(user.hashed_password):
+            return
+        outdated = user.hashed_password
+        user_registration = self.user_registration
+
+        def store(hashed_password: str) -> None:
+            if user_registration is not None:
+                user_registration.store_rehashed_password(user.id, outdated, hashed_password)
+                return
+            current = self.user_repo.get(user.id)
+            # Leave the user alone if the password changed meanwhile.
+            if current.hashed_password == outdated:
+                self.user_repo.add(replace(current, hashed_password=hashed_password))
+
+        hasher = self.password_hasher or default_password_hasher()
+        hasher.rehash_in_background(password, store)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from habit_tracker.application.repositories import (
+    CompletionRepository,
+    HabitRepository,
+)
+from habit_tracker.domain.events import HabitCompleted, HabitCreated
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.streak import Streak, StreakState
+from habit_tracker.domain.streak_factory import make_streak_rule
+from habit_tracker.domain.streak_rules import IncrementalStreakRule
+
+_Tracked = tuple[IncrementalStreakRule, StreakState]
+
+
+@dataclass
+class StreakProjection:
+    """Keeps the current streak of each habit up to date from habit events.
+
+    Every HabitCompleted advances the habit's StreakState in O(1), so reading a
+    streak never rescans the completion history. Habits we did not see being
+    created (e.g. after a restart) are rebuilt once on first read, walking the
+    completions newest-first up to the end of the current run, and tracked
+    incrementally from then on.
+    """
+
+    habit_repo: HabitRepository
+    completion_repo: CompletionRepository
+    _tracked: dict[UUID, _Tracked] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def on_habit_created(self, event: HabitCreated) -> None:
+        """Start tracking a new habit from an empty streak."""
+        habit = self.habit_repo.get(event.habit_id)
+        try:
+            rule = make_streak_rule(habit.schedule)
+        except ValueError:
+            # No streaks for this schedule; calculate_streak will report it.
+            return
+
+        with self._lock:
+            self._tracked[habit.id] = (rule, StreakState(habit_id=habit.id))
+
+    def on_habit_completed(self, event: HabitCompleted) -> None:
+        """Fold the new completion into the habit's streak state."""
+        with self._lock:
+            tracked = self._tracked.get(event.habit_id)
+            if tracked is None:
+                # Not tracked yet: the first read rebuilds it, this completion included.
+                return
+
+            rule, state = tracked
+            new_state = None
+            if state.last_completed_at is None or event.completed_at > state.last_completed_at:
+                new_state = rule.advance(state, event.completed_at)
+
+            if new_state is None:
+                # Out of order, or possibly already folded in by a rebuild:
+                # drop the state so the next read rebuilds it from the repository.
+                del self._tracked[event.habit_id]
+            else:
+                self._tracked[event.habit_id] = (rule, new_state)
+
+    def get_streak(self, habit: Habit) -> Streak:
+        """Return the current streak for the habit using its default rule.
+
+        :raises ValueError: If the habit's schedule does not support streaks.
+        """
+        with self._lock:
+            tracked = self._tracked.get(habit.id)
+            if tracked is None:
+                rule = make_streak_rule(habit.schedule)
+                completions_desc = self.completion_repo.iter_for_habit_newest_first(habit.id)
+                tracked = (rule, rule.state_from_newest_first(habit.id, completions_desc))
+                self._tracked[habit.id] = tracked
+
+        rule, state = tracked
+        return rule.streak_from_state(state)
+
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.events import UserDeactivated, UserUpdated
+from habit_tracker.domain.user import User
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """The verified claims of an access token and the user it was issued to."""
+
+    claims: dict[str, Any]
+    user: User
+    # Seconds since the epoch after which the entry is no longer used.
+    expires_at: float
+
+
+class TokenCache:
+    """Bounded LRU cache of verified access tokens, so a request costs one lookup.
+
+    Entries expire at the token's `exp` claim, or `ttl` seconds after they
+    were stored if that comes first, which bounds how long a change made
+    without an event, e.g. by another process, can go unnoticed. Once
+    max_size entries are stored the least recently used one is evicted.
+    on_user_changed() drops every token of a user; subscribe it to
+    UserUpdated and UserDeactivated.
+
+    A caller loading a user while it changes could cache the old copy after
+    the invalidation: read `generation` before loading and pass it to put(),
+    which then skips the entry if any user was invalidated in the meantime.
+    """
+
+    def __init__(self, clock: Clock, max_size: int = 10_000, ttl: float = 30.0) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._clock = clock
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._tokens_by_user: dict[UUID, set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Number of invalidations so far."""
+        return self._generation
+
+    def get(self, token: str) -> CachedToken | None:
+        """Return the cached entry for the token, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock.now().timestamp():
+                self._discard(token)
+                return None
+            self._entries.move_to_end(token)
+            return entry
+
+    def put(self, token: str, claims: dict[str, Any], user: User, generation: int | None = None) -> None:
+        """Cache a token whose signature and claims have been verified for `user`."""
+        expires_at = self._clock.now().timestamp() + self._ttl
+        exp = claims.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._discard(token)
+            self._entries[token] = CachedToken(claims=claims, user=user, expires_at=expires_at)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self._max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached token of the user."""
+        with self._lock:
+            self._generation += 1
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._discard(token)
+
+    def on_user_changed(self, event: UserUpdated | UserDeactivated) -> None:
+        self.invalidate_user(event.user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry.user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry.user.id]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from contextlib import AbstractContextManager
+from typing import Protocol
+
+
+class UnitOfWork(Protocol):
+    """Port for grouping several repository writes into one transaction."""
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """Return a context manager around one atomic unit of work.
+
+        Writes made by repositories inside the block are committed once when it
+        exits normally, and rolled back if it raises. Nested blocks join the
+        outermost one.
+        """
+        ...
+
+    def savepoint(self) -> AbstractContextManager[None]:
+        """Return a context manager whose block's writes are undone if it raises.
+
+        Runs inside transaction(), joining an open one. When the block raises,
+        only its own writes are rolled back and the error propagates; the
+        surrounding transaction stays open and can still commit.
+        """
+        ...
@@ -1,15 +1,18 @@
 from .clock import Clock
 from .completion import Completion
 from .event_collector import EventCollector
-from .events import DomainEvent, HabitCompleted, HabitCreated
+from .events import DomainEvent, HabitCompleted, HabitCreated, UserDeactivated, UserUpdated
 from .habit import Habit
 from .helpers import _find_first_completion, _find_last_completion
+from .ids import IdGenerator, UUIDv7Generator
 from .reminder import Reminder
 from .schedule import Schedule
-from .streak import Streak
+from .streak import Streak, StreakState
 from .streak_rules import (
     AtLeastNDaysInLastMDaysRule,
+    CompletionBatch,
     DailyStreakRule,
+    IncrementalStreakRule,
     StreakRule,
     TimesPerWeekStreakRule,
 )
@@ -17,18 +20,25 @@ from .user import User
 
 __all__ = [
     "Clock",
+    "IdGenerator",
+    "UUIDv7Generator",
     "Habit",
     "Completion",
     "DomainEvent",
     "HabitCompleted",
     "HabitCreated",
+    "UserDeactivated",
+    "UserUpdated",
     "Schedule",
     "EventCollector",
     "Streak",
+    "StreakState",
     "StreakRule",
+    "IncrementalStreakRule",
     "DailyStreakRule",
     "TimesPerWeekStreakRule",
     "AtLeastNDaysInLastMDaysRule",
+    "CompletionBatch",
     "Reminder",
     "_find_last_completion",
     "_find_first_completion",
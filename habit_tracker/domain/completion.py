@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from .clock import Clock
 from .events import HabitCompleted
 from .habit import Habit
+from .ids import IdGenerator, default_id_generator
 
 
 @dataclass(frozen=True)
@@ -23,13 +24,22 @@ class Completion:
         habit: Habit,
         clock: Clock,
         completion_id: UUID | None = None,
+        completed_at: datetime | None = None,
+        id_generator: IdGenerator = default_id_generator,
     ) -> tuple[Completion, HabitCompleted]:
         """Record a new completion for the given habit.
 
-        Returns both the Completion entity and the corresponding domain event.
+        completed_at defaults to now; an earlier time records a completion made
+        offline. Returns both the Completion entity and the corresponding domain event.
+
+        :raises ValueError: If completed_at is in the future.
         """
-        completed_at = clock.now()
-        comp_id = completion_id or uuid4()
+        now = clock.now()
+        if completed_at is None:
+            completed_at = now
+        elif completed_at > now:
+            raise ValueError("Completion time cannot be in the future")
+        comp_id = completion_id or id_generator.new_id()
 
         completion = cls(
             id=comp_id,
@@ -24,3 +24,17 @@ class HabitCompleted(DomainEvent):
 class HabitCreated(DomainEvent):
     habit_id: UUID
     name: str
+
+
+@dataclass(frozen=True)
+class UserUpdated(DomainEvent):
+    """Event raised when a stored user's email or password changes"""
+
+    user_id: UUID
+
+
+@dataclass(frozen=True)
+class UserDeactivated(DomainEvent):
+    """Event raised when a user is deactivated and may no longer sign in"""
+
+    user_id: UUID
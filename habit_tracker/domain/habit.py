@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from .clock import Clock
 from .events import HabitCreated
+from .ids import IdGenerator, default_id_generator
 from .schedule import Schedule
 
 
@@ -26,8 +27,9 @@ class Habit:
         schedule: Schedule,
         clock: Clock,
         habit_id: UUID | None = None,
+        id_generator: IdGenerator = default_id_generator,
     ) -> tuple[Habit, HabitCreated]:
-        """Factory method to create a new Habit using an injected clock."""
+        """Factory method to create a new Habit using an injected clock and id generator."""
         habit_name = name.strip()
         if not habit_name:
             raise ValueError("Habit name must not be empty.")
@@ -35,7 +37,7 @@ class Habit:
         if not user_id:
             raise ValueError("User ID must not be empty.")
 
-        habit_uuid = habit_id or uuid4()
+        habit_uuid = habit_id or id_generator.new_id()
         created_at = clock.now()
 
         event = HabitCreated(
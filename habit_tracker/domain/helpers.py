@@ -1,9 +1,21 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
 
 from .completion import Completion
 
+# Naive datetimes are measured against a naive epoch, aware ones against the UTC epoch.
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp_us(dt: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are measured against a naive epoch."""
+    epoch = _UTC_EPOCH if dt.tzinfo is not None else _NAIVE_EPOCH
+    return (dt - epoch) // _MICROSECOND
+
 
 def _find_last_completion(
     completions: Sequence[Completion],
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Protocol
+from uuid import UUID
+
+
+class IdGenerator(Protocol):
+    """Source of new entity ids, injectable like Clock."""
+
+    def new_id(self) -> UUID:
+        """Return a new, unique id."""
+        ...
+
+
+class UUIDv7Generator(IdGenerator):
+    """Generates time-ordered UUIDs in the version 7 layout (RFC 9562).
+
+    The first 48 bits hold the Unix time in milliseconds and the next 12 bits
+    (rand_a) a sub-millisecond fraction, so ids created later sort later and
+    new rows land at the end of a primary-key index instead of splitting pages
+    all over it. Ids from one generator are strictly increasing even when the
+    clock stalls or steps back: such ids continue from the previous one. The
+    remaining 62 bits are random.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last = 0
+
+    def new_id(self) -> UUID:
+        nanos = time.time_ns()
+        # 48-bit milliseconds followed by the 12-bit fraction of the millisecond.
+        stamp = (nanos // 1_000_000) << 12 | (nanos % 1_000_000) * 4096 // 1_000_000
+        with self._lock:
+            stamp = max(stamp, self._last + 1)
+            self._last = stamp
+        random_bits = int.from_bytes(os.urandom(8)) & (1 << 62) - 1
+        return UUID(int=(stamp >> 12) << 80 | 0x7 << 76 | (stamp & 0xFFF) << 64 | 0b10 << 62 | random_bits)
+
+
+# Used by the entity factories when no generator is passed in.
+default_id_generator: IdGenerator = UUIDv7Generator()
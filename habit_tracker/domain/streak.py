@@ -21,3 +21,20 @@ class Streak:
         if minimum <= 0:
             raise ValueError("minimum must be positive")
         return self.count >= minimum
+
+
+@dataclass(frozen=True)
+class StreakState:
+    """Running state of a period-based streak, advanced one completion at a time.
+
+    - period: ordinal of the period (day or ISO week) holding the latest completion.
+    - period_completions: how many completions fell into that period so far.
+    - prior_periods: consecutive periods that met the rule right before `period`.
+    - last_completed_at: time of the most recent completion folded into the state.
+    """
+
+    habit_id: UUID
+    period: int | None = None
+    period_completions: int = 0
+    prior_periods: int = 0
+    last_completed_at: datetime | None = None
@@ -1,12 +1,12 @@
 from habit_tracker.domain.schedule import Schedule
 from habit_tracker.domain.streak_rules import (
     DailyStreakRule,
-    StreakRule,
+    IncrementalStreakRule,
     TimesPerWeekStreakRule,
 )
 
 
-def make_streak_rule(schedule: Schedule) -> StreakRule:
+def make_streak_rule(schedule: Schedule) -> IncrementalStreakRule:
     """
     Create the appropriate StreakRule for a given Schedule.
 
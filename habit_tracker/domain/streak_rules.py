@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
-from typing import Protocol
+from types import ModuleType
+from typing import TYPE_CHECKING, Protocol
+from uuid import UUID
 
 from .completion import Completion
 from .habit import Habit
-from .helpers import _find_first_completion, _find_last_completion
-from .streak import Streak
+from .helpers import _find_first_completion, _find_last_completion, _timestamp_us
+from .streak import Streak, StreakState
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 
 class StreakRule(Protocol):
@@ -24,6 +30,267 @@ class StreakRule(Protocol):
         ...
 
 
+class IncrementalStreakRule(StreakRule, Protocol):
+    """A streak rule whose result can be maintained one completion at a time."""
+
+    def advance(self, state: StreakState, completed_at: datetime) -> StreakState | None:
+        """Fold one more completion into the state.
+
+        Returns None when the completion is older than the latest one already
+        folded in; the state then has to be rebuilt from the full history.
+        """
+        ...
+
+    def streak_from_state(self, state: StreakState) -> Streak:
+        """Turn a running state into the Streak that `calculate` would return."""
+        ...
+
+    def state_from_newest_first(
+        self,
+        habit_id: UUID,
+        completions: Iterable[Completion],
+        now: datetime | None = None,
+    ) -> StreakState:
+        """Build the state from completions ordered newest-first.
+
+        Completions are consumed lazily and reading stops as soon as the run
+        of periods is broken, so only the current streak is ever read.
+        Completions after `now` (if given) are skipped.
+        """
+        ...
+
+
+def _advance_period_state(
+    state: StreakState,
+    period: int,
+    completed_at: datetime,
+    required: int,
+) -> StreakState | None:
+    """Fold a completion falling into `period` into a period-based streak state."""
+    if state.last_completed_at is not None and completed_at < state.last_completed_at:
+        return None
+
+    if state.period is None or period > state.period + 1:
+        # First completion ever, or at least one whole period was skipped.
+        prior_periods = 0
+        period_completions = 1
+    elif period == state.period:
+        prior_periods = state.prior_periods
+        period_completions = state.period_completions + 1
+    else:
+        # The very next period: the one we leave behind extends the run if it was met.
+        met = state.period_completions >= required
+        prior_periods = state.prior_periods + 1 if met else 0
+        period_completions = 1
+
+    return StreakState(
+        habit_id=state.habit_id,
+        period=period,
+        period_completions=period_completions,
+        prior_periods=prior_periods,
+        last_completed_at=completed_at,
+    )
+
+
+def _streak_from_period_state(state: StreakState, required: int) -> Streak:
+    if state.last_completed_at is None:
+        return Streak(habit_id=state.habit_id, count=0, last_completed_at=None)
+
+    count = state.prior_periods + 1 if state.period_completions >= required else 0
+    return Streak(
+        habit_id=state.habit_id,
+        count=count,
+        last_completed_at=state.last_completed_at,
+    )
+
+
+def _settle_period(state: StreakState, period: int, count: int, required: int) -> StreakState | None:
+    """Account for a fully read period while walking back; None once the run is broken."""
+    if period == state.period:
+        return replace(state, period_completions=count)
+    if count >= required:
+        return replace(state, prior_periods=state.prior_periods + 1)
+    return None
+
+
+def _period_state_from_newest_first(
+    habit_id: UUID,
+    completions: Iterable[Completion],
+    now: datetime | None,
+    period_of: Callable[[datetime], int],
+    required: int,
+) -> StreakState:
+    state = StreakState(habit_id=habit_id)
+    current: int | None = None  # period whose completions are being counted
+    count = 0
+
+    for c in completions:
+        if now is not None and c.completed_at > now:
+            continue
+
+        period = period_of(c.completed_at)
+        if current is None:
+            state = StreakState(habit_id=habit_id, period=period, last_completed_at=c.completed_at)
+            current = period
+        elif period != current:
+            # Every completion of `current` has been read; stop at the first break.
+            settled = _settle_period(state, current, count, required)
+            if settled is None or period != current - 1:
+                return settled or state
+            state, current, count = settled, period, 0
+        count += 1
+
+    if current is None:
+        return state
+    return _settle_period(state, current, count, required) or state
+
+
+def _iso_week_ordinal(d: date) -> int:
+    """Number of the ISO week containing `d`, counted from 0001-01-01 (a Monday)."""
+    return (d.toordinal() - 1) // 7
+
+
+# ---------------------------------------------------------------------------
+# Batch calculation (requires numpy)
+# ---------------------------------------------------------------------------
+
+_DAY_US = 86_400_000_000
+
+
+def _load_numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("Batch streak calculation requires numpy: pip install 'habit-tracker[batch]'") from exc
+    return numpy
+
+
+@dataclass(frozen=True)
+class CompletionBatch:
+    """Completions of many habits as flat, parallel arrays.
+
+    - habit_ids: the habits in the batch; streaks are returned in this order.
+    - habit_index: for each completion, the position of its habit in `habit_ids`.
+    - day_ordinal: for each completion, `completed_at.date().toordinal()`.
+    - timestamp_us: for each completion, `completed_at` in microseconds since the epoch.
+    - completed_at: the original datetimes, reported back as `last_completed_at`.
+    """
+
+    habit_ids: Sequence[UUID]
+    habit_index: npt.NDArray[np.int64]
+    day_ordinal: npt.NDArray[np.int64]
+    timestamp_us: npt.NDArray[np.int64]
+    completed_at: Sequence[datetime]
+
+    @classmethod
+    def from_completions(
+        cls,
+        habit_ids: Sequence[UUID],
+        completions: Iterable[Completion],
+    ) -> CompletionBatch:
+        """Build a batch from Completion entities; habits not in `habit_ids` are skipped."""
+        np = _load_numpy()
+        position = {habit_id: i for i, habit_id in enumerate(habit_ids)}
+
+        habit_index: list[int] = []
+        day_ordinal: list[int] = []
+        timestamp_us: list[int] = []
+        completed_at: list[datetime] = []
+        for c in completions:
+            i = position.get(c.habit_id)
+            if i is None:
+                continue
+            habit_index.append(i)
+            day_ordinal.append(c.completed_at.date().toordinal())
+            timestamp_us.append(_timestamp_us(c.completed_at))
+            completed_at.append(c.completed_at)
+
+        return cls(
+            habit_ids=habit_ids,
+            habit_index=np.asarray(habit_index, dtype=np.int64),
+            day_ordinal=np.asarray(day_ordinal, dtype=np.int64),
+            timestamp_us=np.asarray(timestamp_us, dtype=np.int64),
+            completed_at=completed_at,
+        )
+
+
+def _completed_until(batch: CompletionBatch, now: datetime) -> npt.NDArray[np.bool_]:
+    """Mask of the completions at or before `now`, like the scalar rules' filter."""
+    return batch.timestamp_us <= _timestamp_us(now)
+
+
+def _last_in_group(np: ModuleType, groups: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+    """For rows sorted by group, mark the last row of every group."""
+    is_last = np.ones(len(groups), dtype=bool)
+    is_last[:-1] = groups[1:] != groups[:-1]
+    return is_last
+
+
+def _batch_last_completed(
+    np: ModuleType,
+    batch: CompletionBatch,
+    mask: npt.NDArray[np.bool_],
+) -> list[datetime | None]:
+    """The latest completion (<= now) of every habit in the batch, or None."""
+    rows = np.flatnonzero(mask)
+    habits = batch.habit_index[rows]
+    order = np.lexsort((batch.timestamp_us[rows], habits))
+    last_rows = order[_last_in_group(np, habits[order])]
+
+    result: list[datetime | None] = [None] * len(batch.habit_ids)
+    for habit, row in zip(habits[last_rows].tolist(), rows[last_rows].tolist(), strict=True):
+        result[habit] = batch.completed_at[row]
+    return result
+
+
+def _batch_period_streaks(
+    np: ModuleType,
+    habits: npt.NDArray[np.int64],
+    periods: npt.NDArray[np.int64],
+    n_habits: int,
+    required: int,
+) -> npt.NDArray[np.int64]:
+    """Vectorized version of the period walk shared by the daily and weekly rules.
+
+    For every habit, count the consecutive periods that have at least `required`
+    completions, ending at the period of its latest completion.
+    """
+    counts = np.zeros(n_habits, dtype=np.int64)
+    if len(habits) == 0:
+        return counts
+
+    # One row per (habit, period), with the number of completions in it.
+    order = np.lexsort((periods, habits))
+    habits, periods = habits[order], periods[order]
+    is_first = np.ones(len(habits), dtype=bool)
+    is_first[1:] = (habits[1:] != habits[:-1]) | (periods[1:] != periods[:-1])
+    starts = np.flatnonzero(is_first)
+    per_period = np.diff(np.append(starts, len(habits)))
+    habits, periods = habits[starts], periods[starts]
+    met = per_period >= required
+
+    # A run breaks at a new habit, a skipped period, or after a period that was not met.
+    breaks = np.ones(len(habits), dtype=bool)
+    breaks[1:] = (habits[1:] != habits[:-1]) | (periods[1:] != periods[:-1] + 1) | ~met[:-1]
+    rows = np.arange(len(habits))
+    run_start = np.maximum.accumulate(np.where(breaks, rows, 0))
+
+    last = np.flatnonzero(_last_in_group(np, habits))
+    counts[habits[last]] = np.where(met[last], last - run_start[last] + 1, 0)
+    return counts
+
+
+def _streaks_from_counts(
+    batch: CompletionBatch,
+    counts: Sequence[int],
+    last_completed: Sequence[datetime | None],
+) -> list[Streak]:
+    return [
+        Streak(habit_id=habit_id, count=int(count), last_completed_at=last)
+        for habit_id, count, last in zip(batch.habit_ids, counts, last_completed, strict=True)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Daily streak rule
 # ---------------------------------------------------------------------------
@@ -73,6 +340,40 @@ class DailyStreakRule:
             last_completed_at=last_completion.completed_at,
         )
 
+    def calculate_batch(self, batch: CompletionBatch, now: datetime) -> list[Streak]:
+        """Vectorized `calculate` for every habit in the batch at once."""
+        np = _load_numpy()
+        mask = _completed_until(batch, now)
+        counts = _batch_period_streaks(
+            np,
+            batch.habit_index[mask],
+            batch.day_ordinal[mask],
+            n_habits=len(batch.habit_ids),
+            required=1,
+        )
+        return _streaks_from_counts(batch, counts.tolist(), _batch_last_completed(np, batch, mask))
+
+    def advance(self, state: StreakState, completed_at: datetime) -> StreakState | None:
+        period = completed_at.date().toordinal()
+        return _advance_period_state(state, period, completed_at, required=1)
+
+    def streak_from_state(self, state: StreakState) -> Streak:
+        return _streak_from_period_state(state, required=1)
+
+    def state_from_newest_first(
+        self,
+        habit_id: UUID,
+        completions: Iterable[Completion],
+        now: datetime | None = None,
+    ) -> StreakState:
+        return _period_state_from_newest_first(
+            habit_id,
+            completions,
+            now,
+            period_of=lambda dt: dt.date().toordinal(),
+            required=1,
+        )
+
 
 # ---------------------------------------------------------------------------
 # Times per week rule
@@ -134,11 +435,16 @@ class TimesPerWeekStreakRule:
         # We'll start checking from the week that contains this last completion.
         current_date: date = last_completion.completed_at.date()
 
+        # Stop once we walk past the Monday of the first completion's week, so that
+        # week is still checked even if it started later in the week than current_date.
+        first_date: date = first_completion.completed_at.date()
+        first_week_start = first_date - timedelta(days=first_date.weekday())
+
         # 4) Walk backwards week-by-week, counting how many consecutive weeks
         #    meet the "times_per_week" requirement.
         streak_count = 0
 
-        while current_date >= first_completion.completed_at.date():
+        while current_date >= first_week_start:
             iso_year, iso_week, _weekday = current_date.isocalendar()
             key = (iso_year, iso_week)
 
@@ -160,6 +466,40 @@ class TimesPerWeekStreakRule:
             last_completed_at=last_completion.completed_at,
         )
 
+    def calculate_batch(self, batch: CompletionBatch, now: datetime) -> list[Streak]:
+        """Vectorized `calculate` for every habit in the batch at once."""
+        np = _load_numpy()
+        mask = _completed_until(batch, now)
+        counts = _batch_period_streaks(
+            np,
+            batch.habit_index[mask],
+            (batch.day_ordinal[mask] - 1) // 7,  # same numbering as _iso_week_ordinal
+            n_habits=len(batch.habit_ids),
+            required=self.times_per_week,
+        )
+        return _streaks_from_counts(batch, counts.tolist(), _batch_last_completed(np, batch, mask))
+
+    def advance(self, state: StreakState, completed_at: datetime) -> StreakState | None:
+        period = _iso_week_ordinal(completed_at.date())
+        return _advance_period_state(state, period, completed_at, required=self.times_per_week)
+
+    def streak_from_state(self, state: StreakState) -> Streak:
+        return _streak_from_period_state(state, required=self.times_per_week)
+
+    def state_from_newest_first(
+        self,
+        habit_id: UUID,
+        completions: Iterable[Completion],
+        now: datetime | None = None,
+    ) -> StreakState:
+        return _period_state_from_newest_first(
+            habit_id,
+            completions,
+            now,
+            period_of=lambda dt: _iso_week_ordinal(dt.date()),
+            required=self.times_per_week,
+        )
+
 
 # ---------------------------------------------------------------------------
 # At least N days in the last M days rule
@@ -206,3 +546,12 @@ class AtLeastNDaysInLastMDaysRule:
             count=streak_count,
             last_completed_at=now,
         )
+
+    def calculate_batch(self, batch: CompletionBatch, now: datetime) -> list[Streak]:
+        """Vectorized `calculate` for every habit in the batch at once."""
+        np = _load_numpy()
+        now_us = _timestamp_us(now)
+        in_window = _completed_until(batch, now) & (batch.timestamp_us >= now_us - self.m * _DAY_US)
+        recent = np.bincount(batch.habit_index[in_window], minlength=len(batch.habit_ids))
+        counts = (recent >= self.n).astype(np.int64)
+        return _streaks_from_counts(batch, counts.tolist(), [now] * len(batch.habit_ids))
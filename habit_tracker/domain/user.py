@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.ids import IdGenerator, default_id_generator
 
 
 @dataclass(frozen=True)
@@ -20,9 +21,15 @@ class User:
     # It is defined using the @classmethod decorator
     # It takes cls as the first parameter instead of self
     @classmethod
-    def create(cls, email: str, hashed_password: str, clock: Clock) -> User:
+    def create(
+        cls,
+        email: str,
+        hashed_password: str,
+        clock: Clock,
+        id_generator: IdGenerator = default_id_generator,
+    ) -> User:
         return cls(
-            id=uuid4(),
+            id=id_generator.new_id(),
             email=email,
             hashed_password=hashed_password,
             created_at=clock.now(),
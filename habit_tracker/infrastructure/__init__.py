@@ -1,25 +1,49 @@
-from .event_bus import InMemoryEventBus  # NEW
+from .event_bus import AsyncEventBus, EventQueueFullError, InMemoryEventBus
+from .event_bus_metrics import InMemoryEventBusMetrics
 from .inmemory_repositories import (
     InMemoryCompletionRepository,
+    InMemoryDeadLetterRepository,
+    InMemoryEventStore,
     InMemoryHabitRepository,
+    InMemoryOutboxRepository,
     InMemoryReminderRepository,
     InMemoryUserRepository,
 )
+from .notifiers import LoggingReminderNotifier
+from .sqlite_pool import SQLiteConnectionPool
 from .sqlite_repositories import (
     SQLiteCompletionRepository,
+    SQLiteDeadLetterRepository,
+    SQLiteEventStore,
     SQLiteHabitRepository,
+    SQLiteOutboxRepository,
     SQLiteReminderRepository,
+    SQLiteStreakRepository,
+    SQLiteUnitOfWork,
     SQLiteUserRepository,
 )
 
 __all__ = [
+    "AsyncEventBus",
+    "EventQueueFullError",
     "InMemoryHabitRepository",
     "InMemoryCompletionRepository",
+    "InMemoryDeadLetterRepository",
     "InMemoryEventBus",
+    "InMemoryEventBusMetrics",
+    "InMemoryEventStore",
+    "InMemoryOutboxRepository",
     "InMemoryReminderRepository",
     "InMemoryUserRepository",
+    "LoggingReminderNotifier",
+    "SQLiteConnectionPool",
     "SQLiteHabitRepository",
     "SQLiteCompletionRepository",
+    "SQLiteDeadLetterRepository",
+    "SQLiteEventStore",
+    "SQLiteOutboxRepository",
     "SQLiteReminderRepository",
+    "SQLiteStreakRepository",
+    "SQLiteUnitOfWork",
     "SQLiteUserRepository",
 ]
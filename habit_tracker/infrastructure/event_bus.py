@@ -1,59 +1,318 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Any, TypeVar
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from functools import partial
+from typing import Any, Literal, TypeVar
 
-from habit_tracker.application.event_bus import EventBus
+from habit_tracker.application.event_bus import EventBus, EventBusMetrics, handler_name
 from habit_tracker.domain.events import DomainEvent
 
 E = TypeVar("E", bound=DomainEvent)
 
+logger = logging.getLogger(__name__)
+
+
+# The handlers an event class resolves to: (per-event handlers, batch handlers).
+_Resolved = tuple[tuple[Any, ...], tuple[Any, ...]]
+
+
+class _DispatchTable:
+    """Subscriptions by event type, resolved along each concrete event class's MRO.
+
+    A handler subscribed to a base class (e.g. DomainEvent) also receives its
+    subclasses' events, after the handlers of the more specific classes. The
+    resolved handlers are cached per concrete event class in `resolved`, so
+    publishing costs one dict lookup however many event types exist;
+    subscribe() clears the cache. The mappings are replaced rather than
+    mutated, so publishers on other threads never see a half-updated table.
+    """
+
+    def __init__(self) -> None:
+        # Example: { HabitCompleted: (handler1, handler2), DomainEvent: (audit,) }
+        self._subscribers: dict[type[DomainEvent], tuple[Any, ...]] = {}
+        self._batch_subscribers: dict[type[DomainEvent], tuple[Any, ...]] = {}
+        # Publishers read this directly and call resolve() on a miss.
+        self.resolved: dict[type[DomainEvent], _Resolved] = {}
+        self._lock = threading.Lock()
+
+    def add(self, event_type: type[DomainEvent], handler: Any) -> None:
+        with self._lock:
+            self._subscribers = {**self._subscribers, event_type: (*self._subscribers.get(event_type, ()), handler)}
+            self.resolved = {}
+
+    def add_batch(self, event_type: type[DomainEvent], handler: Any) -> None:
+        with self._lock:
+            self._batch_subscribers = {
+                **self._batch_subscribers,
+                event_type: (*self._batch_subscribers.get(event_type, ()), handler),
+            }
+            self.resolved = {}
+
+    def resolve(self, event_type: type[DomainEvent]) -> _Resolved:
+        resolved = self.resolved
+        subscribers, batch_subscribers = self._subscribers, self._batch_subscribers
+        handlers = (
+            tuple(handler for cls in event_type.__mro__ for handler in subscribers.get(cls, ())),
+            tuple(handler for cls in event_type.__mro__ for handler in batch_subscribers.get(cls, ())),
+        )
+        resolved[event_type] = handlers
+        return handlers
+
+    def dispatch(self, events: Sequence[DomainEvent], call: Callable[[Any, Any], None]) -> None:
+        """Call each per-event handler for every event in order, then each batch handler once with its events."""
+        batches: dict[Any, list[DomainEvent]] = {}
+        for event in events:
+            handlers = self.resolved.get(type(event))
+            if handlers is None:
+                handlers = self.resolve(type(event))
+            for handler in handlers[0]:
+                call(handler, event)
+            for batch_handler in handlers[1]:
+                batches.setdefault(batch_handler, []).append(event)
+        for batch_handler, batch in batches.items():
+            call(batch_handler, batch)
+
+
+def _call(handler: Callable[[Any], None], argument: Any) -> None:
+    handler(argument)
+
+
+def _measured_call(metrics: EventBusMetrics, handler: Callable[[Any], None], argument: Any) -> None:
+    """Call the handler, reporting its latency, and the events if it raises, to metrics."""
+    events = argument if isinstance(argument, list) else [argument]
+    name = handler_name(handler)
+    started = time.perf_counter()
+    try:
+        handler(argument)
+    except Exception as error:
+        metrics.record_call(type(events[0]), name, time.perf_counter() - started, True)
+        metrics.record_failure(events, name, error)
+        raise
+    metrics.record_call(type(events[0]), name, time.perf_counter() - started, False)
+
+
+def _caller(metrics: EventBusMetrics | None) -> Callable[[Any, Any], None]:
+    return _call if metrics is None else partial(_measured_call, metrics)
+
 
 class InMemoryEventBus(EventBus):
     """Simple in-process event bus.
 
-    - Subscribers are stored in a dict, keyed by event type.
-    - When an event is published, we call all handlers subscribed for its exact type.
+    - Subscribers are stored per event type; a subscription to a base class
+      such as DomainEvent receives every subclass's events too.
+    - When an event is published, we call its handlers right away, on the publishing thread.
+    - With `metrics`, every handler call is timed and its failures recorded there.
     """
 
-    def __init__(self) -> None:
-        # Example: { HabitCompleted: [handler1, handler2], HabitCreated: [handler3] }
-        self._subscribers: dict[type[DomainEvent], list[Any]] = {}
+    def __init__(self, metrics: EventBusMetrics | None = None) -> None:
+        self._dispatch = _DispatchTable()
+        self._metrics = metrics
+        self._call = _caller(metrics)
 
     def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
-        handlers = self._subscribers.get(event_type)
-        if handlers is None:
-            handlers = []
-            self._subscribers[event_type] = handlers
-        handlers.append(handler)
+        self._dispatch.add(event_type, handler)
 
-    def publish(self, event: DomainEvent) -> None:
-        event_type = type(event)
-        handlers = self._subscribers.get(event_type, [])
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        self._dispatch.add_batch(event_type, handler)
 
+    def publish(self, event: DomainEvent) -> None:
         # Call all handlers; if one fails, we let the exception bubble up.
-        for handler in handlers:
+        if self._metrics is not None:
+            self._dispatch.dispatch([event], self._call)
+            return
+        event_type = type(event)
+        handlers = self._dispatch.resolved.get(event_type)
+        if handlers is None:
+            handlers = self._dispatch.resolve(event_type)
+        for handler in handlers[0]:
             handler(event)
+        for batch_handler in handlers[1]:
+            batch_handler([event])
+
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        self._dispatch.dispatch(events, self._call)
 
 
 class SafeInMemoryEventBus(EventBus):
-    def __init__(self) -> None:
-        self._subscribers: dict[type[DomainEvent], list[Any]] = {}
+    """InMemoryEventBus that logs a failing handler and still runs the others.
+
+    With `metrics`, every handler call is timed and its failures recorded there.
+    """
+
+    def __init__(self, metrics: EventBusMetrics | None = None) -> None:
+        self._dispatch = _DispatchTable()
+        self._invoke = _caller(metrics)
 
     def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
-        handlers = self._subscribers.get(event_type)
-        if handlers is None:
-            handlers = []
-            self._subscribers[event_type] = handlers
-        handlers.append(handler)
+        self._dispatch.add(event_type, handler)
+
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        self._dispatch.add_batch(event_type, handler)
 
     def publish(self, event: DomainEvent) -> None:
-        event_type = type(event)
-        handlers = self._subscribers.get(event_type, [])
+        self._dispatch.dispatch([event], self._call)
 
-        # Call all handlers; if one fails, we let the exception bubble up.
-        for handler in handlers:
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        self._dispatch.dispatch(events, self._call)
+
+    def _call(self, handler: Callable[[Any], None], argument: Any) -> None:
+        # A failing handler is reported and the rest still run.
+        try:
+            self._invoke(handler, argument)
+        except Exception:
+            logger.exception("Error in handler %r", handler)
+
+
+class EventQueueFullError(RuntimeError):
+    """Raised by AsyncEventBus.publish when a queue stays full for block_timeout."""
+
+
+# What AsyncEventBus.publish does when the event's queue is full.
+Backpressure = Literal["block", "drop"]
+
+
+class AsyncEventBus(EventBus):
+    """Event bus that runs handlers on a pool of worker threads.
+
+    publish() only puts the event on a queue and returns, so slow handlers no
+    longer add to the latency of the request that raised the event. Each
+    worker drains its own bounded queue. Events of one habit (by their
+    habit_id) always go to the same worker, so its handlers see them in the
+    order they were published; events without a habit_id are spread round
+    robin. publish_many() puts one batch per worker on its queue, and batch
+    handlers receive each batch's matching events together.
+
+    When a queue is full, backpressure decides what happens: "block" makes
+    publish() wait for room, raising EventQueueFullError after block_timeout
+    seconds if one is set; "drop" discards the event (or batch) with a
+    warning and counts the events in `dropped`.
+
+    A failing handler is logged and does not stop the others; with
+    `metrics`, every handler call is timed and its failures recorded there,
+    from the worker threads. drain() waits
+    until every event published so far has been handled; close() drains the
+    queues and stops the workers.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 1000,
+        backpressure: Backpressure = "block",
+        block_timeout: float | None = None,
+        metrics: EventBusMetrics | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("An async event bus needs at least one worker")
+        if backpressure not in ("block", "drop"):
+            raise ValueError(f"Unknown backpressure policy: {backpressure!r}")
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dispatch = _DispatchTable()
+        self._invoke = _caller(metrics)
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        # Guards _closed and _putting, so close() enqueues its sentinels only
+        # after every put that saw the bus open has finished.
+        self._state = threading.Condition()
+        self._closed = False
+        self._putting = 0
+        self._queues: list[queue.Queue[list[DomainEvent] | None]] = [
+            queue.Queue(maxsize=queue_size) for _ in range(workers)
+        ]
+        self._threads = [
+            threading.Thread(target=self._work, args=(q,), name=f"event-bus-worker-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        self._dispatch.add(event_type, handler)
+
+    def subscribe_batch(self, event_type: type[E], handler: Callable[[Sequence[E]], None]) -> None:
+        self._dispatch.add_batch(event_type, handler)
+
+    def publish(self, event: DomainEvent) -> None:
+        self._put(self._queue_index(event), [event])
+
+    def publish_many(self, events: Sequence[DomainEvent]) -> None:
+        shards: dict[int, list[DomainEvent]] = {}
+        for event in events:
+            shards.setdefault(self._queue_index(event), []).append(event)
+        for index, shard in shards.items():
+            self._put(index, shard)
+
+    def drain(self) -> None:
+        """Block until every event published so far has been handled."""
+        for q in self._queues:
+            q.join()
+
+    def close(self) -> None:
+        """Handle the remaining events, then stop the workers."""
+        with self._state:
+            if self._closed:
+                return
+            self._closed = True
+            # Workers keep consuming meanwhile, so blocked puts get their room.
+            self._state.wait_for(lambda: self._putting == 0)
+            for q in self._queues:
+                q.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _queue_index(self, event: DomainEvent) -> int:
+        key = getattr(event, "habit_id", None)
+        index = next(self._round_robin) if key is None else hash(key)
+        return index % len(self._queues)
+
+    def _put(self, index: int, events: list[DomainEvent]) -> None:
+        with self._state:
+            if self._closed:
+                raise RuntimeError("Event bus is closed")
+            self._putting += 1
+        try:
+            self._enqueue(self._queues[index], events)
+        finally:
+            with self._state:
+                self._putting -= 1
+                if self._putting == 0:
+                    self._state.notify_all()
+
+    def _enqueue(self, target: queue.Queue[list[DomainEvent] | None], events: list[DomainEvent]) -> None:
+        if self.backpressure == "drop":
             try:
-                handler(event)
-            except Exception as e:
-                print(f"Error in handler {handler}: {e}")
+                target.put_nowait(events)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += len(events)
+                logger.warning(
+                    "Event queue full, dropping %d event(s) starting with %s", len(events), type(events[0]).__name__
+                )
+            return
+        try:
+            target.put(events, timeout=self.block_timeout)
+        except queue.Full:
+            raise EventQueueFullError(f"Event queue full, could not publish {type(events[0]).__name__}") from None
+
+    def _work(self, batches: queue.Queue[list[DomainEvent] | None]) -> None:
+        while True:
+            events = batches.get()
+            try:
+                if events is None:
+                    return
+                self._dispatch.dispatch(events, self._call)
+            finally:
+                batches.task_done()
+
+    def _call(self, handler: Callable[[Any], None], argument: Any) -> None:
+        try:
+            self._invoke(handler, argument)
+        except Exception:
+            logger.exception("Error in handler %r", handler)
@@ -0,0 +1,102 @@
+"""In-process collection of event handler metrics, fed by the event buses."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import traceback
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+
+from habit_tracker.application.event_bus import EventBusMetrics
+from habit_tracker.domain.events import DomainEvent
+
+# Upper bounds, in seconds, of the latency histogram buckets; a last bucket
+# counts the calls slower than all of them.
+LATENCY_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+@dataclass
+class HandlerStats:
+    """What one handler cost for one event type."""
+
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # buckets[i] counts calls that took at most LATENCY_BUCKETS[i]; the extra last one, the rest.
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    """Events a handler raised on, with the traceback it raised."""
+
+    handler: str
+    events: tuple[DomainEvent, ...]
+    error: str
+    traceback: str
+    failed_at: datetime
+
+
+class InMemoryEventBusMetrics(EventBusMetrics):
+    """Keeps per-(event type, handler) stats and the latest dead letters in memory.
+
+    Only the newest max_dead_letters dead letters are kept. Safe to share
+    between the worker threads of an AsyncEventBus.
+    """
+
+    def __init__(self, max_dead_letters: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], HandlerStats] = {}
+        self._dead_letters: deque[DeadLetter] = deque(maxlen=max_dead_letters)
+
+    def record_call(self, event_type: type[DomainEvent], handler: str, seconds: float, failed: bool) -> None:
+        key = (event_type.__name__, handler)
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = HandlerStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.buckets[bucket] += 1
+
+    def record_failure(self, events: Sequence[DomainEvent], handler: str, error: BaseException) -> None:
+        dead_letter = DeadLetter(
+            handler=handler,
+            events=tuple(events),
+            error=repr(error),
+            traceback="".join(traceback.format_exception(error)),
+            failed_at=datetime.now(UTC),
+        )
+        with self._lock:
+            self._dead_letters.append(dead_letter)
+
+    def stats(self) -> dict[tuple[str, str], HandlerStats]:
+        """Return a copy of the stats, keyed by (event type name, handler name)."""
+        with self._lock:
+            return {key: replace(stats, buckets=list(stats.buckets)) for key, stats in self._stats.items()}
+
+    def dead_letters(self) -> list[DeadLetter]:
+        """Return the kept dead letters, oldest first."""
+        with self._lock:
+            return list(self._dead_letters)
+
+    def slowest(self, limit: int = 10) -> list[tuple[tuple[str, str], HandlerStats]]:
+        """Return the handlers with the most total time spent, most first."""
+        ranked = sorted(self.stats().items(), key=lambda item: item[1].total_seconds, reverse=True)
+        return ranked[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._dead_letters.clear()
@@ -0,0 +1,152 @@
+"""Encodings of domain events for storage: JSON (outbox) and a compact binary one (event store)."""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Callable
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import Any, get_type_hints
+from uuid import UUID
+
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated, UserDeactivated, UserUpdated
+from habit_tracker.domain.helpers import _NAIVE_EPOCH, _UTC_EPOCH, _timestamp_us
+
+# Event types that can be stored, by the name written next to their payload.
+EVENT_TYPES: dict[str, type[DomainEvent]] = {
+    cls.__name__: cls for cls in (HabitCreated, HabitCompleted, UserUpdated, UserDeactivated)
+}
+_FIELD_TYPES: dict[str, dict[str, Any]] = {name: get_type_hints(cls) for name, cls in EVENT_TYPES.items()}
+
+
+def encode_event(event: DomainEvent) -> tuple[str, str]:
+    """Return the event's type name and its fields as a JSON object."""
+    event_type = type(event).__name__
+    if EVENT_TYPES.get(event_type) is not type(event):
+        raise ValueError(f"Cannot encode unregistered event type: {event_type}")
+    payload = {field.name: _to_json(getattr(event, field.name)) for field in fields(event)}
+    return event_type, json.dumps(payload, separators=(",", ":"))
+
+
+def decode_event(event_type: str, payload: str) -> DomainEvent:
+    """Rebuild an event from the output of encode_event."""
+    cls = EVENT_TYPES.get(event_type)
+    if cls is None:
+        raise ValueError(f"Unknown event type: {event_type}")
+    hints = _FIELD_TYPES[event_type]
+    values = {name: _from_json(hints[name], value) for name, value in json.loads(payload).items()}
+    return cls(**values)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _from_json(hint: Any, value: Any) -> Any:
+    if hint is UUID:
+        return UUID(value)
+    if hint is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def datetime_to_int(value: datetime) -> int:
+    """Encode a datetime as the integer the event store and the SQLite columns hold.
+
+    That is microseconds since the epoch shifted left by one, with the low bit
+    set for timezone-aware values. Aware values count from the UTC epoch and
+    come back in UTC, losing their offset, so the date() of one read back is
+    its UTC date; naive ones count from a naive epoch and come back naive.
+    Integer order matches time order, treating naive values as UTC.
+    """
+    return _timestamp_us(value) << 1 | int(value.tzinfo is not None)
+
+
+def datetime_from_int(value: int) -> datetime:
+    """Decode the output of datetime_to_int."""
+    epoch = _UTC_EPOCH if value & 1 else _NAIVE_EPOCH
+    return epoch + timedelta(microseconds=value >> 1)
+
+
+# Binary format: one byte with the event's code, then its fields in declaration
+# order. UUIDs take their 16 bytes; datetimes 8 bytes holding datetime_to_int(),
+# as the SQLite columns do; strings a 4-byte length and their UTF-8; ints 8
+# bytes and bools one. A HabitCompleted takes 33 bytes, a quarter of its JSON.
+# Codes are part of the stored format: never change or reuse one.
+EVENT_CODES: dict[str, int] = {"HabitCreated": 1, "HabitCompleted": 2, "UserUpdated": 3, "UserDeactivated": 4}
+
+_INT64 = struct.Struct("<q")
+_UINT32 = struct.Struct("<I")
+_Packer = Callable[[Any], bytes]
+_Unpacker = Callable[[memoryview, int], tuple[Any, int]]
+
+
+def _pack_datetime(value: datetime) -> bytes:
+    return _INT64.pack(datetime_to_int(value))
+
+
+def _unpack_datetime(data: memoryview, offset: int) -> tuple[datetime, int]:
+    (raw,) = _INT64.unpack_from(data, offset)
+    return datetime_from_int(raw), offset + 8
+
+
+def _unpack_uuid(data: memoryview, offset: int) -> tuple[UUID, int]:
+    return UUID(bytes=bytes(data[offset : offset + 16])), offset + 16
+
+
+def _pack_str(value: str) -> bytes:
+    encoded = value.encode()
+    return _UINT32.pack(len(encoded)) + encoded
+
+
+def _unpack_str(data: memoryview, offset: int) -> tuple[str, int]:
+    (length,) = _UINT32.unpack_from(data, offset)
+    start = offset + 4
+    return bytes(data[start : start + length]).decode(), start + length
+
+
+_FIELD_CODECS: dict[Any, tuple[_Packer, _Unpacker]] = {
+    UUID: (lambda value: value.bytes, _unpack_uuid),
+    datetime: (_pack_datetime, _unpack_datetime),
+    str: (_pack_str, _unpack_str),
+    int: (_INT64.pack, lambda data, offset: (_INT64.unpack_from(data, offset)[0], offset + 8)),
+    bool: (lambda value: b"\x01" if value else b"\x00", lambda data, offset: (data[offset] == 1, offset + 1)),
+}
+
+# Event code -> (event class, (field name, packer, unpacker) per field)
+_LAYOUTS: dict[int, tuple[type[DomainEvent], tuple[tuple[str, _Packer, _Unpacker], ...]]] = {
+    EVENT_CODES[name]: (
+        cls,
+        tuple((field.name, *_FIELD_CODECS[_FIELD_TYPES[name][field.name]]) for field in fields(cls)),
+    )
+    for name, cls in EVENT_TYPES.items()
+}
+
+
+def pack_event(event: DomainEvent) -> bytes:
+    """Return the event in the compact binary format."""
+    code = EVENT_CODES.get(type(event).__name__)
+    if code is None or _LAYOUTS[code][0] is not type(event):
+        raise ValueError(f"Cannot encode unregistered event type: {type(event).__name__}")
+    parts = [bytes((code,))]
+    parts.extend(pack(getattr(event, name)) for name, pack, _unpack in _LAYOUTS[code][1])
+    return b"".join(parts)
+
+
+def unpack_event(data: bytes) -> DomainEvent:
+    """Rebuild an event from the output of pack_event."""
+    layout = _LAYOUTS.get(data[0]) if data else None
+    if layout is None:
+        raise ValueError(f"Unknown event code: {data[:1]!r}")
+    cls, field_codecs = layout
+    view = memoryview(data)
+    offset = 1
+    values: dict[str, Any] = {}
+    for name, _pack, unpack in field_codecs:
+        values[name], offset = unpack(view, offset)
+    return cls(**values)
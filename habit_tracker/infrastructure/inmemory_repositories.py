@@ -1,28 +1,48 @@
 from __future__ import annotations
 
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import replace
 from datetime import UTC, datetime
+from heapq import heapify, heappop, heappush
+from itertools import count, islice
 from uuid import UUID
 
+from habit_tracker.application.projections import event_partition
 from habit_tracker.application.repositories import (
     CompletionRepository,
+    DeadLetterRepository,
+    EventStore,
+    FailedDelivery,
     HabitRepository,
+    OutboxMessage,
+    OutboxRepository,
     ReminderRepository,
+    StoredEvent,
     UserRepository,
 )
 from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.events import DomainEvent
 from habit_tracker.domain.habit import Habit
 from habit_tracker.domain.reminder import Reminder
 from habit_tracker.domain.user import User
 
 
 class InMemoryHabitRepository(HabitRepository):
-    """Simple in-memory habit store using a dict."""
+    """Simple in-memory habit store using a dict, indexed by user."""
 
     def __init__(self) -> None:
         self._habits: dict[UUID, Habit] = {}
+        # user_id -> that user's habit ids, in insertion order (dict used as an ordered set)
+        self._ids_by_user_id: dict[UUID, dict[UUID, None]] = {}
 
     def add(self, habit: Habit) -> None:
+        previous = self._habits.get(habit.id)
+        if previous is not None and previous.user_id != habit.user_id:
+            self._unindex(previous)
         self._habits[habit.id] = habit
+        self._ids_by_user_id.setdefault(habit.user_id, {})[habit.id] = None
 
     def get(self, habit_id: UUID) -> Habit:
         try:
@@ -30,14 +50,17 @@ class InMemoryHabitRepository(HabitRepository):
         except KeyError as exc:
             raise KeyError(f"Habit {habit_id} not found") from exc
 
+    def get_many(self, habit_ids: Iterable[UUID]) -> dict[UUID, Habit]:
+        return {habit_id: self._habits[habit_id] for habit_id in habit_ids if habit_id in self._habits}
+
     def get_by_user_id(self, user_id: UUID) -> Habit | None:
-        for habit in self._habits.values():
-            if habit.user_id == user_id:
-                return habit
-        return None
+        habit_ids = self._ids_by_user_id.get(user_id)
+        if not habit_ids:
+            return None
+        return self._habits[next(iter(habit_ids))]
 
     def list_by_user_id(self, user_id: UUID) -> list[Habit]:
-        return [habit for habit in self._habits.values() if habit.user_id == user_id]
+        return [self._habits[habit_id] for habit_id in self._ids_by_user_id.get(user_id, ())]
 
     def list_all(self) -> list[Habit]:
         # Return a copy so callers cannot mutate internal state accidentally.
@@ -45,24 +68,48 @@ class InMemoryHabitRepository(HabitRepository):
 
     def remove(self, habit_id: UUID) -> None:
         # Use pop with default to avoid KeyError if it does not exist.
-        self._habits.pop(habit_id, None)
+        habit = self._habits.pop(habit_id, None)
+        if habit is not None:
+            self._unindex(habit)
+
+    def _unindex(self, habit: Habit) -> None:
+        habit_ids = self._ids_by_user_id.get(habit.user_id)
+        if habit_ids is None:
+            return
+        habit_ids.pop(habit.id, None)
+        if not habit_ids:
+            del self._ids_by_user_id[habit.user_id]
+
+
+def _completed_at(completion: Completion) -> datetime:
+    return completion.completed_at
 
 
 class InMemoryCompletionRepository(CompletionRepository):
-    """Simple in-memory completion store using a list."""
+    """In-memory completion store with one list per habit, sorted by completed_at.
+
+    Completions almost always arrive newest-last, so add() is usually an append;
+    older ones are inserted in place. Range queries bisect instead of scanning,
+    and the latest completion is the last item of its habit's list.
+    """
 
     def __init__(self) -> None:
-        self._completions: list[Completion] = []
+        self._by_habit_id: dict[UUID, list[Completion]] = {}
 
     def add(self, completion: Completion) -> None:
-        self._completions.append(completion)
+        completions = self._by_habit_id.setdefault(completion.habit_id, [])
+        if not completions or completions[-1].completed_at <= completion.completed_at:
+            completions.append(completion)
+        else:
+            insort(completions, completion, key=_completed_at)
+
+    def add_many(self, completions: Sequence[Completion]) -> None:
+        for completion in completions:
+            self.add(completion)
 
     def list_for_habit(self, habit_id: UUID) -> list[Completion]:
-        result: list[Completion] = []
-        for c in self._completions:
-            if c.habit_id == habit_id:
-                result.append(c)
-        return result
+        # Return a copy so callers cannot mutate internal state accidentally.
+        return list(self._by_habit_id.get(habit_id, ()))
 
     def list_for_habit_between(
         self,
@@ -70,51 +117,153 @@ class InMemoryCompletionRepository(CompletionRepository):
         start: datetime,
         end: datetime,
     ) -> list[Completion]:
-        result: list[Completion] = []
-        for c in self._completions:
-            if c.habit_id != habit_id:
-                continue
-            if start <= c.completed_at <= end:
-                result.append(c)
-        return result
+        completions = self._by_habit_id.get(habit_id, [])
+        lo = bisect_left(completions, start, key=_completed_at)
+        hi = bisect_right(completions, end, lo=lo, key=_completed_at)
+        return completions[lo:hi]
+
+    def iter_for_habit_newest_first(self, habit_id: UUID) -> Iterator[Completion]:
+        # Iterate a snapshot: adds made while the caller is still reading must not shift it.
+        return reversed(self.list_for_habit(habit_id))
+
+    def get_latest_for_habit(self, habit_id: UUID) -> Completion | None:
+        completions = self._by_habit_id.get(habit_id)
+        return completions[-1] if completions else None
+
+
+# (next_due_at, reminder id, seq, habit_id): the heap order is the (next_due_at, id)
+# page order of list_due; seq is unique, so entries never compare further.
+_DueEntry = tuple[datetime, UUID, int, UUID]
 
 
 class InMemoryReminderRepository(ReminderRepository):
-    """Simple in-memory reminder store.
+    """Simple in-memory reminder store with a heap of due times.
 
     We assume one reminder per habit. We store by habit_id.
+
+    Active reminders also get an entry in a min-heap keyed on next_due_at.
+    Overwriting a habit's reminder pushes a new entry and leaves the old one
+    behind as stale: an entry is live only while its seq is the latest for
+    its habit. list_due walks the heap best-first and stops at the first
+    entry after `before`, so it only visits due (or stale) entries, plus the
+    ones before the `after` cursor of a later page. The heap is rebuilt
+    without stale entries once they outnumber the live ones.
+
+    Dispatcher leases live next to the reminders, keyed by habit_id.
     """
 
     def __init__(self) -> None:
         self._by_habit_id: dict[UUID, Reminder] = {}
+        self._due_heap: list[_DueEntry] = []
+        self._live_seq: dict[UUID, int] = {}
+        self._seq = count()
+        # habit_id -> (worker_id, lease_until) for reminders handed to a dispatcher
+        self._leases: dict[UUID, tuple[str, datetime]] = {}
+        self._lease_lock = threading.Lock()
 
     def add(self, reminder: Reminder) -> None:
         self._by_habit_id[reminder.habit_id] = reminder
+        self._live_seq.pop(reminder.habit_id, None)
+
+        if reminder.active:
+            seq = next(self._seq)
+            self._live_seq[reminder.habit_id] = seq
+            heappush(self._due_heap, (reminder.next_due_at, reminder.id, seq, reminder.habit_id))
+
+        if len(self._due_heap) > 2 * len(self._live_seq) + 64:
+            self._compact()
+
+    def add_many(self, reminders: Sequence[Reminder]) -> None:
+        for reminder in reminders:
+            self.add(reminder)
 
     def get_by_habit_id(self, habit_id: UUID) -> Reminder | None:
         return self._by_habit_id.get(habit_id)
 
-    def list_due(self, before: datetime) -> list[Reminder]:
+    def get_many_by_habit_ids(self, habit_ids: Iterable[UUID]) -> dict[UUID, Reminder]:
+        return {habit_id: self._by_habit_id[habit_id] for habit_id in habit_ids if habit_id in self._by_habit_id}
+
+    def list_due(
+        self,
+        before: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[Reminder]:
+        return list(islice(self._iter_due(before, after), limit))
+
+    def _iter_due(self, before: datetime, after: tuple[datetime, UUID] | None = None) -> Iterator[Reminder]:
         if before.tzinfo is None:
             before = before.replace(tzinfo=UTC)
 
-        due: list[Reminder] = []
-        for r in self._by_habit_id.values():
-            if not r.active:
-                continue
-            if r.next_due_at <= before:
-                due.append(r)
-        return due
+        heap = self._due_heap
+        if not heap:
+            return
+
+        # Expand heap nodes in key order; children are never earlier than their parent.
+        frontier: list[tuple[_DueEntry, int]] = [(heap[0], 0)]
+        while frontier:
+            (next_due_at, reminder_id, seq, habit_id), index = heappop(frontier)
+            if next_due_at > before:
+                break
+            if self._live_seq.get(habit_id) == seq and (after is None or (next_due_at, reminder_id) > after):
+                yield self._by_habit_id[habit_id]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heappush(frontier, (heap[child], child))
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        worker_id: str,
+        lease_until: datetime,
+    ) -> list[Reminder]:
+        claimed: list[Reminder] = []
+        with self._lease_lock:
+            for reminder in self._iter_due(now):
+                if len(claimed) >= limit:
+                    break
+                lease = self._leases.get(reminder.habit_id)
+                if lease is not None and lease[1] > now:
+                    continue
+                self._leases[reminder.habit_id] = (worker_id, lease_until)
+                claimed.append(reminder)
+        return claimed
+
+    def complete_claimed(self, worker_id: str, completed: Sequence[tuple[Reminder, datetime]]) -> None:
+        with self._lease_lock:
+            for claimed, next_due_at in completed:
+                lease = self._leases.get(claimed.habit_id)
+                if lease is None or lease[0] != worker_id:
+                    continue
+                del self._leases[claimed.habit_id]
+                current = self._by_habit_id.get(claimed.habit_id)
+                # A next_due_at written since the claim wins over ours.
+                if current is not None and current.id == claimed.id and current.next_due_at == claimed.next_due_at:
+                    self.add(replace(current, next_due_at=next_due_at))
+
+    def _compact(self) -> None:
+        self._due_heap = [entry for entry in self._due_heap if self._live_seq.get(entry[3]) == entry[2]]
+        heapify(self._due_heap)
 
 
 class InMemoryUserRepository(UserRepository):
-    """Simple in-memory user store using a dict."""
+    """Simple in-memory user store using a dict, indexed by email.
+
+    Emails are matched exactly, like the UNIQUE email column in SQLite.
+    """
 
     def __init__(self) -> None:
         self._users: dict[UUID, User] = {}
+        self._ids_by_email: dict[str, UUID] = {}
 
     def add(self, user: User) -> None:
+        previous = self._users.get(user.id)
+        if previous is not None and previous.email != user.email:
+            self._unindex(previous)
         self._users[user.id] = user
+        # The first user stored with an email keeps it, as the old linear scan did.
+        self._ids_by_email.setdefault(user.email, user.id)
 
     def get(self, user_id: UUID) -> User:
         try:
@@ -123,13 +272,134 @@ class InMemoryUserRepository(UserRepository):
             raise KeyError(f"User {user_id} not found") from exc
 
     def get_by_email(self, email: str) -> User | None:
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        user_id = self._ids_by_email.get(email)
+        if user_id is None:
+            return None
+        return self._users[user_id]
 
     def list_all(self) -> list[User]:
         return list(self._users.values())
 
     def remove(self, user_id: UUID) -> None:
-        self._users.pop(user_id, None)
+        user = self._users.pop(user_id, None)
+        if user is not None:
+            self._unindex(user)
+
+    def _unindex(self, user: User) -> None:
+        if self._ids_by_email.get(user.email) == user.id:
+            del self._ids_by_email[user.email]
+
+
+class InMemoryOutboxRepository(OutboxRepository):
+    """In-memory outbox: undelivered events kept in insertion order.
+
+    Messages given up on move from _pending to _failed.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, OutboxMessage] = {}
+        self._failed: dict[int, OutboxMessage] = {}
+        self._ids = count(1)
+
+    def add(self, event: DomainEvent) -> None:
+        message_id = next(self._ids)
+        self._pending[message_id] = OutboxMessage(id=message_id, event=event)
+
+    def add_many(self, events: Sequence[DomainEvent]) -> None:
+        for event in events:
+            self.add(event)
+
+    def list_pending(self, limit: int) -> list[OutboxMessage]:
+        return list(islice(self._pending.values(), limit))
+
+    def mark_delivered(self, message_ids: Sequence[int], delivered_at: datetime) -> None:
+        for message_id in message_ids:
+            self._pending.pop(message_id, None)
+
+    def record_failure(self, message_id: int, error: str, failed_at: datetime, give_up: bool) -> None:
+        message = self._pending.get(message_id)
+        if message is None:
+            return
+        message = replace(message, attempts=message.attempts + 1)
+        if give_up:
+            del self._pending[message_id]
+            self._failed[message_id] = message
+        else:
+            self._pending[message_id] = message
+
+
+class InMemoryDeadLetterRepository(DeadLetterRepository):
+    """In-memory dead-letter store, shared by request threads and the retry worker."""
+
+    def __init__(self) -> None:
+        self._deliveries: dict[int, FailedDelivery] = {}
+        self._ids = count(1)
+        self._lock = threading.Lock()
+
+    def add(
+        self, event: DomainEvent, handler: str, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        with self._lock:
+            delivery_id = next(self._ids)
+            self._deliveries[delivery_id] = FailedDelivery(
+                id=delivery_id,
+                event=event,
+                handler=handler,
+                attempts=1,
+                last_error=error,
+                failed_at=failed_at,
+                next_attempt_at=next_attempt_at,
+            )
+
+    def get_many(self, delivery_ids: Sequence[int]) -> list[FailedDelivery]:
+        with self._lock:
+            return [self._deliveries[i] for i in sorted(set(delivery_ids)) if i in self._deliveries]
+
+    def list_all(self, limit: int, after_id: int = 0) -> list[FailedDelivery]:
+        with self._lock:
+            # Ids are handed out in increasing order and dicts keep insertion order.
+            return list(islice((d for d in self._deliveries.values() if d.id > after_id), limit))
+
+    def list_due(self, now: datetime, limit: int) -> list[FailedDelivery]:
+        with self._lock:
+            due = [d for d in self._deliveries.values() if d.next_attempt_at is not None and d.next_attempt_at <= now]
+        due.sort(key=lambda d: (d.next_attempt_at, d.id))
+        return due[:limit]
+
+    def record_failure(
+        self, delivery_id: int, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        with self._lock:
+            delivery = self._deliveries[delivery_id]
+            self._deliveries[delivery_id] = replace(
+                delivery,
+                attempts=delivery.attempts + 1,
+                last_error=error,
+                failed_at=failed_at,
+                next_attempt_at=next_attempt_at,
+            )
+
+    def remove(self, delivery_id: int) -> None:
+        with self._lock:
+            self._deliveries.pop(delivery_id, None)
+
+
+class InMemoryEventStore(EventStore):
+    """In-memory event store: one list of events per partition."""
+
+    def __init__(self) -> None:
+        self._partitions: dict[int, list[StoredEvent]] = {}
+        self._positions = count(1)
+        self._lock = threading.Lock()
+
+    def append_many(self, events: Sequence[DomainEvent]) -> None:
+        with self._lock:
+            for event in events:
+                stored = StoredEvent(position=next(self._positions), event=event)
+                self._partitions.setdefault(event_partition(event), []).append(stored)
+
+    def read(self, partition: int, after_position: int, limit: int) -> list[StoredEvent]:
+        with self._lock:
+            events = self._partitions.get(partition, [])
+            start = bisect_right([stored.position for stored in events], after_position)
+            return events[start : start + limit]
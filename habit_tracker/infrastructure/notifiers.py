@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import logging
+
+from habit_tracker.application.reminder_dispatcher import ReminderNotifier
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.reminder import Reminder
+
+logger = logging.getLogger(__name__)
+
+
+class LoggingReminderNotifier(ReminderNotifier):
+    """Notifier that only logs each reminder; a stand-in until real delivery exists."""
+
+    def notify(self, reminder: Reminder, habit: Habit) -> None:
+        logger.info(
+            "Reminder %s: habit %r (%s) for user %s was due at %s",
+            reminder.id,
+            habit.name,
+            habit.id,
+            habit.user_id,
+            reminder.next_due_at.isoformat(),
+        )
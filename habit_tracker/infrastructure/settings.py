@@ -7,8 +7,50 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "dev-secret-change-me"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 60
+    # Cache verified tokens and their users; entries live until the token expires or for
+    # the ttl (seconds), and are dropped when the user is updated or deactivated. Those events
+    # only reach this process: with several workers the ttl bounds how long another one's
+    # change goes unnoticed, so keep it short
+    auth_token_cache: bool = True
+    auth_token_cache_size: int = 10_000
+    auth_token_cache_ttl: float = 30.0
+    # Threads hashing passwords for /auth/register and /auth/login, and how many hashes may
+    # wait or run at once before further requests get a 503
+    password_hasher_workers: int = 2
+    password_hasher_max_pending: int = 64
+    # At startup pick the bcrypt cost whose hashes take about this long here (0: keep passlib's
+    # default), within min..max. Hashes below the min, a security floor, are redone on the next login
+    password_hash_target_seconds: float = 0.25
+    password_hash_min_rounds: int = 12
+    password_hash_max_rounds: int = 16
     database_mode: str = "sqlite"
     database_path: str = "habit_tracker.db"
+    # SQLite connection tuning, applied to every pooled connection
+    database_busy_timeout_ms: int = 5000
+    database_mmap_size: int = 256 * 1024 * 1024
+    database_cache_size: int = -16000  # negative: KiB, positive: pages
+    # "sync" runs event handlers inside the request; "async" hands them to worker threads
+    event_bus_mode: str = "sync"
+    event_bus_workers: int = 4
+    event_bus_queue_size: int = 1000
+    event_bus_backpressure: str = "block"  # or "drop"
+    # Time every event handler call and keep failed events (app.state.event_bus_metrics)
+    event_bus_metrics: bool = True
+    # Store the events a handler raised on and retry them with exponential backoff
+    event_bus_retry: bool = False
+    event_bus_retry_base_delay: float = 1.0  # seconds before the first retry; times the factor after each failure
+    event_bus_retry_factor: float = 2.0
+    event_bus_retry_max_delay: float = 600.0
+    event_bus_retry_max_attempts: int = 10
+    event_bus_retry_poll_interval: float = 1.0
+    # Append every published event to the SQLite event store (see rebuild-projections)
+    event_store: bool = True
+    # Users allowed to call the /admin endpoints
+    admin_emails: list[str] = []
+    # Store events in the SQLite outbox with their entity; a relay thread delivers them
+    event_outbox: bool = False
+    event_outbox_poll_interval: float = 0.2  # seconds the relay sleeps once the outbox is empty
+    event_outbox_max_attempts: int = 5  # failed deliveries before an event is set aside in the outbox
     # By default environment variables are case insensitive
     model_config = SettingsConfigDict(
         env_prefix="habit_tracker_",
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+
+class SQLiteConnectionPool:
+    """Hands out one SQLite connection per thread for a database file.
+
+    Sharing a single connection across FastAPI's threadpool serializes every
+    request on it and lets one request commit another's half-done writes.
+    Giving each thread its own connection, with the database in WAL mode,
+    lets readers run alongside the single writer; busy_timeout makes a second
+    writer wait for the lock instead of failing straight away.
+
+    Connections of threads that have exited are closed the next time a thread
+    opens one; close() closes everything at shutdown.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        *,
+        busy_timeout_ms: int = 5000,
+        mmap_size: int = 0,
+        cache_size: int = -2000,
+    ) -> None:
+        """
+        :param mmap_size: Bytes of the database file to memory-map (0 disables it).
+        :param cache_size: Page cache size; negative values are in KiB, positive ones in pages.
+        """
+        self.database_path = database_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[threading.Thread, sqlite3.Connection] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._close_dead_threads()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def close(self) -> None:
+        """Close every connection the pool has opened."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Each connection stays on its thread; check_same_thread is off only so
+        # close() can be called from whichever thread shuts the pool down.
+        conn = sqlite3.connect(
+            self.database_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        # In WAL mode NORMAL only risks the last commits on power loss, never corruption.
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _close_dead_threads(self) -> None:
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            self._connections.pop(thread).close()
@@ -1,20 +1,45 @@
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import groupby
 from uuid import UUID
 
+from habit_tracker.application.projections import PARTITIONS, event_partition
 from habit_tracker.application.repositories import (
     CompletionRepository,
+    DeadLetterRepository,
+    EventStore,
+    FailedDelivery,
     HabitRepository,
+    OutboxMessage,
+    OutboxRepository,
     ReminderRepository,
+    StoredEvent,
+    StreakRepository,
     UserRepository,
 )
+from habit_tracker.application.unit_of_work import UnitOfWork
 from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
 from habit_tracker.domain.habit import Habit
 from habit_tracker.domain.reminder import Reminder
 from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.streak import Streak, StreakState
+from habit_tracker.domain.streak_factory import make_streak_rule
+from habit_tracker.domain.streak_rules import IncrementalStreakRule
 from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_codec import (
+    datetime_from_int,
+    datetime_to_int,
+    decode_event,
+    encode_event,
+    pack_event,
+    unpack_event,
+)
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
 
 
 def _ensure_foreign_keys(conn: sqlite3.Connection) -> None:
@@ -26,6 +51,9 @@ def _create_schema(conn: sqlite3.Connection) -> None:
     """Create tables if they do not exist."""
     _ensure_foreign_keys(conn)
 
+    # These are the version 0 tables; _MIGRATIONS brings them up to date, so
+    # change the schema by appending a migration rather than editing them.
+
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS habits (
@@ -74,30 +102,515 @@ def _create_schema(conn: sqlite3.Connection) -> None:
         )
         """
     )
+
+    # Materialized default-rule streak per habit, maintained by SQLiteCompletionRepository.
+    # period/period_completions/prior_periods hold the StreakState to advance from.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS habit_streaks (
+            habit_id TEXT PRIMARY KEY,
+            current_streak INTEGER NOT NULL,
+            longest_streak INTEGER NOT NULL,
+            last_completed_at TEXT,
+            period INTEGER,
+            period_completions INTEGER NOT NULL,
+            prior_periods INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) REFERENCES habits(id) ON DELETE CASCADE
+        )
+        """
+    )
     conn.commit()
+    _migrate(conn)
+
+
+# Schema changes on top of the base tables above, applied in order. Entry N
+# brings a database to PRAGMA user_version N, so existing databases only run
+# the steps they have not seen yet. Append new steps; never edit shipped ones.
+_MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    # 1: secondary indexes for the per-habit, per-user and due-reminder queries
+    (
+        "CREATE INDEX IF NOT EXISTS ix_completions_habit_id_completed_at ON completions (habit_id, completed_at)",
+        "CREATE INDEX IF NOT EXISTS ix_habits_user_id ON habits (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_reminders_active_next_due_at ON reminders (next_due_at) WHERE active = 1",
+    ),
+    # 2: leases taken by reminder dispatchers (see SQLiteReminderRepository.claim_due)
+    (
+        "ALTER TABLE reminders ADD COLUMN lease_owner TEXT",
+        "ALTER TABLE reminders ADD COLUMN lease_expires_at TEXT",
+    ),
+    # 3: due-reminder index covers the (next_due_at, id) page order of list_due
+    (
+        "DROP INDEX IF EXISTS ix_reminders_active_next_due_at",
+        "CREATE INDEX IF NOT EXISTS ix_reminders_active_next_due_at_id ON reminders (next_due_at, id) WHERE active = 1",
+    ),
+    # 4: ids as 16-byte BLOBs and datetimes as INTEGERs (see _uuid_to_db and
+    # _dt_to_db). SQLite cannot change a column's type, so every table is copied
+    # into a new one, converted with the functions _migrate registers, and the
+    # new table takes the old one's name.
+    (
+        """
+        CREATE TABLE users_new (
+            id BLOB PRIMARY KEY,
+            email TEXT NOT NULL UNIQUE,
+            hashed_password TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            is_active INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT INTO users_new (id, email, hashed_password, created_at, is_active)
+        SELECT uuid_text_to_db(id), email, hashed_password, iso_text_to_db(created_at), is_active FROM users
+        """,
+        """
+        CREATE TABLE habits_new (
+            id BLOB PRIMARY KEY,
+            user_id BLOB NOT NULL,
+            name TEXT NOT NULL,
+            schedule TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            is_active INTEGER NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        """,
+        """
+        INSERT INTO habits_new (id, user_id, name, schedule, created_at, is_active)
+        SELECT uuid_text_to_db(id), uuid_text_to_db(user_id), name, schedule, iso_text_to_db(created_at), is_active
+        FROM habits
+        """,
+        """
+        CREATE TABLE completions_new (
+            id BLOB PRIMARY KEY,
+            habit_id BLOB NOT NULL,
+            completed_at INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) REFERENCES habits(id) ON DELETE CASCADE
+        )
+        """,
+        """
+        INSERT INTO completions_new (id, habit_id, completed_at)
+        SELECT uuid_text_to_db(id), uuid_text_to_db(habit_id), iso_text_to_db(completed_at) FROM completions
+        """,
+        """
+        CREATE TABLE reminders_new (
+            id BLOB PRIMARY KEY,
+            habit_id BLOB NOT NULL UNIQUE,
+            next_due_at INTEGER NOT NULL,
+            active INTEGER NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at INTEGER,
+            FOREIGN KEY (habit_id) REFERENCES habits(id) ON DELETE CASCADE
+        )
+        """,
+        """
+        INSERT INTO reminders_new (id, habit_id, next_due_at, active, lease_owner, lease_expires_at)
+        SELECT uuid_text_to_db(id), uuid_text_to_db(habit_id), iso_text_to_db(next_due_at), active,
+               lease_owner, iso_text_to_db(lease_expires_at)
+        FROM reminders
+        """,
+        """
+        CREATE TABLE habit_streaks_new (
+            habit_id BLOB PRIMARY KEY,
+            current_streak INTEGER NOT NULL,
+            longest_streak INTEGER NOT NULL,
+            last_completed_at INTEGER,
+            period INTEGER,
+            period_completions INTEGER NOT NULL,
+            prior_periods INTEGER NOT NULL,
+            FOREIGN KEY (habit_id) REFERENCES habits(id) ON DELETE CASCADE
+        )
+        """,
+        """
+        INSERT INTO habit_streaks_new (
+            habit_id, current_streak, longest_streak, last_completed_at, period, period_completions, prior_periods
+        )
+        SELECT uuid_text_to_db(habit_id), current_streak, longest_streak, iso_text_to_db(last_completed_at), period,
+               period_completions, prior_periods
+        FROM habit_streaks
+        """,
+        "DROP TABLE habit_streaks",
+        "DROP TABLE reminders",
+        "DROP TABLE completions",
+        "DROP TABLE habits",
+        "DROP TABLE users",
+        "ALTER TABLE users_new RENAME TO users",
+        "ALTER TABLE habits_new RENAME TO habits",
+        "ALTER TABLE completions_new RENAME TO completions",
+        "ALTER TABLE reminders_new RENAME TO reminders",
+        "ALTER TABLE habit_streaks_new RENAME TO habit_streaks",
+        "CREATE INDEX ix_completions_habit_id_completed_at ON completions (habit_id, completed_at)",
+        "CREATE INDEX ix_habits_user_id ON habits (user_id)",
+        "CREATE INDEX ix_reminders_active_next_due_at_id ON reminders (next_due_at, id) WHERE active = 1",
+    ),
+    # 5: transactional outbox of domain events (see SQLiteOutboxRepository)
+    (
+        """
+        CREATE TABLE outbox (
+            id INTEGER PRIMARY KEY,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            delivered_at INTEGER
+        )
+        """,
+        "CREATE INDEX ix_outbox_pending ON outbox (id) WHERE delivered_at IS NULL",
+    ),
+    # 6: failed event deliveries awaiting a retry (see SQLiteDeadLetterRepository)
+    (
+        """
+        CREATE TABLE dead_letters (
+            id INTEGER PRIMARY KEY,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            handler TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            last_error TEXT NOT NULL,
+            failed_at INTEGER NOT NULL,
+            next_attempt_at INTEGER
+        )
+        """,
+        "CREATE INDEX ix_dead_letters_due ON dead_letters (next_attempt_at, id) WHERE next_attempt_at IS NOT NULL",
+    ),
+    # 7: append-only event store (see SQLiteEventStore), seeded with the events
+    # that existing habits and completions were created by
+    (
+        """
+        CREATE TABLE event_store (
+            position INTEGER PRIMARY KEY,
+            partition INTEGER NOT NULL,
+            data BLOB NOT NULL
+        )
+        """,
+        "CREATE INDEX ix_event_store_partition_position ON event_store (partition, position)",
+        """
+        INSERT INTO event_store (partition, data)
+        SELECT habit_partition(id), pack_habit_created(id, name, created_at) FROM habits ORDER BY created_at, id
+        """,
+        """
+        INSERT INTO event_store (partition, data)
+        SELECT habit_partition(habit_id), pack_habit_completed(habit_id, completed_at)
+        FROM completions
+        ORDER BY completed_at, id
+        """,
+    ),
+    # 8: failed delivery attempts per outbox message; failed_at marks those given up on
+    (
+        "ALTER TABLE outbox ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE outbox ADD COLUMN last_error TEXT",
+        "ALTER TABLE outbox ADD COLUMN failed_at INTEGER",
+        "DROP INDEX ix_outbox_pending",
+        "CREATE INDEX ix_outbox_pending ON outbox (id) WHERE delivered_at IS NULL AND failed_at IS NULL",
+    ),
+)
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Apply any pending _MIGRATIONS in a single transaction."""
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    if version >= len(_MIGRATIONS):
+        return
+
+    conn.create_function("uuid_text_to_db", 1, _uuid_text_to_db, deterministic=True)
+    conn.create_function("iso_text_to_db", 1, _iso_text_to_db, deterministic=True)
+    conn.create_function("habit_partition", 1, _habit_partition, deterministic=True)
+    conn.create_function("pack_habit_created", 3, _pack_habit_created, deterministic=True)
+    conn.create_function("pack_habit_completed", 2, _pack_habit_completed, deterministic=True)
+    # Dropping a table that others reference would cascade-delete their rows
+    # while foreign keys are enforced, and the PRAGMA is a no-op inside a
+    # transaction, so switch enforcement off first and check the result instead.
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        # IMMEDIATE takes the write lock up front, so two processes opening the same
+        # database cannot both read the old version and apply the same step twice.
+        # Readers on a WAL database keep seeing the old tables until the commit.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            for target, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
+            if conn.execute("PRAGMA foreign_key_check").fetchone() is not None:
+                raise sqlite3.IntegrityError("Migration left rows with dangling foreign keys")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        _ensure_foreign_keys(conn)
+
+
+def _uuid_text_to_db(value: str | None) -> bytes | None:
+    return None if value is None else _uuid_to_db(UUID(value))
+
+
+def _iso_text_to_db(value: str | None) -> int | None:
+    return None if value is None else _dt_to_db(datetime.fromisoformat(value))
+
+
+def _habit_partition(habit_id_raw: bytes) -> int:
+    return habit_id_raw[-1] % PARTITIONS
+
+
+def _pack_habit_created(habit_id_raw: bytes, name: str, created_at_raw: int) -> bytes:
+    created_at = _dt_from_db(created_at_raw)
+    return pack_event(HabitCreated(occurred_at=created_at, habit_id=_uuid_from_db(habit_id_raw), name=name))
+
+
+def _pack_habit_completed(habit_id_raw: bytes, completed_at_raw: int) -> bytes:
+    completed_at = _dt_from_db(completed_at_raw)
+    return pack_event(
+        HabitCompleted(occurred_at=completed_at, habit_id=_uuid_from_db(habit_id_raw), completed_at=completed_at)
+    )
 
 
-def _uuid_to_str(value: UUID) -> str:
-    return str(value)
+# Storage format (since migration 4): ids are their 16 raw bytes, and datetimes
+# are integers in the event store's encoding (see datetime_to_int).
+_MIN_INT64 = -(2**63)
 
 
-def _uuid_from_str(value: str) -> UUID:
-    return UUID(value)
+def _uuid_to_db(value: UUID) -> bytes:
+    return value.bytes
 
 
-def _dt_to_str(dt: datetime) -> str:
-    return dt.isoformat()
+def _uuid_from_db(value: bytes) -> UUID:
+    return UUID(bytes=value)
 
 
-def _dt_from_str(value: str) -> datetime:
-    return datetime.fromisoformat(value)
+_dt_to_db = datetime_to_int
+_dt_from_db = datetime_from_int
 
 
-class SQLiteHabitRepository(HabitRepository):
-    def __init__(self, conn: sqlite3.Connection) -> None:
-        self._conn = conn
+def _as_stored(dt: datetime) -> datetime:
+    """Return the datetime as reading it back would, i.e. an aware one in UTC.
+
+    Streaks bucket completions by completed_at.date(), so they have to fold
+    the stored values: a completion at 01:00+09:00 counts for the previous
+    day, as it does when the streak is rebuilt from the table.
+    """
+    return _dt_from_db(_dt_to_db(dt))
+
+
+# ---------------------------------------------------------------------------
+# Materialized streaks
+# ---------------------------------------------------------------------------
+
+
+def _streak_rule_for_habit(conn: sqlite3.Connection, habit_id: UUID) -> IncrementalStreakRule | None:
+    row = conn.execute(
+        "SELECT schedule FROM habits WHERE id = ?",
+        (_uuid_to_db(habit_id),),
+    ).fetchone()
+    if row is None:
+        return None
+    try:
+        return make_streak_rule(Schedule(row[0]))
+    except ValueError:
+        # Schedules without streak support get no row.
+        return None
+
+
+def _fold_streak(
+    rule: IncrementalStreakRule,
+    habit_id: UUID,
+    completed_ats: Iterable[datetime],
+) -> tuple[StreakState, int]:
+    """Replay completion times (oldest first); return the final state and longest streak."""
+    state = StreakState(habit_id=habit_id)
+    longest = 0
+    for completed_at in completed_ats:
+        state = rule.advance(state, completed_at) or state
+        longest = max(longest, rule.streak_from_state(state).count)
+    return state, longest
+
+
+def _write_streak(
+    conn: sqlite3.Connection,
+    rule: IncrementalStreakRule,
+    state: StreakState,
+    longest: int,
+) -> None:
+    current = rule.streak_from_state(state).count
+    conn.execute(
+        """
+        INSERT INTO habit_streaks (
+            habit_id, current_streak, longest_streak, last_completed_at,
+            period, period_completions, prior_periods
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(habit_id) DO UPDATE SET
+            current_streak = excluded.current_streak,
+            longest_streak = excluded.longest_streak,
+            last_completed_at = excluded.last_completed_at,
+            period = excluded.period,
+            period_completions = excluded.period_completions,
+            prior_periods = excluded.prior_periods
+        """,
+        (
+            _uuid_to_db(state.habit_id),
+            current,
+            max(longest, current),
+            _dt_to_db(state.last_completed_at) if state.last_completed_at else None,
+            state.period,
+            state.period_completions,
+            state.prior_periods,
+        ),
+    )
+
+
+def _fold_habit_completions(
+    conn: sqlite3.Connection, rule: IncrementalStreakRule, habit_id: UUID
+) -> tuple[StreakState, int]:
+    cur = conn.execute(
+        "SELECT completed_at FROM completions WHERE habit_id = ? ORDER BY completed_at",
+        (_uuid_to_db(habit_id),),
+    )
+    return _fold_streak(rule, habit_id, (_dt_from_db(row[0]) for row in cur))
+
+
+def _rebuild_habit_streak(conn: sqlite3.Connection, rule: IncrementalStreakRule, habit_id: UUID) -> None:
+    state, longest = _fold_habit_completions(conn, rule, habit_id)
+    _write_streak(conn, rule, state, longest)
+
+
+def _read_streak(conn: sqlite3.Connection, habit_id: UUID) -> tuple[StreakState, int] | None:
+    """Return the habit's materialized streak state and longest streak, or None without a row."""
+    row = conn.execute(
+        """
+        SELECT longest_streak, last_completed_at, period, period_completions, prior_periods
+        FROM habit_streaks
+        WHERE habit_id = ?
+        """,
+        (_uuid_to_db(habit_id),),
+    ).fetchone()
+    if row is None:
+        return None
+
+    longest, last_completed_at_raw, period, period_completions, prior_periods = row
+    state = StreakState(
+        habit_id=habit_id,
+        period=period,
+        period_completions=period_completions,
+        prior_periods=prior_periods,
+        last_completed_at=_dt_from_db(last_completed_at_raw) if last_completed_at_raw is not None else None,
+    )
+    return state, longest
+
+
+def _record_streak_completions(conn: sqlite3.Connection, habit_id: UUID, completed_ats: Sequence[datetime]) -> None:
+    """Advance the habit's materialized streak by new completions, oldest first (no commit)."""
+    rule = _streak_rule_for_habit(conn, habit_id)
+    if rule is None:
+        return
+
+    stored = _read_streak(conn, habit_id)
+    if stored is None:
+        # First completion, or history recorded before the table existed.
+        _rebuild_habit_streak(conn, rule, habit_id)
+        return
+
+    state, longest = stored
+    for completed_at in map(_as_stored, completed_ats):
+        new_state = rule.advance(state, completed_at)
+        if new_state is None:
+            # Older than the latest completion: recompute from the full history.
+            _rebuild_habit_streak(conn, rule, habit_id)
+            return
+        state = new_state
+        longest = max(longest, rule.streak_from_state(state).count)
+
+    _write_streak(conn, rule, state, longest)
+
+
+# ---------------------------------------------------------------------------
+# Connections and transactions
+# ---------------------------------------------------------------------------
+
+# A single connection (tests, scripts) or a pool handing out one per thread.
+SQLiteConnection = sqlite3.Connection | SQLiteConnectionPool
+
+# Connections inside an SQLiteUnitOfWork, by id(), mapped to its nesting depth.
+# Each connection is only used from one thread, so no lock is needed.
+_open_units: dict[int, int] = {}
+
+
+# Most parameters one IN (...) list binds; older SQLite builds allow 999 per statement.
+_IN_CHUNK_SIZE = 500
+
+
+def _chunked(values: list[bytes]) -> Iterator[list[bytes]]:
+    for start in range(0, len(values), _IN_CHUNK_SIZE):
+        yield values[start : start + _IN_CHUNK_SIZE]
+
+
+def _resolve(source: SQLiteConnection) -> sqlite3.Connection:
+    if isinstance(source, SQLiteConnectionPool):
+        return source.connection()
+    return source
+
+
+def _commit(conn: sqlite3.Connection) -> None:
+    """Commit now, unless a unit of work will commit for us when it ends."""
+    if id(conn) not in _open_units:
+        conn.commit()
+
+
+def _rollback(conn: sqlite3.Connection) -> None:
+    """Roll back now, unless a unit of work will roll back as the error reaches it."""
+    if id(conn) not in _open_units:
+        conn.rollback()
+
+
+class SQLiteUnitOfWork(UnitOfWork):
+    """Defers repository commits on the current connection to one commit at the end."""
+
+    def __init__(self, conn: SQLiteConnection) -> None:
+        self._source = conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        conn = _resolve(self._source)
+        key = id(conn)
+        depth = _open_units.get(key, 0)
+        _open_units[key] = depth + 1
+        try:
+            yield
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
+        finally:
+            if depth == 0:
+                del _open_units[key]
+            else:
+                _open_units[key] = depth
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        with self.transaction():
+            conn = _resolve(self._source)
+            # ROLLBACK TO and RELEASE act on the innermost savepoint of a name, so nesting works.
+            conn.execute("SAVEPOINT unit_of_work")
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK TO unit_of_work")
+                conn.execute("RELEASE unit_of_work")
+                raise
+            conn.execute("RELEASE unit_of_work")
+
+
+class _SQLiteRepository:
+    def __init__(self, conn: SQLiteConnection) -> None:
+        self._source = conn
         _create_schema(self._conn)
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return _resolve(self._source)
+
+
+class SQLiteHabitRepository(_SQLiteRepository, HabitRepository):
     def add(self, habit: Habit) -> None:
         self._conn.execute(
             """
@@ -111,75 +624,95 @@ class SQLiteHabitRepository(HabitRepository):
                 is_active=excluded.is_active
             """,
             (
-                _uuid_to_str(habit.id),
-                _uuid_to_str(habit.user_id),
+                _uuid_to_db(habit.id),
+                _uuid_to_db(habit.user_id),
                 habit.name,
                 habit.schedule.raw,
-                _dt_to_str(habit.created_at),
+                _dt_to_db(habit.created_at),
                 1 if habit.is_active else 0,
             ),
         )
-        self._conn.commit()
+        _commit(self._conn)
 
     def get(self, habit_id: UUID) -> Habit:
         cur = self._conn.execute(
             "SELECT id, user_id, name, schedule, created_at, is_active FROM habits WHERE id = ?",
-            (_uuid_to_str(habit_id),),
+            (_uuid_to_db(habit_id),),
         )
         row = cur.fetchone()
         if row is None:
             raise KeyError(f"Habit {habit_id} not found")
 
-        id_str, user_id_str, name, schedule_raw, created_at_str, is_active_int = row
+        id_raw, user_id_raw, name, schedule_raw, created_at_raw, is_active_int = row
         return Habit(
-            id=_uuid_from_str(id_str),
-            user_id=_uuid_from_str(user_id_str),
+            id=_uuid_from_db(id_raw),
+            user_id=_uuid_from_db(user_id_raw),
             name=name,
             schedule=Schedule(schedule_raw),
-            created_at=_dt_from_str(created_at_str),
+            created_at=_dt_from_db(created_at_raw),
             is_active=bool(is_active_int),
         )
 
+    def get_many(self, habit_ids: Iterable[UUID]) -> dict[UUID, Habit]:
+        habits: dict[UUID, Habit] = {}
+        for chunk in _chunked([_uuid_to_db(habit_id) for habit_id in set(habit_ids)]):
+            cur = self._conn.execute(
+                "SELECT id, user_id, name, schedule, created_at, is_active FROM habits "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for id_raw, user_id_raw, name, schedule_raw, created_at_raw, is_active_int in cur:
+                habit = Habit(
+                    id=_uuid_from_db(id_raw),
+                    user_id=_uuid_from_db(user_id_raw),
+                    name=name,
+                    schedule=Schedule(schedule_raw),
+                    created_at=_dt_from_db(created_at_raw),
+                    is_active=bool(is_active_int),
+                )
+                habits[habit.id] = habit
+        return habits
+
     def get_by_user_id(self, user_id: UUID) -> Habit | None:
         cur = self._conn.execute(
             "SELECT id, user_id, name, schedule, created_at, is_active FROM habits WHERE user_id = ?",
-            (_uuid_to_str(user_id),),
+            (_uuid_to_db(user_id),),
         )
         row = cur.fetchone()
         if row is None:
             return None
 
-        id_str, user_id_str, name, schedule_raw, created_at_str, is_active_int = row
+        id_raw, user_id_raw, name, schedule_raw, created_at_raw, is_active_int = row
         return Habit(
-            id=_uuid_from_str(id_str),
-            user_id=_uuid_from_str(user_id_str),
+            id=_uuid_from_db(id_raw),
+            user_id=_uuid_from_db(user_id_raw),
             name=name,
             schedule=Schedule(schedule_raw),
-            created_at=_dt_from_str(created_at_str),
+            created_at=_dt_from_db(created_at_raw),
             is_active=bool(is_active_int),
         )
 
     def list_by_user_id(self, user_id: UUID) -> list[Habit]:
         cur = self._conn.execute(
             "SELECT id, user_id, name, schedule, created_at, is_active FROM habits WHERE user_id = ?",
-            (_uuid_to_str(user_id),),
+            (_uuid_to_db(user_id),),
         )
         habits: list[Habit] = []
         for (
-            id_str,
-            user_id_str,
+            id_raw,
+            user_id_raw,
             name,
             schedule_raw,
-            created_at_str,
+            created_at_raw,
             is_active_int,
         ) in cur.fetchall():
             habits.append(
                 Habit(
-                    id=_uuid_from_str(id_str),
-                    user_id=_uuid_from_str(user_id_str),
+                    id=_uuid_from_db(id_raw),
+                    user_id=_uuid_from_db(user_id_raw),
                     name=name,
                     schedule=Schedule(schedule_raw),
-                    created_at=_dt_from_str(created_at_str),
+                    created_at=_dt_from_db(created_at_raw),
                     is_active=bool(is_active_int),
                 )
             )
@@ -191,20 +724,20 @@ class SQLiteHabitRepository(HabitRepository):
         )
         habits: list[Habit] = []
         for (
-            id_str,
-            user_id_str,
+            id_raw,
+            user_id_raw,
             name,
             schedule_raw,
-            created_at_str,
+            created_at_raw,
             is_active_int,
         ) in cur.fetchall():
             habits.append(
                 Habit(
-                    id=_uuid_from_str(id_str),
-                    user_id=_uuid_from_str(user_id_str),
+                    id=_uuid_from_db(id_raw),
+                    user_id=_uuid_from_db(user_id_raw),
                     name=name,
                     schedule=Schedule(schedule_raw),
-                    created_at=_dt_from_str(created_at_str),
+                    created_at=_dt_from_db(created_at_raw),
                     is_active=bool(is_active_int),
                 )
             )
@@ -213,16 +746,12 @@ class SQLiteHabitRepository(HabitRepository):
     def remove(self, habit_id: UUID) -> None:
         self._conn.execute(
             "DELETE FROM habits WHERE id = ?",
-            (_uuid_to_str(habit_id),),
+            (_uuid_to_db(habit_id),),
         )
-        self._conn.commit()
-
+        _commit(self._conn)
 
-class SQLiteCompletionRepository(CompletionRepository):
-    def __init__(self, conn: sqlite3.Connection) -> None:
-        self._conn = conn
-        _create_schema(self._conn)
 
+class SQLiteCompletionRepository(_SQLiteRepository, CompletionRepository):
     def add(self, completion: Completion) -> None:
         self._conn.execute(
             """
@@ -233,12 +762,40 @@ class SQLiteCompletionRepository(CompletionRepository):
                 completed_at = excluded.completed_at
             """,
             (
-                _uuid_to_str(completion.id),
-                _uuid_to_str(completion.habit_id),
-                _dt_to_str(completion.completed_at),
+                _uuid_to_db(completion.id),
+                _uuid_to_db(completion.habit_id),
+                _dt_to_db(completion.completed_at),
             ),
         )
-        self._conn.commit()
+        # Same transaction as the insert, so the materialized streak never drifts.
+        _record_streak_completions(self._conn, completion.habit_id, [completion.completed_at])
+        _commit(self._conn)
+
+    def add_many(self, completions: Sequence[Completion]) -> None:
+        conn = self._conn
+        try:
+            conn.executemany(
+                """
+                INSERT INTO completions (id, habit_id, completed_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    habit_id = excluded.habit_id,
+                    completed_at = excluded.completed_at
+                """,
+                [
+                    (_uuid_to_db(c.id), _uuid_to_db(c.habit_id), _dt_to_db(c.completed_at))
+                    for c in completions
+                ],
+            )
+            completed_ats: dict[UUID, list[datetime]] = {}
+            for c in completions:
+                completed_ats.setdefault(c.habit_id, []).append(c.completed_at)
+            for habit_id, times in completed_ats.items():
+                _record_streak_completions(conn, habit_id, sorted(times))
+        except BaseException:
+            _rollback(conn)
+            raise
+        _commit(conn)
 
     def list_for_habit(self, habit_id: UUID) -> list[Completion]:
         cur = self._conn.execute(
@@ -248,15 +805,15 @@ class SQLiteCompletionRepository(CompletionRepository):
             WHERE habit_id = ?
             ORDER BY completed_at
             """,
-            (_uuid_to_str(habit_id),),
+            (_uuid_to_db(habit_id),),
         )
         completions: list[Completion] = []
-        for id_str, habit_id_str, completed_at_str in cur.fetchall():
+        for id_raw, habit_id_raw, completed_at_raw in cur.fetchall():
             completions.append(
                 Completion(
-                    id=_uuid_from_str(id_str),
-                    habit_id=_uuid_from_str(habit_id_str),
-                    completed_at=_dt_from_str(completed_at_str),
+                    id=_uuid_from_db(id_raw),
+                    habit_id=_uuid_from_db(habit_id_raw),
+                    completed_at=_dt_from_db(completed_at_raw),
                 )
             )
         return completions
@@ -276,46 +833,188 @@ class SQLiteCompletionRepository(CompletionRepository):
             ORDER BY completed_at
             """,
             (
-                _uuid_to_str(habit_id),
-                _dt_to_str(start),
-                _dt_to_str(end),
+                _uuid_to_db(habit_id),
+                _dt_to_db(start),
+                _dt_to_db(end),
             ),
         )
         completions: list[Completion] = []
-        for id_str, habit_id_str, completed_at_str in cur.fetchall():
+        for id_raw, habit_id_raw, completed_at_raw in cur.fetchall():
             completions.append(
                 Completion(
-                    id=_uuid_from_str(id_str),
-                    habit_id=_uuid_from_str(habit_id_str),
-                    completed_at=_dt_from_str(completed_at_str),
+                    id=_uuid_from_db(id_raw),
+                    habit_id=_uuid_from_db(habit_id_raw),
+                    completed_at=_dt_from_db(completed_at_raw),
                 )
             )
         return completions
 
+    def iter_for_habit_newest_first(self, habit_id: UUID) -> Iterator[Completion]:
+        cur = self._conn.execute(
+            """
+            SELECT id, habit_id, completed_at
+            FROM completions
+            WHERE habit_id = ?
+            ORDER BY completed_at DESC
+            """,
+            (_uuid_to_db(habit_id),),
+        )
+        try:
+            # Iterate the cursor itself so rows are stepped one at a time.
+            for id_raw, habit_id_raw, completed_at_raw in cur:
+                yield Completion(
+                    id=_uuid_from_db(id_raw),
+                    habit_id=_uuid_from_db(habit_id_raw),
+                    completed_at=_dt_from_db(completed_at_raw),
+                )
+        finally:
+            cur.close()
 
-class SQLiteReminderRepository(ReminderRepository):
-    def __init__(self, conn: sqlite3.Connection) -> None:
-        self._conn = conn
-        _create_schema(self._conn)
-
-    def add(self, reminder: Reminder) -> None:
-        self._conn.execute(
+    def get_latest_for_habit(self, habit_id: UUID) -> Completion | None:
+        row = self._conn.execute(
             """
-            INSERT INTO reminders (id, habit_id, next_due_at, active)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(habit_id) DO UPDATE SET
-                id = excluded.id,
-                next_due_at = excluded.next_due_at,
-                active = excluded.active
+            SELECT id, habit_id, completed_at
+            FROM completions
+            WHERE habit_id = ?
+            ORDER BY completed_at DESC
+            LIMIT 1
             """,
-            (
-                _uuid_to_str(reminder.id),
-                _uuid_to_str(reminder.habit_id),
-                _dt_to_str(reminder.next_due_at),
-                1 if reminder.active else 0,
-            ),
+            (_uuid_to_db(habit_id),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        id_raw, habit_id_raw, completed_at_raw = row
+        return Completion(
+            id=_uuid_from_db(id_raw),
+            habit_id=_uuid_from_db(habit_id_raw),
+            completed_at=_dt_from_db(completed_at_raw),
+        )
+
+
+class SQLiteStreakRepository(_SQLiteRepository, StreakRepository):
+    """Reads the habit_streaks table kept up to date by SQLiteCompletionRepository."""
+
+    def __init__(self, conn: SQLiteConnection) -> None:
+        super().__init__(conn)
+        # Habits record_completions() recomputed from the completions table,
+        # mapped to the newest completion that recomputation counted.
+        self._recomputed: dict[UUID, datetime | None] = {}
+
+    def get_streak(self, habit: Habit) -> Streak | None:
+        row = self._conn.execute(
+            "SELECT current_streak, last_completed_at FROM habit_streaks WHERE habit_id = ?",
+            (_uuid_to_db(habit.id),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        current_streak, last_completed_at_raw = row
+        return Streak(
+            habit_id=habit.id,
+            count=current_streak,
+            last_completed_at=_dt_from_db(last_completed_at_raw) if last_completed_at_raw is not None else None,
+        )
+
+    def get_longest_streak(self, habit_id: UUID) -> int | None:
+        row = self._conn.execute(
+            "SELECT longest_streak FROM habit_streaks WHERE habit_id = ?",
+            (_uuid_to_db(habit_id),),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def rebuild(self) -> int:
+        """Recompute the whole habit_streaks table from completions.
+
+        Returns the number of habits with a materialized streak.
+        """
+        rules: dict[bytes, IncrementalStreakRule] = {}
+        for habit_id_raw, schedule_raw in self._conn.execute("SELECT id, schedule FROM habits"):
+            try:
+                rules[habit_id_raw] = make_streak_rule(Schedule(schedule_raw))
+            except ValueError:
+                continue
+
+        self._conn.execute("DELETE FROM habit_streaks")
+        cur = self._conn.execute("SELECT habit_id, completed_at FROM completions ORDER BY habit_id, completed_at")
+        for habit_id_raw, rows in groupby(cur, key=lambda row: row[0]):
+            rule = rules.get(habit_id_raw)
+            if rule is None:
+                continue
+            completed_ats = (_dt_from_db(completed_at_raw) for _, completed_at_raw in rows)
+            state, longest = _fold_streak(rule, _uuid_from_db(habit_id_raw), completed_ats)
+            _write_streak(self._conn, rule, state, longest)
+
+        _commit(self._conn)
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM habit_streaks").fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Delete every materialized streak, e.g. before replaying completions into an empty table."""
+        self._conn.execute("DELETE FROM habit_streaks")
+        _commit(self._conn)
+        self._recomputed.clear()
+
+    def record_completions(self, habit_id: UUID, completed_ats: Sequence[datetime]) -> None:
+        """Advance a habit's streak by replayed completions, oldest first.
+
+        Meant for replaying HabitCompleted events into a cleared table: a habit
+        without a row starts from no completions instead of its completion
+        history, which also holds completions not replayed yet. A completion no
+        later than the latest one counted is out of order (e.g. synced offline)
+        or delivered twice; the habit is then recomputed from the completions
+        table, which holds each completion once, and the completions it
+        covered are skipped when their events come.
+        """
+        rule = _streak_rule_for_habit(self._conn, habit_id)
+        if rule is None:
+            return
+        state, longest = _read_streak(self._conn, habit_id) or (StreakState(habit_id=habit_id), 0)
+        for completed_at in map(_as_stored, completed_ats):
+            covered_until = self._recomputed.get(habit_id)
+            if covered_until is not None and completed_at <= covered_until:
+                continue
+            if state.last_completed_at is not None and completed_at <= state.last_completed_at:
+                state, longest = _fold_habit_completions(self._conn, rule, habit_id)
+                self._recomputed[habit_id] = state.last_completed_at
+                continue
+            state = rule.advance(state, completed_at) or state
+            longest = max(longest, rule.streak_from_state(state).count)
+        _write_streak(self._conn, rule, state, longest)
+        _commit(self._conn)
+
+
+class SQLiteReminderRepository(_SQLiteRepository, ReminderRepository):
+    _UPSERT = """
+        INSERT INTO reminders (id, habit_id, next_due_at, active)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(habit_id) DO UPDATE SET
+            id = excluded.id,
+            next_due_at = excluded.next_due_at,
+            active = excluded.active
+    """
+
+    def add(self, reminder: Reminder) -> None:
+        self._conn.execute(self._UPSERT, self._upsert_params(reminder))
+        _commit(self._conn)
+
+    def add_many(self, reminders: Sequence[Reminder]) -> None:
+        self._conn.executemany(self._UPSERT, [self._upsert_params(reminder) for reminder in reminders])
+        _commit(self._conn)
+
+    def clear(self) -> None:
+        """Delete every reminder, e.g. before rebuilding them from the event store."""
+        self._conn.execute("DELETE FROM reminders")
+        _commit(self._conn)
+
+    @staticmethod
+    def _upsert_params(reminder: Reminder) -> tuple[bytes, bytes, int, int]:
+        return (
+            _uuid_to_db(reminder.id),
+            _uuid_to_db(reminder.habit_id),
+            _dt_to_db(reminder.next_due_at),
+            1 if reminder.active else 0,
         )
-        self._conn.commit()
 
     def get_by_habit_id(self, habit_id: UUID) -> Reminder | None:
         cur = self._conn.execute(
@@ -324,47 +1023,135 @@ class SQLiteReminderRepository(ReminderRepository):
             FROM reminders
             WHERE habit_id = ?
             """,
-            (_uuid_to_str(habit_id),),
+            (_uuid_to_db(habit_id),),
         )
         row = cur.fetchone()
         if row is None:
             return None
 
-        id_str, habit_id_str, next_due_at_str, active_int = row
+        id_raw, habit_id_raw, next_due_at_raw, active_int = row
         return Reminder(
-            id=_uuid_from_str(id_str),
-            habit_id=_uuid_from_str(habit_id_str),
-            next_due_at=_dt_from_str(next_due_at_str),
+            id=_uuid_from_db(id_raw),
+            habit_id=_uuid_from_db(habit_id_raw),
+            next_due_at=_dt_from_db(next_due_at_raw),
             active=bool(active_int),
         )
 
-    def list_due(self, before: datetime) -> list[Reminder]:
+    def get_many_by_habit_ids(self, habit_ids: Iterable[UUID]) -> dict[UUID, Reminder]:
+        reminders: dict[UUID, Reminder] = {}
+        for chunk in _chunked([_uuid_to_db(habit_id) for habit_id in set(habit_ids)]):
+            cur = self._conn.execute(
+                "SELECT id, habit_id, next_due_at, active FROM reminders "
+                f"WHERE habit_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for id_raw, habit_id_raw, next_due_at_raw, active_int in cur:
+                reminder = Reminder(
+                    id=_uuid_from_db(id_raw),
+                    habit_id=_uuid_from_db(habit_id_raw),
+                    next_due_at=_dt_from_db(next_due_at_raw),
+                    active=bool(active_int),
+                )
+                reminders[reminder.habit_id] = reminder
+        return reminders
+
+    def list_due(
+        self,
+        before: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[Reminder]:
+        # Keyset pagination: seek past the last (next_due_at, id) instead of
+        # OFFSET, so every page is a range scan of the partial index.
+        after_due_at, after_id = (_MIN_INT64, b"") if after is None else (_dt_to_db(after[0]), _uuid_to_db(after[1]))
         cur = self._conn.execute(
             """
             SELECT id, habit_id, next_due_at, active
             FROM reminders
-            WHERE active = 1 AND next_due_at <= ?
+            WHERE active = 1 AND next_due_at <= ? AND (next_due_at, id) > (?, ?)
+            ORDER BY next_due_at, id
+            LIMIT ?
             """,
-            (_dt_to_str(before),),
+            (_dt_to_db(before), after_due_at, after_id, -1 if limit is None else limit),
         )
         reminders: list[Reminder] = []
-        for id_str, habit_id_str, next_due_at_str, active_int in cur.fetchall():
+        for id_raw, habit_id_raw, next_due_at_raw, active_int in cur.fetchall():
             reminders.append(
                 Reminder(
-                    id=_uuid_from_str(id_str),
-                    habit_id=_uuid_from_str(habit_id_str),
-                    next_due_at=_dt_from_str(next_due_at_str),
+                    id=_uuid_from_db(id_raw),
+                    habit_id=_uuid_from_db(habit_id_raw),
+                    next_due_at=_dt_from_db(next_due_at_raw),
                     active=bool(active_int),
                 )
             )
         return reminders
 
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        worker_id: str,
+        lease_until: datetime,
+    ) -> list[Reminder]:
+        conn = self._conn
+        if not conn.in_transaction:
+            # Take the write lock before reading, so the snapshot we pick due
+            # rows from cannot go stale before the UPDATE writes the lease.
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                UPDATE reminders
+                SET lease_owner = ?, lease_expires_at = ?
+                WHERE id IN (
+                    SELECT id
+                    FROM reminders
+                    WHERE active = 1 AND next_due_at <= ?
+                        AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+                    ORDER BY next_due_at, id
+                    LIMIT ?
+                )
+                RETURNING id, habit_id, next_due_at, active
+                """,
+                (worker_id, _dt_to_db(lease_until), _dt_to_db(now), _dt_to_db(now), limit),
+            ).fetchall()
+        except BaseException:
+            _rollback(conn)
+            raise
+        _commit(conn)
+
+        reminders = [
+            Reminder(
+                id=_uuid_from_db(id_raw),
+                habit_id=_uuid_from_db(habit_id_raw),
+                next_due_at=_dt_from_db(next_due_at_raw),
+                active=bool(active_int),
+            )
+            for id_raw, habit_id_raw, next_due_at_raw, active_int in rows
+        ]
+        # RETURNING does not follow the subquery's order.
+        reminders.sort(key=lambda r: (r.next_due_at, r.id))
+        return reminders
+
+    def complete_claimed(self, worker_id: str, completed: Sequence[tuple[Reminder, datetime]]) -> None:
+        # A next_due_at written since the claim (by ReminderEventHandler) wins over ours.
+        self._conn.executemany(
+            """
+            UPDATE reminders
+            SET next_due_at = CASE WHEN next_due_at = ? THEN ? ELSE next_due_at END,
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE id = ? AND lease_owner = ?
+            """,
+            [
+                (_dt_to_db(claimed.next_due_at), _dt_to_db(next_due_at), _uuid_to_db(claimed.id), worker_id)
+                for claimed, next_due_at in completed
+            ],
+        )
+        _commit(self._conn)
 
-class SQLiteUserRepository(UserRepository):
-    def __init__(self, conn: sqlite3.Connection) -> None:
-        self._conn = conn
-        _create_schema(self._conn)
 
+class SQLiteUserRepository(_SQLiteRepository, UserRepository):
     def add(self, user: User) -> None:
         self._conn.execute(
             """
@@ -377,30 +1164,30 @@ class SQLiteUserRepository(UserRepository):
                 is_active = excluded.is_active
             """,
             (
-                _uuid_to_str(user.id),
+                _uuid_to_db(user.id),
                 user.email,
                 user.hashed_password,
-                _dt_to_str(user.created_at),
+                _dt_to_db(user.created_at),
                 1 if user.is_active else 0,
             ),
         )
-        self._conn.commit()
+        _commit(self._conn)
 
     def get(self, user_id: UUID) -> User:
         cur = self._conn.execute(
             "SELECT id, email, hashed_password, created_at, is_active FROM users WHERE id = ?",
-            (_uuid_to_str(user_id),),
+            (_uuid_to_db(user_id),),
         )
         row = cur.fetchone()
         if row is None:
             raise KeyError(f"User {user_id} not found")
 
-        id_str, email, hashed_password, created_at_str, is_active_int = row
+        id_raw, email, hashed_password, created_at_raw, is_active_int = row
         return User(
-            id=_uuid_from_str(id_str),
+            id=_uuid_from_db(id_raw),
             email=email,
             hashed_password=hashed_password,
-            created_at=_dt_from_str(created_at_str),
+            created_at=_dt_from_db(created_at_raw),
             is_active=bool(is_active_int),
         )
 
@@ -413,12 +1200,12 @@ class SQLiteUserRepository(UserRepository):
         if row is None:
             return None
 
-        id_str, email, hashed_password, created_at_str, is_active_int = row
+        id_raw, email, hashed_password, created_at_raw, is_active_int = row
         return User(
-            id=_uuid_from_str(id_str),
+            id=_uuid_from_db(id_raw),
             email=email,
             hashed_password=hashed_password,
-            created_at=_dt_from_str(created_at_str),
+            created_at=_dt_from_db(created_at_raw),
             is_active=bool(is_active_int),
         )
 
@@ -428,18 +1215,18 @@ class SQLiteUserRepository(UserRepository):
         )
         users: list[User] = []
         for (
-            id_str,
+            id_raw,
             email,
             hashed_password,
-            created_at_str,
+            created_at_raw,
             is_active_int,
         ) in cur.fetchall():
             users.append(
                 User(
-                    id=_uuid_from_str(id_str),
+                    id=_uuid_from_db(id_raw),
                     email=email,
                     hashed_password=hashed_password,
-                    created_at=_dt_from_str(created_at_str),
+                    created_at=_dt_from_db(created_at_raw),
                     is_active=bool(is_active_int),
                 )
             )
@@ -448,6 +1235,177 @@ class SQLiteUserRepository(UserRepository):
     def remove(self, user_id: UUID) -> None:
         self._conn.execute(
             "DELETE FROM users WHERE id = ?",
-            (_uuid_to_str(user_id),),
+            (_uuid_to_db(user_id),),
+        )
+        _commit(self._conn)
+
+
+class SQLiteOutboxRepository(_SQLiteRepository, OutboxRepository):
+    """Outbox table of JSON-encoded events.
+
+    add() does not commit inside a unit of work, so an event is stored
+    atomically with the entity writes it describes.
+    """
+
+    def add(self, event: DomainEvent) -> None:
+        event_type, payload = encode_event(event)
+        self._conn.execute("INSERT INTO outbox (event_type, payload) VALUES (?, ?)", (event_type, payload))
+        _commit(self._conn)
+
+    def add_many(self, events: Sequence[DomainEvent]) -> None:
+        self._conn.executemany(
+            "INSERT INTO outbox (event_type, payload) VALUES (?, ?)", [encode_event(event) for event in events]
+        )
+        _commit(self._conn)
+
+    def list_pending(self, limit: int) -> list[OutboxMessage]:
+        cur = self._conn.execute(
+            """
+            SELECT id, event_type, payload, attempts FROM outbox
+            WHERE delivered_at IS NULL AND failed_at IS NULL
+            ORDER BY id
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        return [
+            OutboxMessage(id=message_id, event=decode_event(event_type, payload), attempts=attempts)
+            for message_id, event_type, payload, attempts in cur.fetchall()
+        ]
+
+    def mark_delivered(self, message_ids: Sequence[int], delivered_at: datetime) -> None:
+        if not message_ids:
+            return
+        delivered_at_raw = _dt_to_db(delivered_at)
+        self._conn.executemany(
+            "UPDATE outbox SET delivered_at = ? WHERE id = ?",
+            [(delivered_at_raw, message_id) for message_id in message_ids],
+        )
+        _commit(self._conn)
+
+    def record_failure(self, message_id: int, error: str, failed_at: datetime, give_up: bool) -> None:
+        self._conn.execute(
+            """
+            UPDATE outbox SET attempts = attempts + 1, last_error = ?, failed_at = ?
+            WHERE id = ? AND delivered_at IS NULL
+            """,
+            (error, _dt_to_db(failed_at) if give_up else None, message_id),
+        )
+        _commit(self._conn)
+
+
+class SQLiteDeadLetterRepository(_SQLiteRepository, DeadLetterRepository):
+    """Dead-letter table of failed deliveries, with their events JSON-encoded.
+
+    Inside a unit of work, writes commit with the caller's other writes.
+    """
+
+    _COLUMNS = "id, event_type, payload, handler, attempts, last_error, failed_at, next_attempt_at"
+
+    def add(
+        self, event: DomainEvent, handler: str, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        event_type, payload = encode_event(event)
+        self._conn.execute(
+            """
+            INSERT INTO dead_letters (event_type, payload, handler, attempts, last_error, failed_at, next_attempt_at)
+            VALUES (?, ?, ?, 1, ?, ?, ?)
+            """,
+            (
+                event_type,
+                payload,
+                handler,
+                error,
+                _dt_to_db(failed_at),
+                None if next_attempt_at is None else _dt_to_db(next_attempt_at),
+            ),
+        )
+        _commit(self._conn)
+
+    def get_many(self, delivery_ids: Sequence[int]) -> list[FailedDelivery]:
+        ids = sorted(set(delivery_ids))
+        deliveries: list[FailedDelivery] = []
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[start : start + _IN_CHUNK_SIZE]
+            cur = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM dead_letters WHERE id IN ({', '.join('?' * len(chunk))}) ORDER BY id",
+                chunk,
+            )
+            deliveries.extend(self._row_to_delivery(row) for row in cur.fetchall())
+        return deliveries
+
+    def list_all(self, limit: int, after_id: int = 0) -> list[FailedDelivery]:
+        cur = self._conn.execute(
+            f"SELECT {self._COLUMNS} FROM dead_letters WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        )
+        return [self._row_to_delivery(row) for row in cur.fetchall()]
+
+    def list_due(self, now: datetime, limit: int) -> list[FailedDelivery]:
+        cur = self._conn.execute(
+            f"""
+            SELECT {self._COLUMNS} FROM dead_letters
+            WHERE next_attempt_at IS NOT NULL AND next_attempt_at <= ?
+            ORDER BY next_attempt_at, id
+            LIMIT ?
+            """,
+            (_dt_to_db(now), limit),
+        )
+        return [self._row_to_delivery(row) for row in cur.fetchall()]
+
+    def record_failure(
+        self, delivery_id: int, error: str, failed_at: datetime, next_attempt_at: datetime | None
+    ) -> None:
+        self._conn.execute(
+            """
+            UPDATE dead_letters
+            SET attempts = attempts + 1, last_error = ?, failed_at = ?, next_attempt_at = ?
+            WHERE id = ?
+            """,
+            (
+                error,
+                _dt_to_db(failed_at),
+                None if next_attempt_at is None else _dt_to_db(next_attempt_at),
+                delivery_id,
+            ),
+        )
+        _commit(self._conn)
+
+    def remove(self, delivery_id: int) -> None:
+        self._conn.execute("DELETE FROM dead_letters WHERE id = ?", (delivery_id,))
+        _commit(self._conn)
+
+    @staticmethod
+    def _row_to_delivery(row: tuple) -> FailedDelivery:
+        delivery_id, event_type, payload, handler, attempts, last_error, failed_at, next_attempt_at = row
+        return FailedDelivery(
+            id=delivery_id,
+            event=decode_event(event_type, payload),
+            handler=handler,
+            attempts=attempts,
+            last_error=last_error,
+            failed_at=_dt_from_db(failed_at),
+            next_attempt_at=None if next_attempt_at is None else _dt_from_db(next_attempt_at),
+        )
+
+
+class SQLiteEventStore(_SQLiteRepository, EventStore):
+    """event_store table of events in the compact binary format (see pack_event).
+
+    Rows are only ever inserted. Inside a unit of work, appends commit with
+    the caller's other writes.
+    """
+
+    def append_many(self, events: Sequence[DomainEvent]) -> None:
+        self._conn.executemany(
+            "INSERT INTO event_store (partition, data) VALUES (?, ?)",
+            [(event_partition(event), pack_event(event)) for event in events],
+        )
+        _commit(self._conn)
+
+    def read(self, partition: int, after_position: int, limit: int) -> list[StoredEvent]:
+        cur = self._conn.execute(
+            "SELECT position, data FROM event_store WHERE partition = ? AND position > ? ORDER BY position LIMIT ?",
+            (partition, after_position, limit),
         )
-        self._conn.commit()
+        return [StoredEvent(position=position, event=unpack_event(data)) for position, data in cur.fetchall()]
@@ -1,47 +1,78 @@
 from __future__ import annotations
 
-import sqlite3
-from datetime import datetime, timedelta
+import base64
+import binascii
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from habit_tracker.application import (
     CompletionRepository,
+    DeadLetterRepository,
+    EventBus,
+    EventStore,
+    FailedDelivery,
     HabitRepository,
+    OutboxEventBus,
+    OutboxRelay,
+    OutboxRepository,
     ReminderRepository,
+    RetryingEventBus,
+    RetryPolicy,
+    StreakRepository,
+    TokenCache,
+    UnitOfWork,
     UserRepository,
 )
 from habit_tracker.application.reminder_handlers import ReminderEventHandler
 from habit_tracker.application.security import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    calibrate_bcrypt_rounds,
     create_access_token,
     decode_access_token,
+    set_bcrypt_rounds,
 )
 from habit_tracker.application.services import (
     AuthenticationService,
     EmailAlreadyRegisteredError,
     HabitTrackerService,
+    IncorrectPasswordError,
     UserRegistrationService,
 )
-from habit_tracker.domain.events import HabitCompleted, HabitCreated
+from habit_tracker.application.streak_projection import StreakProjection
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated, UserDeactivated, UserUpdated
 from habit_tracker.domain.schedule import Schedule
 from habit_tracker.domain.user import User
 from habit_tracker.infrastructure.clock import SystemClock
-from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.event_bus import AsyncEventBus, Backpressure, InMemoryEventBus
+from habit_tracker.infrastructure.event_bus_metrics import InMemoryEventBusMetrics
 from habit_tracker.infrastructure.inmemory_repositories import (
     InMemoryCompletionRepository,
+    InMemoryDeadLetterRepository,
     InMemoryHabitRepository,
     InMemoryReminderRepository,
     InMemoryUserRepository,
 )
 from habit_tracker.infrastructure.settings import Settings, get_settings
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
 from habit_tracker.infrastructure.sqlite_repositories import (
     SQLiteCompletionRepository,
+    SQLiteDeadLetterRepository,
+    SQLiteEventStore,
     SQLiteHabitRepository,
+    SQLiteOutboxRepository,
     SQLiteReminderRepository,
+    SQLiteStreakRepository,
+    SQLiteUnitOfWork,
     SQLiteUserRepository,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # OAuth2 scheme for authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -69,6 +100,15 @@ class CompletionRead(BaseModel):
     completed_at: datetime
 
 
+class CompletionCreate(BaseModel):
+    habit_id: UUID
+    completed_at: datetime | None = None  # defaults to now; naive times are taken as UTC
+
+
+class CompletionBatchCreate(BaseModel):
+    completions: list[CompletionCreate] = Field(min_length=1, max_length=1000)
+
+
 class StreakRead(BaseModel):
     habit_id: UUID
     count: int
@@ -94,6 +134,11 @@ class UserRead(BaseModel):
     is_active: bool
 
 
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
+
 class LoginRequest(BaseModel):
     email: str
     password: str
@@ -104,6 +149,26 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class FailedDeliveryRead(BaseModel):
+    id: int
+    handler: str
+    event_type: str
+    event: dict[str, object]
+    attempts: int
+    last_error: str
+    failed_at: datetime
+    next_attempt_at: datetime | None
+
+
+class DeadLetterReplay(BaseModel):
+    ids: list[int] | None = Field(default=None, max_length=1000)  # None: the oldest stored deliveries
+
+
+class DeadLetterReplayResult(BaseModel):
+    attempted: int
+    succeeded: int
+
+
 # --------------------------
 # Dependency injection
 # --------------------------
@@ -145,6 +210,17 @@ def get_user_repo(request: Request) -> UserRepository:
     return repo
 
 
+def get_token_cache(request: Request) -> TokenCache | None:
+    return getattr(request.app.state, "token_cache", None)
+
+
+def get_retrying_event_bus(request: Request) -> RetryingEventBus:
+    bus = getattr(request.app.state, "retrying_event_bus", None)
+    if bus is None:
+        raise HTTPException(status_code=404, detail="Event retries are not enabled")
+    return bus
+
+
 # --------------------------
 # Auxiliary functions
 # --------------------------
@@ -154,11 +230,44 @@ def _get_database_mode() -> str:
     return get_settings().database_mode
 
 
+def _encode_reminder_cursor(next_due_at: datetime, reminder_id: UUID) -> str:
+    raw = f"{next_due_at.isoformat()}|{reminder_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_reminder_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of _encode_reminder_cursor; raises ValueError for anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    next_due_at, sep, reminder_id = raw.partition("|")
+    if not sep:
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(next_due_at), UUID(reminder_id)
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    # SystemClock is timezone-aware; naive client times are assumed to be UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_repo: UserRepository = Depends(get_user_repo),
     settings: Settings = Depends(get_settings),
+    token_cache: TokenCache | None = Depends(get_token_cache),
 ) -> User:
+    # A token seen before costs one lookup instead of a signature check and a user load.
+    generation = None
+    if token_cache is not None:
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached.user
+        generation = token_cache.generation
+
     try:
         payload = decode_access_token(
             token, secret_key=settings.jwt_secret_key, algorithm=settings.jwt_algorithm
@@ -198,40 +307,122 @@ def get_current_user(
             detail="Inactive user",
         )
 
+    if token_cache is not None:
+        token_cache.put(token, payload, user, generation)
     return user
 
 
+def get_admin_user(
+    current_user: User = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+) -> User:
+    if current_user.email not in settings.admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
+
+def _password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _failed_delivery_read(delivery: FailedDelivery) -> FailedDeliveryRead:
+    return FailedDeliveryRead(
+        id=delivery.id,
+        handler=delivery.handler,
+        event_type=type(delivery.event).__name__,
+        event=asdict(delivery.event),
+        attempts=delivery.attempts,
+        last_error=delivery.last_error,
+        failed_at=delivery.failed_at,
+        next_attempt_at=delivery.next_attempt_at,
+    )
+
+
 # --------------------------
 # Repositories factory
 # --------------------------
 
 
-def _build_repositories() -> (
-    tuple[HabitRepository, CompletionRepository, ReminderRepository, UserRepository]
-):
+@dataclass(frozen=True)
+class _Repositories:
+    habit: HabitRepository
+    completion: CompletionRepository
+    reminder: ReminderRepository
+    user: UserRepository
+    # Materialized streak store, or None when streaks should be projected from
+    # events in memory instead.
+    streak: StreakRepository | None = None
+    # Groups the writes of one service call into one commit, when supported.
+    unit_of_work: UnitOfWork | None = None
+    # Durable store for published events, delivered by an OutboxRelay.
+    outbox: OutboxRepository | None = None
+    # Store for events whose handler raised, retried by a RetryingEventBus.
+    dead_letters: DeadLetterRepository | None = None
+    # Append-only log of every published event, replayed to rebuild projections.
+    event_store: EventStore | None = None
+
+
+def _build_repositories() -> _Repositories:
+    """Build the repositories for the configured database mode."""
     database_mode = _get_database_mode()
 
     if database_mode == "inmemory":
-        return (
-            InMemoryHabitRepository(),
-            InMemoryCompletionRepository(),
-            InMemoryReminderRepository(),
-            InMemoryUserRepository(),
+        return _Repositories(
+            habit=InMemoryHabitRepository(),
+            completion=InMemoryCompletionRepository(),
+            reminder=InMemoryReminderRepository(),
+            user=InMemoryUserRepository(),
+            dead_letters=InMemoryDeadLetterRepository() if get_settings().event_bus_retry else None,
         )
 
     if database_mode == "sqlite":
-        db_path = get_settings().database_path
-        conn = sqlite3.connect(db_path, check_same_thread=False)
-        return (
-            SQLiteHabitRepository(conn),
-            SQLiteCompletionRepository(conn),
-            SQLiteReminderRepository(conn),
-            SQLiteUserRepository(conn),
+        settings = get_settings()
+        conn = SQLiteConnectionPool(
+            settings.database_path,
+            busy_timeout_ms=settings.database_busy_timeout_ms,
+            mmap_size=settings.database_mmap_size,
+            cache_size=settings.database_cache_size,
+        )
+        return _Repositories(
+            habit=SQLiteHabitRepository(conn),
+            completion=SQLiteCompletionRepository(conn),
+            reminder=SQLiteReminderRepository(conn),
+            user=SQLiteUserRepository(conn),
+            streak=SQLiteStreakRepository(conn),
+            unit_of_work=SQLiteUnitOfWork(conn),
+            outbox=SQLiteOutboxRepository(conn) if settings.event_outbox else None,
+            dead_letters=SQLiteDeadLetterRepository(conn) if settings.event_bus_retry else None,
+            event_store=SQLiteEventStore(conn) if settings.event_store else None,
         )
 
     raise ValueError(f"Unknown database mode: {database_mode}")
 
 
+def _build_event_bus(metrics: InMemoryEventBusMetrics | None) -> InMemoryEventBus | AsyncEventBus:
+    """Build the event bus for the configured event bus mode."""
+    settings = get_settings()
+    if settings.event_bus_mode == "sync":
+        return InMemoryEventBus(metrics=metrics)
+    if settings.event_bus_mode == "async":
+        if settings.event_bus_backpressure not in ("block", "drop"):
+            raise ValueError(f"Unknown event bus backpressure: {settings.event_bus_backpressure}")
+        backpressure: Backpressure = "drop" if settings.event_bus_backpressure == "drop" else "block"
+        return AsyncEventBus(
+            workers=settings.event_bus_workers,
+            queue_size=settings.event_bus_queue_size,
+            backpressure=backpressure,
+            metrics=metrics,
+        )
+    raise ValueError(f"Unknown event bus mode: {settings.event_bus_mode}")
+
+
 # --------------------------
 # App factory
 # --------------------------
@@ -241,25 +432,94 @@ def create_app() -> FastAPI:
     """
     Create a FastAPI app wired with in-memory/sqlite (based on DATABASE_MODE env var) repositories and SystemClock.
     """
-    habit_repo, completion_repo, reminder_repo, user_repo = _build_repositories()
+    repositories = _build_repositories()
+    habit_repo = repositories.habit
+    completion_repo = repositories.completion
+    reminder_repo = repositories.reminder
+    user_repo = repositories.user
+    streak_repo = repositories.streak
     clock = SystemClock()
-    event_bus = InMemoryEventBus()
+    settings = get_settings()
+    event_bus_metrics = InMemoryEventBusMetrics() if settings.event_bus_metrics else None
+    base_event_bus = _build_event_bus(event_bus_metrics)
+
+    # Handlers that raise leave their events in the dead-letter store for a retry.
+    event_bus: EventBus = base_event_bus
+    retrying_event_bus: RetryingEventBus | None = None
+    if repositories.dead_letters is not None:
+        retrying_event_bus = RetryingEventBus(
+            delivery_bus=base_event_bus,
+            dead_letters=repositories.dead_letters,
+            clock=clock,
+            policy=RetryPolicy(
+                base_delay=timedelta(seconds=settings.event_bus_retry_base_delay),
+                factor=settings.event_bus_retry_factor,
+                max_delay=timedelta(seconds=settings.event_bus_retry_max_delay),
+                max_attempts=settings.event_bus_retry_max_attempts,
+            ),
+            unit_of_work=repositories.unit_of_work,
+        )
+        event_bus = retrying_event_bus
+
+    streak_projection: StreakRepository
+    if streak_repo is None:
+        # No materialized streaks: keep them up to date from habit events instead.
+        in_memory_projection = StreakProjection(
+            habit_repo=habit_repo,
+            completion_repo=completion_repo,
+        )
+        event_bus.subscribe(HabitCreated, in_memory_projection.on_habit_created)
+        event_bus.subscribe(HabitCompleted, in_memory_projection.on_habit_completed)
+        streak_projection = in_memory_projection
+    else:
+        streak_projection = streak_repo
+
+    # With an outbox the service only stores events; the relay hands them to event_bus.
+    service_event_bus: EventBus = event_bus
+    outbox_relay: OutboxRelay | None = None
+    outbox_poll_interval = settings.event_outbox_poll_interval
+    if repositories.outbox is not None:
+        if isinstance(base_event_bus, AsyncEventBus):
+            raise ValueError("The event outbox needs the sync event bus")
+        service_event_bus = OutboxEventBus(outbox=repositories.outbox, delivery_bus=event_bus)
+        outbox_relay = OutboxRelay(
+            outbox=repositories.outbox,
+            event_bus=event_bus,
+            clock=clock,
+            unit_of_work=repositories.unit_of_work,
+            max_attempts=settings.event_outbox_max_attempts,
+        )
 
     service = HabitTrackerService(
         habit_repo=habit_repo,
         completion_repo=completion_repo,
         reminder_repo=reminder_repo,
         clock=clock,
-        event_bus=event_bus,
+        event_bus=service_event_bus,
+        streak_projection=streak_projection,
+        unit_of_work=repositories.unit_of_work,
+        publish_after_commit=isinstance(base_event_bus, AsyncEventBus),
+    )
+
+    # bcrypt runs on its own bounded pool, so logins cannot starve the other endpoints.
+    password_hasher = PasswordHasher(
+        max_workers=settings.password_hasher_workers,
+        max_pending=settings.password_hasher_max_pending,
     )
 
     user_registration_service = UserRegistrationService(
         user_repo=user_repo,
         clock=clock,
+        # Published straight to event_bus, so cached logins are dropped as soon as possible.
+        event_bus=event_bus,
+        password_hasher=password_hasher,
     )
 
     user_authentication_service = AuthenticationService(
         user_repo=user_repo,
+        password_hasher=password_hasher,
+        # Rehashed passwords go through it too, so cached logins see the new hash.
+        user_registration=user_registration_service,
     )
 
     reminder_handler = ReminderEventHandler(
@@ -268,15 +528,70 @@ def create_app() -> FastAPI:
         clock=clock,
     )
     event_bus.subscribe(HabitCreated, reminder_handler.on_habit_created)
-    event_bus.subscribe(HabitCompleted, reminder_handler.on_habit_completed)
-
-    app = FastAPI(title="Habit Tracker API", version="0.1.0")
+    event_bus.subscribe_batch(HabitCompleted, reminder_handler.on_habits_completed)
+    if repositories.event_store is not None:
+        event_bus.subscribe_batch(DomainEvent, repositories.event_store.append_many)
+
+    token_cache: TokenCache | None = None
+    if settings.auth_token_cache:
+        token_cache = TokenCache(
+            clock=clock, max_size=settings.auth_token_cache_size, ttl=settings.auth_token_cache_ttl
+        )
+        event_bus.subscribe(UserUpdated, token_cache.on_user_changed)
+        event_bus.subscribe(UserDeactivated, token_cache.on_user_changed)
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        # Pick the bcrypt cost for this hardware; hashes below the floor are redone on the next login.
+        if settings.password_hash_target_seconds > 0:
+            set_bcrypt_rounds(
+                calibrate_bcrypt_rounds(
+                    settings.password_hash_target_seconds,
+                    min_rounds=settings.password_hash_min_rounds,
+                    max_rounds=settings.password_hash_max_rounds,
+                ),
+                min_rounds=settings.password_hash_min_rounds,
+                max_rounds=settings.password_hash_max_rounds,
+            )
+        stop_workers = threading.Event()
+        workers: list[threading.Thread] = []
+        if outbox_relay is not None:
+            workers.append(
+                threading.Thread(
+                    target=outbox_relay.run, args=(stop_workers, outbox_poll_interval), name="outbox-relay", daemon=True
+                )
+            )
+        if retrying_event_bus is not None:
+            workers.append(
+                threading.Thread(
+                    target=retrying_event_bus.run,
+                    args=(stop_workers, settings.event_bus_retry_poll_interval),
+                    name="event-retry",
+                    daemon=True,
+                )
+            )
+        for worker in workers:
+            worker.start()
+        yield
+        stop_workers.set()
+        for worker in workers:
+            worker.join()
+        # Let queued events finish before the process goes away.
+        if isinstance(base_event_bus, AsyncEventBus):
+            base_event_bus.close()
+        password_hasher.close()
+
+    app = FastAPI(title="Habit Tracker API", version="0.1.0", lifespan=lifespan)
 
     # Attach the service to app state so dependencies can access it
     app.state.service = service
     app.state.user_registration_service = user_registration_service
     app.state.user_authentication_service = user_authentication_service
     app.state.user_repo = user_repo
+    app.state.event_bus = event_bus
+    app.state.event_bus_metrics = event_bus_metrics
+    app.state.retrying_event_bus = retrying_event_bus
+    app.state.token_cache = token_cache
 
     # ---------- Routes ----------
 
@@ -332,6 +647,29 @@ def create_app() -> FastAPI:
             completed_at=completion.completed_at,
         )
 
+    @app.post("/completions:batch", response_model=list[CompletionRead])
+    def complete_habits_batch(
+        payload: CompletionBatchCreate,
+        service: HabitTrackerService = Depends(get_service),
+        current_user: User = Depends(get_current_user),
+    ) -> list[CompletionRead]:
+        items = [(item.habit_id, _as_utc(item.completed_at)) for item in payload.completions]
+        try:
+            completions = service.complete_habits_bulk(items, user_id=current_user.id)
+        except (KeyError, PermissionError):
+            # Same 404 for foreign habits to avoid leaking habit existence
+            raise HTTPException(status_code=404, detail="Habit not found") from None
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from None
+        return [
+            CompletionRead(
+                id=c.id,
+                habit_id=c.habit_id,
+                completed_at=c.completed_at,
+            )
+            for c in completions
+        ]
+
     @app.get("/habits/{habit_id}/streak", response_model=StreakRead)
     def get_streak(
         habit_id: UUID,
@@ -371,20 +709,38 @@ def create_app() -> FastAPI:
 
     @app.get("/reminders/due", response_model=list[ReminderRead])
     def list_due_reminders(
+        response: Response,
         before: datetime | None = Query(
             default=None,
             description="Return reminders with next_due_at <= this time (defaults to now).",
         ),
+        limit: int = Query(default=100, ge=1, le=1000, description="Maximum reminders per page."),
+        cursor: str | None = Query(
+            default=None,
+            description="Opaque cursor from the X-Next-Cursor header of the previous page.",
+        ),
         service: HabitTrackerService = Depends(get_service),
     ) -> list[ReminderRead]:
         if before is None:
             before = datetime.utcnow()
 
-        reminders = service.list_due_reminders(before)
+        after = None
+        if cursor is not None:
+            try:
+                after = _decode_reminder_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+        reminders = service.list_due_reminders(before, limit=limit, after=after)
 
         if not reminders:
             return []
 
+        if len(reminders) == limit:
+            # A full page: there may be more, continue after its last reminder.
+            last = reminders[-1]
+            response.headers["X-Next-Cursor"] = _encode_reminder_cursor(last.next_due_at, last.id)
+
         return [
             ReminderRead(
                 id=r.id,
@@ -400,17 +756,19 @@ def create_app() -> FastAPI:
         response_model=UserRead,
         status_code=status.HTTP_201_CREATED,
     )
-    def register_user(
+    async def register_user(
         payload: UserRegister,
         service: UserRegistrationService = Depends(get_user_registration_service),
     ) -> UserRead:
         try:
-            user = service.register_user(email=payload.email, password=payload.password)
+            user = await service.register_user_async(email=payload.email, password=payload.password)
         except EmailAlreadyRegisteredError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             ) from None
+        except PasswordHasherBusyError:
+            raise _password_hasher_busy() from None
 
         return UserRead(
             id=user.id,
@@ -437,12 +795,15 @@ def create_app() -> FastAPI:
     @app.post(
         "/auth/login", response_model=TokenResponse, status_code=status.HTTP_200_OK
     )
-    def login(
+    async def login(
         payload: LoginRequest,
         auth_service: AuthenticationService = Depends(get_user_authentication_service),
         settings: Settings = Depends(get_settings),
     ) -> TokenResponse:
-        user = auth_service.authenticate(email=payload.email, password=payload.password)
+        try:
+            user = await auth_service.authenticate_async(email=payload.email, password=payload.password)
+        except PasswordHasherBusyError:
+            raise _password_hasher_busy() from None
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -468,6 +829,57 @@ def create_app() -> FastAPI:
             "email": current_user.email,
         }
 
+    @app.put("/me/password", status_code=status.HTTP_204_NO_CONTENT)
+    async def change_password(
+        payload: PasswordChange,
+        service: UserRegistrationService = Depends(get_user_registration_service),
+        current_user: User = Depends(get_current_user),
+    ) -> None:
+        try:
+            await service.change_password_async(current_user.id, payload.current_password, payload.new_password)
+        except IncorrectPasswordError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Current password is incorrect",
+            ) from None
+        except PasswordHasherBusyError:
+            raise _password_hasher_busy() from None
+
+    @app.post("/admin/users/{user_id}:deactivate", response_model=UserRead)
+    def deactivate_user(
+        user_id: UUID,
+        service: UserRegistrationService = Depends(get_user_registration_service),
+        _admin: User = Depends(get_admin_user),
+    ) -> UserRead:
+        try:
+            user = service.deactivate_user(user_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="User not found") from None
+        return UserRead(
+            id=user.id,
+            email=user.email,
+            created_at=user.created_at,
+            is_active=user.is_active,
+        )
+
+    @app.get("/admin/dead-letters", response_model=list[FailedDeliveryRead])
+    def list_dead_letters(
+        limit: int = Query(default=100, ge=1, le=1000),
+        after_id: int = Query(default=0, ge=0),
+        bus: RetryingEventBus = Depends(get_retrying_event_bus),
+        _admin: User = Depends(get_admin_user),
+    ) -> list[FailedDeliveryRead]:
+        return [_failed_delivery_read(d) for d in bus.dead_letters.list_all(limit, after_id=after_id)]
+
+    @app.post("/admin/dead-letters:replay", response_model=DeadLetterReplayResult)
+    def replay_dead_letters(
+        payload: DeadLetterReplay,
+        bus: RetryingEventBus = Depends(get_retrying_event_bus),
+        _admin: User = Depends(get_admin_user),
+    ) -> DeadLetterReplayResult:
+        result = bus.replay(payload.ids)
+        return DeadLetterReplayResult(attempted=result.attempted, succeeded=result.succeeded)
+
     return app
 
 
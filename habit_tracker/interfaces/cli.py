@@ -0,0 +1,310 @@
+"""Maintenance commands for the SQLite database.
+
+Usage:
+    python -m habit_tracker.interfaces.cli rebuild-streaks
+    python -m habit_tracker.interfaces.cli dispatch-reminders [--drain]
+    python -m habit_tracker.interfaces.cli relay-outbox [--drain]
+    python -m habit_tracker.interfaces.cli rebuild-projections [--projection reminders] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import repeat
+
+from habit_tracker.application.event_bus import EventBus
+from habit_tracker.application.outbox import OutboxRelay
+from habit_tracker.application.projections import PARTITIONS, ProjectionReplayer, ReplayClock
+from habit_tracker.application.reminder_dispatcher import ReminderDispatcher
+from habit_tracker.application.reminder_handlers import ReminderEventHandler
+from habit_tracker.domain.clock import Clock
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.infrastructure.clock import SystemClock
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus, SafeInMemoryEventBus
+from habit_tracker.infrastructure.event_bus_metrics import InMemoryEventBusMetrics
+from habit_tracker.infrastructure.notifiers import LoggingReminderNotifier
+from habit_tracker.infrastructure.settings import get_settings
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteConnection,
+    SQLiteEventStore,
+    SQLiteHabitRepository,
+    SQLiteOutboxRepository,
+    SQLiteReminderRepository,
+    SQLiteStreakRepository,
+    SQLiteUnitOfWork,
+)
+
+
+def _rebuild_streaks(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    count = SQLiteStreakRepository(conn).rebuild()
+    print(f"Rebuilt streaks for {count} habits")
+    return 0
+
+
+def _dispatch_reminders(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    dispatcher = ReminderDispatcher(
+        reminder_repo=SQLiteReminderRepository(conn),
+        habit_repo=SQLiteHabitRepository(conn),
+        notifier=LoggingReminderNotifier(),
+        clock=SystemClock(),
+        batch_size=args.batch_size,
+        lease=timedelta(seconds=args.lease_seconds),
+    )
+
+    if not args.drain:
+        try:
+            dispatcher.run(threading.Event(), poll_interval=args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    started = time.perf_counter()
+    total = 0
+    while (delivered := dispatcher.dispatch_once()) > 0:
+        total += delivered
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Dispatched {total} reminders in {elapsed:.2f}s ({rate:.0f} reminders/s)")
+    return 0
+
+
+def _relay_outbox(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    clock = SystemClock()
+    event_bus = InMemoryEventBus()
+    reminder_handler = ReminderEventHandler(
+        habit_repo=SQLiteHabitRepository(conn),
+        reminder_repo=SQLiteReminderRepository(conn),
+        clock=clock,
+    )
+    event_bus.subscribe(HabitCreated, reminder_handler.on_habit_created)
+    event_bus.subscribe_batch(HabitCompleted, reminder_handler.on_habits_completed)
+    if get_settings().event_store:
+        event_bus.subscribe_batch(DomainEvent, SQLiteEventStore(conn).append_many)
+    outbox = SQLiteOutboxRepository(conn)
+    relay = OutboxRelay(
+        outbox=outbox,
+        event_bus=event_bus,
+        clock=clock,
+        unit_of_work=SQLiteUnitOfWork(conn),
+        batch_size=args.batch_size,
+        max_attempts=get_settings().event_outbox_max_attempts,
+    )
+
+    if not args.drain:
+        try:
+            relay.run(threading.Event(), poll_interval=args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    started = time.perf_counter()
+    total = 0
+    while True:
+        delivered = relay.relay_once()
+        total += delivered
+        # A failing event stops its batch early; retries end once it is set aside.
+        if delivered == 0 and not outbox.list_pending(1):
+            break
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Relayed {total} events in {elapsed:.2f}s ({rate:.0f} events/s)")
+    return 0
+
+
+@dataclass(frozen=True)
+class _Projection:
+    """How rebuild-projections empties a projection and which handlers fill it again."""
+
+    reset: Callable[[SQLiteConnection], None]
+    subscribe: Callable[[EventBus, SQLiteConnection, Clock], None]
+
+
+def _subscribe_reminders(event_bus: EventBus, conn: SQLiteConnection, clock: Clock) -> None:
+    handler = ReminderEventHandler(
+        habit_repo=SQLiteHabitRepository(conn),
+        reminder_repo=SQLiteReminderRepository(conn),
+        clock=clock,
+    )
+    event_bus.subscribe(HabitCreated, handler.on_habit_created)
+    event_bus.subscribe(HabitCompleted, handler.on_habit_completed)
+
+
+def _subscribe_streaks(event_bus: EventBus, conn: SQLiteConnection, clock: Clock) -> None:
+    streaks = SQLiteStreakRepository(conn)
+
+    def on_habit_completed(event: HabitCompleted) -> None:
+        streaks.record_completions(event.habit_id, [event.completed_at])
+
+    event_bus.subscribe(HabitCompleted, on_habit_completed)
+
+
+# Projections rebuild-projections can replay the event store into, by name.
+PROJECTIONS: dict[str, _Projection] = {
+    "reminders": _Projection(reset=lambda conn: SQLiteReminderRepository(conn).clear(), subscribe=_subscribe_reminders),
+    "streaks": _Projection(reset=lambda conn: SQLiteStreakRepository(conn).clear(), subscribe=_subscribe_streaks),
+}
+
+
+def _replay_partitions(
+    database_path: str, projections: Sequence[str], partitions: Sequence[int], chunk_size: int
+) -> tuple[int, int]:
+    """Replay event store partitions into projections; return the events replayed and the handler calls that failed.
+
+    Runs in a worker process, on its own connections.
+    """
+    settings = get_settings()
+    pool = SQLiteConnectionPool(
+        database_path,
+        busy_timeout_ms=settings.database_busy_timeout_ms,
+        mmap_size=settings.database_mmap_size,
+        cache_size=settings.database_cache_size,
+    )
+    metrics = InMemoryEventBusMetrics()
+    event_bus = SafeInMemoryEventBus(metrics=metrics)
+    clock = ReplayClock()
+    for name in projections:
+        PROJECTIONS[name].subscribe(event_bus, pool, clock)
+    replayer = ProjectionReplayer(
+        event_store=SQLiteEventStore(pool),
+        event_bus=event_bus,
+        clock=clock,
+        unit_of_work=SQLiteUnitOfWork(pool),
+        chunk_size=chunk_size,
+    )
+    try:
+        replayed = sum(replayer.replay_partition(partition) for partition in partitions)
+    finally:
+        pool.close()
+    return replayed, sum(stats.errors for stats in metrics.stats().values())
+
+
+def _rebuild_projections(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    projections = args.projection or list(PROJECTIONS)
+    with SQLiteUnitOfWork(conn).transaction():
+        for name in projections:
+            PROJECTIONS[name].reset(conn)
+
+    # Several partitions per worker, interleaved, so one busy partition does not hold up the rest.
+    tasks = min(PARTITIONS, args.workers * 4)
+    groups = [list(range(first, PARTITIONS, tasks)) for first in range(tasks)]
+    started = time.perf_counter()
+    if args.workers == 1:
+        results = [_replay_partitions(args.database_path, projections, range(PARTITIONS), args.chunk_size)]
+    else:
+        # "spawn": a forked worker would inherit this process's open SQLite connection.
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(
+                executor.map(
+                    _replay_partitions, repeat(args.database_path), repeat(projections), groups, repeat(args.chunk_size)
+                )
+            )
+    elapsed = time.perf_counter() - started
+    total = sum(replayed for replayed, _errors in results)
+    errors = sum(errors for _replayed, errors in results)
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Rebuilt {', '.join(projections)} from {total} events in {elapsed:.2f}s ({rate:.0f} events/s)")
+    if errors:
+        print(f"{errors} handler calls failed; see the log")
+        return 1
+    return 0
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="habit-tracker")
+    parser.add_argument(
+        "--database-path",
+        default=None,
+        help="SQLite database file (defaults to HABIT_TRACKER_DATABASE_PATH).",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log at INFO level.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-streaks",
+        help="Recompute the materialized habit_streaks table from completions.",
+    )
+    rebuild.set_defaults(handler=_rebuild_streaks)
+
+    dispatch = commands.add_parser(
+        "dispatch-reminders",
+        help="Deliver due reminders; several workers can run against one database.",
+    )
+    dispatch.add_argument("--batch-size", type=int, default=100, help="Reminders claimed per transaction.")
+    dispatch.add_argument("--lease-seconds", type=float, default=60.0, help="How long a claim blocks other workers.")
+    dispatch.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when nothing is due.")
+    dispatch.add_argument(
+        "--drain",
+        action="store_true",
+        help="Exit once nothing is due and report reminders dispatched per second.",
+    )
+    dispatch.set_defaults(handler=_dispatch_reminders)
+
+    relay = commands.add_parser(
+        "relay-outbox",
+        help="Deliver events stored in the outbox to the event handlers.",
+    )
+    relay.add_argument("--batch-size", type=int, default=100, help="Events delivered per transaction.")
+    relay.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the outbox is empty.")
+    relay.add_argument(
+        "--drain",
+        action="store_true",
+        help="Exit once the outbox is empty and report events relayed per second.",
+    )
+    relay.set_defaults(handler=_relay_outbox)
+
+    projections = commands.add_parser(
+        "rebuild-projections",
+        help="Empty projections and rebuild them by replaying the event store.",
+    )
+    projections.add_argument(
+        "--projection",
+        action="append",
+        choices=sorted(PROJECTIONS),
+        help="Projection to rebuild; repeat for several (default: all).",
+    )
+    projections.add_argument(
+        "--workers", type=_positive_int, default=os.cpu_count() or 1, help="Processes replaying partitions in parallel."
+    )
+    projections.add_argument("--chunk-size", type=_positive_int, default=1000, help="Events replayed per transaction.")
+    projections.set_defaults(handler=_rebuild_projections)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    settings = get_settings()
+    args.database_path = args.database_path or settings.database_path
+    pool = SQLiteConnectionPool(
+        args.database_path,
+        busy_timeout_ms=settings.database_busy_timeout_ms,
+        mmap_size=settings.database_mmap_size,
+        cache_size=settings.database_cache_size,
+    )
+    try:
+        return args.handler(pool.connection(), args)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
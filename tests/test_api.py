@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from fastapi.testclient import TestClient
@@ -122,3 +123,63 @@ def test_register_user_duplicate_email_fails() -> None:
     resp2 = client.post("/auth/register", json=payload)
     assert resp2.status_code == 400
     assert resp2.json()["detail"] == "Email already registered"
+
+
+def test_batch_completions_via_api() -> None:
+    client = _make_client()
+    token = _get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    habit_id = client.post(
+        "/habits", json={"name": "Exercise", "schedule": "daily"}, headers=headers
+    ).json()["id"]
+    now = datetime.now(tz=UTC)
+
+    resp = client.post(
+        "/completions:batch",
+        json={
+            "completions": [
+                {"habit_id": habit_id, "completed_at": (now - timedelta(days=1)).isoformat()},
+                {"habit_id": habit_id, "completed_at": (now - timedelta(days=2)).isoformat()},
+                {"habit_id": habit_id},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert [c["habit_id"] for c in resp.json()] == [habit_id] * 3
+
+    resp_streak = client.get(f"/habits/{habit_id}/streak", headers=headers)
+    assert resp_streak.json()["count"] == 3
+
+
+def test_batch_completions_reject_foreign_habits_and_future_times() -> None:
+    client = _make_client()
+    token = _get_auth_token(client)
+    other_token = _get_auth_token(client, email="other@example.com")
+
+    habit_id = client.post(
+        "/habits",
+        json={"name": "Exercise", "schedule": "daily"},
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()["id"]
+
+    resp = client.post(
+        "/completions:batch",
+        json={"completions": [{"habit_id": habit_id}]},
+        headers={"Authorization": f"Bearer {other_token}"},
+    )
+    assert resp.status_code == 404
+
+    future = (datetime.now(tz=UTC) + timedelta(days=1)).isoformat()
+    resp = client.post(
+        "/completions:batch",
+        json={"completions": [{"habit_id": habit_id, "completed_at": future}]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 422
+
+    resp_streak = client.get(
+        f"/habits/{habit_id}/streak", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp_streak.json()["count"] == 0
@@ -72,3 +72,40 @@ def test_list_due_reminders() -> None:
     reminders = resp.json()
     # At least these 2 reminders should be considered "due" by that far future
     assert len(reminders) >= 2
+
+
+def test_list_due_reminders_in_pages() -> None:
+    client = _make_client()
+    token = _get_auth_token(client)
+
+    for i in range(5):
+        resp = client.post(
+            "/habits",
+            json={"name": f"Habit {i}", "schedule": "daily"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert resp.status_code == 201
+
+    everything = client.get("/reminders/due", params={"before": "2100-01-01T00:00:00"}).json()
+
+    seen: list[str] = []
+    params = {"before": "2100-01-01T00:00:00", "limit": "2"}
+    while True:
+        resp = client.get("/reminders/due", params=params)
+        assert resp.status_code == 200
+        seen.extend(r["id"] for r in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert seen == [r["id"] for r in everything]
+    assert len(seen) >= 5
+
+
+def test_list_due_reminders_rejects_bad_cursor() -> None:
+    client = _make_client()
+
+    resp = client.get("/reminders/due", params={"cursor": "not-a-cursor"})
+
+    assert resp.status_code == 400
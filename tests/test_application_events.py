@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
+import pytest
 from habit_tracker.application.services import HabitTrackerService
 from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.domain.habit import Habit
 from habit_tracker.domain.schedule import Schedule
 from habit_tracker.infrastructure import (
     InMemoryCompletionRepository,
@@ -75,3 +77,81 @@ def test_complete_habit_publishes_habit_completed_event() -> None:
     event = received[0]
     assert isinstance(event, HabitCompleted)
     assert event.habit_id == habit.id
+
+
+def test_bulk_completion_publishes_events_oldest_first() -> None:
+    start_time = datetime(2025, 1, 5, 9, 0, 0)
+    service, bus = _make_service_with_bus(start_time)
+
+    received: list[HabitCompleted] = []
+    bus.subscribe(HabitCompleted, received.append)
+
+    read = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+    run = service.create_habit(name="Run", schedule=Schedule("daily"), user_id=UUID(int=1))
+
+    lookups: list[UUID] = []
+    get_habit = service.habit_repo.get
+
+    def counting_get(habit_id: UUID) -> Habit:
+        lookups.append(habit_id)
+        return get_habit(habit_id)
+
+    service.habit_repo.get = counting_get  # type: ignore[method-assign]
+
+    completions = service.complete_habits_bulk(
+        [
+            (read.id, start_time - timedelta(days=1)),
+            (run.id, None),
+            (read.id, start_time - timedelta(days=3)),
+            (read.id, start_time - timedelta(days=2)),
+        ],
+        user_id=UUID(int=1),
+    )
+
+    # One lookup per distinct habit, however many completions it has.
+    assert sorted(lookups) == sorted([read.id, run.id])
+    # Completions come back in the order of the items, events are published oldest first.
+    assert [(c.habit_id, c.completed_at) for c in completions] == [
+        (read.id, start_time - timedelta(days=1)),
+        (run.id, start_time),
+        (read.id, start_time - timedelta(days=3)),
+        (read.id, start_time - timedelta(days=2)),
+    ]
+    assert [(e.habit_id, e.completed_at) for e in received] == sorted(
+        ((c.habit_id, c.completed_at) for c in completions), key=lambda pair: pair[1]
+    )
+    assert len(service.completion_repo.list_for_habit(read.id)) == 3
+
+
+def test_bulk_completion_reaches_batch_handlers_in_one_call() -> None:
+    start_time = datetime(2025, 1, 5, 9, 0, 0)
+    service, bus = _make_service_with_bus(start_time)
+
+    batches: list[list[HabitCompleted]] = []
+    bus.subscribe_batch(HabitCompleted, lambda events: batches.append(list(events)))
+
+    read = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+    service.complete_habit(read.id, user_id=UUID(int=1))
+    service.complete_habits_bulk(
+        [(read.id, start_time - timedelta(days=d)) for d in (1, 2, 3)],
+        user_id=UUID(int=1),
+    )
+
+    assert [len(batch) for batch in batches] == [1, 3]
+
+
+def test_bulk_completion_stores_nothing_if_a_habit_is_not_owned() -> None:
+    start_time = datetime(2025, 1, 5, 9, 0, 0)
+    service, bus = _make_service_with_bus(start_time)
+
+    received: list[HabitCompleted] = []
+    bus.subscribe(HabitCompleted, received.append)
+
+    mine = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+    theirs = service.create_habit(name="Run", schedule=Schedule("daily"), user_id=UUID(int=2))
+
+    with pytest.raises(PermissionError):
+        service.complete_habits_bulk([(mine.id, None), (theirs.id, None)], user_id=UUID(int=1))
+
+    assert service.completion_repo.list_for_habit(mine.id) == []
+    assert received == []
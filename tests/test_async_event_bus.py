@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from habit_tracker.application.reminder_handlers import ReminderEventHandler
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_bus import AsyncEventBus, Backpressure, EventQueueFullError
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteReminderRepository,
+    SQLiteUnitOfWork,
+    SQLiteUserRepository,
+)
+
+from tests.utils import FakeClock
+
+NOW = datetime(2025, 1, 1, 9, 0, 0)
+
+
+def _completed(habit_id: UUID, minute: int = 0) -> HabitCompleted:
+    return HabitCompleted(occurred_at=NOW, habit_id=habit_id, completed_at=NOW.replace(minute=minute))
+
+
+def test_events_of_one_habit_are_handled_in_publish_order() -> None:
+    bus = AsyncEventBus(workers=4)
+    rng = random.Random(3)
+    seen: dict[UUID, list[int]] = {}
+
+    def handler(event: HabitCompleted) -> None:
+        time.sleep(rng.random() / 10_000)
+        seen.setdefault(event.habit_id, []).append(event.completed_at.minute)
+
+    bus.subscribe(HabitCompleted, handler)
+    habit_ids = [uuid4() for _ in range(10)]
+    for minute in range(50):
+        for habit_id in habit_ids:
+            bus.publish(_completed(habit_id, minute))
+    bus.drain()
+    bus.close()
+
+    assert seen == {habit_id: list(range(50)) for habit_id in habit_ids}
+
+
+def test_publish_returns_before_handlers_run() -> None:
+    bus = AsyncEventBus(workers=1)
+    release = threading.Event()
+    handled: list[DomainEvent] = []
+
+    def handler(event: HabitCompleted) -> None:
+        release.wait(timeout=5)
+        handled.append(event)
+
+    bus.subscribe(HabitCompleted, handler)
+
+    event = _completed(uuid4())
+    bus.publish(event)
+    assert handled == []
+
+    release.set()
+    bus.drain()
+    assert handled == [event]
+    bus.close()
+
+
+def test_failing_handler_does_not_stop_the_worker(caplog: pytest.LogCaptureFixture) -> None:
+    bus = AsyncEventBus(workers=1)
+    handled: list[DomainEvent] = []
+
+    def failing(event: HabitCompleted) -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(HabitCompleted, failing)
+    bus.subscribe(HabitCompleted, handled.append)
+    events = [_completed(uuid4()), _completed(uuid4())]
+    for event in events:
+        bus.publish(event)
+    bus.close()
+
+    assert handled == events
+    assert "boom" in caplog.text
+
+
+def _blocked_bus(
+    backpressure: Backpressure, block_timeout: float | None = None
+) -> tuple[AsyncEventBus, threading.Event]:
+    """A one-worker bus with a queue of one whose worker is stuck in a handler."""
+    bus = AsyncEventBus(workers=1, queue_size=1, backpressure=backpressure, block_timeout=block_timeout)
+    started, release = threading.Event(), threading.Event()
+
+    def stuck(event: HabitCompleted) -> None:
+        started.set()
+        release.wait(timeout=5)
+
+    bus.subscribe(HabitCompleted, stuck)
+    bus.publish(_completed(uuid4()))
+    assert started.wait(timeout=5)
+    bus.publish(_completed(uuid4()))  # fills the queue
+    return bus, release
+
+
+def test_drop_policy_discards_events_when_full() -> None:
+    bus, release = _blocked_bus("drop")
+    bus.publish(_completed(uuid4()))
+    assert bus.dropped == 1
+
+    release.set()
+    bus.close()
+
+
+def test_block_policy_raises_after_timeout() -> None:
+    bus, release = _blocked_bus("block", block_timeout=0.05)
+    with pytest.raises(EventQueueFullError):
+        bus.publish(_completed(uuid4()))
+
+    release.set()
+    bus.close()
+    with pytest.raises(RuntimeError):
+        bus.publish(_completed(uuid4()))
+
+
+def test_handlers_see_committed_writes(tmp_path: Path) -> None:
+    pool = SQLiteConnectionPool(str(tmp_path / "habits.db"))
+    clock = FakeClock(NOW)
+    habit_repo = SQLiteHabitRepository(pool)
+    reminder_repo = SQLiteReminderRepository(pool)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+
+    bus = AsyncEventBus(workers=2)
+    handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+    bus.subscribe(HabitCreated, handler.on_habit_created)
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=SQLiteCompletionRepository(pool),
+        clock=clock,
+        event_bus=bus,
+        unit_of_work=SQLiteUnitOfWork(pool),
+        publish_after_commit=True,
+    )
+
+    habits = [service.create_habit(name=f"Habit {i}", schedule=Schedule("daily"), user_id=user.id) for i in range(20)]
+    bus.close()
+
+    assert all(reminder_repo.get_by_habit_id(habit.id) is not None for habit in habits)
+    pool.close()
+
+
+def test_publish_many_sends_one_batch_per_worker() -> None:
+    bus = AsyncEventBus(workers=2)
+    batches: list[list[HabitCompleted]] = []
+    bus.subscribe_batch(HabitCompleted, lambda events: batches.append(list(events)))
+
+    habit_id = uuid4()
+    events = [_completed(habit_id, minute) for minute in range(10)]
+    bus.publish_many(events)
+    bus.close()
+
+    assert batches == [events]
+
+
+def test_events_published_while_closing_are_handled_or_rejected() -> None:
+    bus = AsyncEventBus(workers=2, queue_size=10)
+    handled: list[DomainEvent] = []
+    accepted: list[DomainEvent] = []
+    bus.subscribe(HabitCompleted, handled.append)
+
+    def publish_until_closed() -> None:
+        while True:
+            event = _completed(uuid4())
+            try:
+                bus.publish(event)
+            except RuntimeError:
+                return
+            accepted.append(event)
+
+    publishers = [threading.Thread(target=publish_until_closed) for _ in range(4)]
+    for publisher in publishers:
+        publisher.start()
+    time.sleep(0.05)
+    bus.close()
+    for publisher in publishers:
+        publisher.join()
+
+    assert accepted
+    assert sorted(map(id, handled)) == sorted(map(id, accepted))
+    bus.drain()
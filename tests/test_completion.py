@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from uuid import UUID
 
+import pytest
+from habit_tracker.domain.completion import Completion
 from habit_tracker.domain.events import HabitCompleted
 
 from .utils import FakeClock, make_habit_and_completion, test_schedule
@@ -60,3 +62,20 @@ def test_multiple_completions_have_different_ids_and_times() -> None:
     assert completion1.id != completion2.id
     assert completion1.completed_at == first_time
     assert completion2.completed_at == second_time
+
+
+def test_record_completion_at_an_earlier_time() -> None:
+    now = datetime(2025, 1, 3, 8, 0, 0)
+    clock = FakeClock(now)
+    habit, _, _ = make_habit_and_completion(
+        clock=clock, completion_time=now, name="Read", schedule=test_schedule
+    )
+
+    earlier = now - timedelta(days=2)
+    completion, event = Completion.record(habit=habit, clock=clock, completed_at=earlier)
+
+    assert completion.completed_at == earlier
+    assert event.completed_at == earlier
+
+    with pytest.raises(ValueError):
+        Completion.record(habit=habit, clock=clock, completed_at=now + timedelta(minutes=1))
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from habit_tracker.application.dead_letters import RetryingEventBus, RetryPolicy
+from habit_tracker.application.repositories import DeadLetterRepository
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.inmemory_repositories import InMemoryDeadLetterRepository
+from habit_tracker.infrastructure.settings import get_settings
+from habit_tracker.infrastructure.sqlite_repositories import SQLiteDeadLetterRepository, SQLiteUnitOfWork
+from habit_tracker.interfaces.api.app import create_app
+
+from tests.utils import FakeClock
+
+NOW = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+
+
+class FlakyHandler:
+    """Raises for the first `failures` calls, then records the events it gets."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.received: list[DomainEvent] = []
+
+    def on_event(self, event: DomainEvent) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("reminder store unavailable")
+        self.received.append(event)
+
+
+def _created() -> HabitCreated:
+    return HabitCreated(occurred_at=NOW, habit_id=uuid4(), name="Read")
+
+
+@pytest.fixture(params=["inmemory", "sqlite"])
+def dead_letters(request: pytest.FixtureRequest) -> DeadLetterRepository:
+    if request.param == "sqlite":
+        return SQLiteDeadLetterRepository(sqlite3.connect(":memory:"))
+    return InMemoryDeadLetterRepository()
+
+
+def _bus(dead_letters: DeadLetterRepository, clock: FakeClock, max_attempts: int = 10) -> RetryingEventBus:
+    return RetryingEventBus(
+        delivery_bus=InMemoryEventBus(),
+        dead_letters=dead_letters,
+        clock=clock,
+        policy=RetryPolicy(base_delay=timedelta(seconds=1), factor=2, max_attempts=max_attempts),
+    )
+
+
+def test_retry_policy_backs_off_exponentially_up_to_max_delay() -> None:
+    policy = RetryPolicy(base_delay=timedelta(seconds=1), factor=2, max_delay=timedelta(seconds=5), max_attempts=5)
+
+    delays = [policy.next_delay(attempts) for attempts in range(1, 6)]
+
+    assert delays == [timedelta(seconds=1), timedelta(seconds=2), timedelta(seconds=4), timedelta(seconds=5), None]
+
+
+def test_failed_event_is_stored_and_retried_after_backoff(dead_letters: DeadLetterRepository) -> None:
+    clock = FakeClock(NOW)
+    bus = _bus(dead_letters, clock)
+    flaky = FlakyHandler(failures=2)
+    others: list[DomainEvent] = []
+    bus.subscribe(HabitCreated, flaky.on_event)
+    bus.subscribe(HabitCreated, others.append)
+    event = _created()
+
+    bus.publish(event)
+
+    # The failure neither propagates nor stops the other handlers.
+    assert others == [event]
+    [delivery] = dead_letters.list_all(10)
+    assert delivery.event == event
+    assert delivery.handler == "tests.test_dead_letters.FlakyHandler.on_event"
+    assert delivery.attempts == 1
+    assert "reminder store unavailable" in delivery.last_error
+    assert delivery.next_attempt_at == NOW + timedelta(seconds=1)
+
+    assert bus.retry_due().attempted == 0
+    clock.set(NOW + timedelta(seconds=1))
+    assert bus.retry_due().succeeded == 0
+    [delivery] = dead_letters.list_all(10)
+    assert delivery.attempts == 2
+    assert delivery.next_attempt_at == NOW + timedelta(seconds=3)
+
+    clock.set(NOW + timedelta(seconds=3))
+    result = bus.retry_due()
+
+    assert (result.attempted, result.succeeded) == (1, 1)
+    assert flaky.received == [event]
+    assert others == [event]
+    assert dead_letters.list_all(10) == []
+
+
+def test_exhausted_deliveries_wait_for_replay(dead_letters: DeadLetterRepository) -> None:
+    clock = FakeClock(NOW)
+    bus = _bus(dead_letters, clock, max_attempts=2)
+    flaky = FlakyHandler(failures=2)
+    bus.subscribe(HabitCreated, flaky.on_event)
+    bus.publish(_created())
+    clock.set(NOW + timedelta(hours=1))
+    bus.retry_due()
+
+    [delivery] = dead_letters.list_all(10)
+    assert (delivery.attempts, delivery.next_attempt_at) == (2, None)
+    clock.set(NOW + timedelta(days=1))
+    assert bus.retry_due().attempted == 0
+
+    result = bus.replay([delivery.id, delivery.id + 1])
+
+    assert (result.attempted, result.succeeded) == (1, 1)
+    assert len(flaky.received) == 1
+    assert dead_letters.list_all(10) == []
+
+
+def test_batch_handler_failures_are_retried_per_event(dead_letters: DeadLetterRepository) -> None:
+    clock = FakeClock(NOW)
+    bus = _bus(dead_letters, clock)
+    batches: list[list[HabitCompleted]] = []
+
+    def on_batch(events: Sequence[HabitCompleted]) -> None:
+        if not batches and len(events) > 1:
+            raise RuntimeError("boom")
+        batches.append(list(events))
+
+    bus.subscribe_batch(HabitCompleted, on_batch)
+    events = [HabitCompleted(occurred_at=NOW, habit_id=uuid4(), completed_at=NOW) for _ in range(2)]
+    bus.publish_many(events)
+
+    assert [delivery.event for delivery in dead_letters.list_all(10)] == events
+    assert bus.replay().succeeded == 2
+    assert batches == [[events[0]], [events[1]]]
+
+
+def test_writes_of_a_failed_handler_are_rolled_back_before_its_retry() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE side_effects (name TEXT NOT NULL)")
+    unit_of_work = SQLiteUnitOfWork(conn)
+    clock = FakeClock(NOW)
+    bus = RetryingEventBus(
+        delivery_bus=InMemoryEventBus(),
+        dead_letters=SQLiteDeadLetterRepository(conn),
+        clock=clock,
+        unit_of_work=unit_of_work,
+    )
+    failures = iter([True])
+
+    def write_then_fail(event: HabitCreated) -> None:
+        conn.execute("INSERT INTO side_effects (name) VALUES (?)", (event.name,))
+        if next(failures, False):
+            raise RuntimeError("boom")
+
+    bus.subscribe(HabitCreated, write_then_fail)
+    with unit_of_work.transaction():
+        conn.execute("INSERT INTO side_effects (name) VALUES ('publisher')")
+        bus.publish(_created())
+
+    # The publisher's write is kept, the handler's is not.
+    assert conn.execute("SELECT name FROM side_effects").fetchall() == [("publisher",)]
+    clock.set(NOW + timedelta(seconds=1))
+    assert bus.retry_due().succeeded == 1
+    assert conn.execute("SELECT name FROM side_effects").fetchall() == [("publisher",), ("Read",)]
+
+
+def test_subscribing_two_handlers_with_one_name_is_rejected() -> None:
+    bus = _bus(InMemoryDeadLetterRepository(), FakeClock(NOW))
+    bus.subscribe(HabitCreated, lambda event: None)
+
+    with pytest.raises(ValueError, match="already subscribed"):
+        bus.subscribe(HabitCreated, lambda event: None)
+
+
+def test_admin_endpoints_list_and_replay_dead_letters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HABIT_TRACKER_DATABASE_MODE", "inmemory")
+    monkeypatch.setenv("HABIT_TRACKER_EVENT_BUS_RETRY", "true")
+    monkeypatch.setenv("HABIT_TRACKER_ADMIN_EMAILS", '["admin@example.com"]')
+    get_settings.cache_clear()
+    try:
+        app = create_app()
+    finally:
+        get_settings.cache_clear()
+    client = TestClient(app)
+    tokens = {}
+    for email in ("admin@example.com", "user@example.com"):
+        client.post("/auth/register", json={"email": email, "password": "password"})
+        resp = client.post("/auth/login", json={"email": email, "password": "password"})
+        tokens[email] = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    flaky = FlakyHandler(failures=1)
+    app.state.retrying_event_bus.subscribe(HabitCreated, flaky.on_event)
+    habit = client.post("/habits", json={"name": "Read", "schedule": "daily"}, headers=tokens["admin@example.com"])
+    assert habit.status_code == 201
+
+    assert client.get("/admin/dead-letters", headers=tokens["user@example.com"]).status_code == 403
+    resp = client.get("/admin/dead-letters", headers=tokens["admin@example.com"])
+    assert resp.status_code == 200
+    [delivery] = resp.json()
+    assert delivery["event_type"] == "HabitCreated"
+    assert delivery["event"]["habit_id"] == habit.json()["id"]
+    assert delivery["attempts"] == 1
+
+    resp = client.post(
+        "/admin/dead-letters:replay", json={"ids": [delivery["id"]]}, headers=tokens["admin@example.com"]
+    )
+
+    assert resp.json() == {"attempted": 1, "succeeded": 1}
+    [received] = flaky.received
+    assert isinstance(received, HabitCreated)
+    assert received.habit_id == UUID(habit.json()["id"])
+    assert client.get("/admin/dead-letters", headers=tokens["admin@example.com"]).json() == []
@@ -4,7 +4,7 @@ from datetime import datetime
 from uuid import uuid4
 
 from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
-from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus, SafeInMemoryEventBus
 
 
 def test_event_bus_calls_subscribed_handler() -> None:
@@ -72,3 +72,49 @@ def test_handler_not_called_different_event() -> None:
     bus.publish(event)
 
     assert len(received) == 0
+
+
+def test_base_class_subscriber_receives_every_event() -> None:
+    bus = InMemoryEventBus()
+    calls: list[str] = []
+
+    bus.subscribe(DomainEvent, lambda event: calls.append(f"audit {type(event).__name__}"))
+    bus.subscribe(HabitCompleted, lambda event: calls.append("completed"))
+
+    bus.publish(HabitCompleted(datetime(2025, 1, 1), habit_id=uuid4(), completed_at=datetime(2025, 1, 1)))
+    bus.publish(HabitCreated(datetime(2025, 1, 1), habit_id=uuid4(), name="habit"))
+
+    # Handlers of the event's own class run before those of its base classes.
+    assert calls == ["completed", "audit HabitCompleted", "audit HabitCreated"]
+
+
+def test_subscribe_after_publish_invalidates_dispatch_cache() -> None:
+    for bus in (InMemoryEventBus(), SafeInMemoryEventBus()):
+        received: list[DomainEvent] = []
+        event = HabitCreated(datetime(2025, 1, 1), habit_id=uuid4(), name="habit")
+        bus.publish(event)
+
+        bus.subscribe(DomainEvent, received.append)
+        bus.publish(event)
+
+        assert received == [event]
+
+
+def test_publish_many_hands_batch_handlers_all_matching_events_at_once() -> None:
+    bus = InMemoryEventBus()
+    single: list[DomainEvent] = []
+    batches: list[list[DomainEvent]] = []
+    bus.subscribe(HabitCompleted, single.append)
+    bus.subscribe_batch(HabitCompleted, lambda events: batches.append(list(events)))
+
+    completed = [
+        HabitCompleted(datetime(2025, 1, 1), habit_id=uuid4(), completed_at=datetime(2025, 1, 1)) for _ in range(3)
+    ]
+    created = HabitCreated(datetime(2025, 1, 1), habit_id=uuid4(), name="habit")
+    bus.publish_many([completed[0], created, *completed[1:]])
+
+    assert single == completed
+    assert batches == [completed]
+
+    bus.publish(completed[0])
+    assert batches[-1] == [completed[0]]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from habit_tracker.application.event_bus import handler_name
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.infrastructure.event_bus import AsyncEventBus, InMemoryEventBus, SafeInMemoryEventBus
+from habit_tracker.infrastructure.event_bus_metrics import LATENCY_BUCKETS, InMemoryEventBusMetrics
+
+NOW = datetime(2025, 1, 1, 9, 0, 0)
+
+
+def _completed() -> HabitCompleted:
+    return HabitCompleted(occurred_at=NOW, habit_id=uuid4(), completed_at=NOW)
+
+
+def _failing(event: DomainEvent) -> None:
+    raise RuntimeError("boom")
+
+
+def test_records_calls_and_latency_per_event_type_and_handler() -> None:
+    metrics = InMemoryEventBusMetrics()
+    bus = InMemoryEventBus(metrics=metrics)
+    received: list[DomainEvent] = []
+
+    def audit(event: DomainEvent) -> None:
+        received.append(event)
+
+    bus.subscribe(DomainEvent, audit)
+    bus.publish(_completed())
+    bus.publish_many([_completed(), HabitCreated(occurred_at=NOW, habit_id=uuid4(), name="habit")])
+
+    stats = metrics.stats()
+    name = handler_name(audit)
+    assert set(stats) == {("HabitCompleted", name), ("HabitCreated", name)}
+    completed = stats[("HabitCompleted", name)]
+    assert completed.calls == 2
+    assert completed.errors == 0
+    assert sum(completed.buckets) == 2
+    assert len(completed.buckets) == len(LATENCY_BUCKETS) + 1
+    assert 0 < completed.mean_seconds <= completed.max_seconds
+    assert len(received) == 3
+
+
+def test_failure_is_recorded_as_dead_letter_and_still_raised() -> None:
+    metrics = InMemoryEventBusMetrics()
+    bus = InMemoryEventBus(metrics=metrics)
+    bus.subscribe(HabitCompleted, _failing)
+    event = _completed()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        bus.publish(event)
+
+    assert metrics.stats()[("HabitCompleted", handler_name(_failing))].errors == 1
+    [dead_letter] = metrics.dead_letters()
+    assert dead_letter.handler == "tests.test_event_bus_metrics._failing"
+    assert dead_letter.events == (event,)
+    assert dead_letter.error == "RuntimeError('boom')"
+    assert "in _failing" in dead_letter.traceback
+
+
+def test_safe_bus_logs_failures_and_runs_remaining_handlers(caplog: pytest.LogCaptureFixture) -> None:
+    metrics = InMemoryEventBusMetrics(max_dead_letters=2)
+    bus = SafeInMemoryEventBus(metrics=metrics)
+    received: list[DomainEvent] = []
+    bus.subscribe(HabitCompleted, _failing)
+    bus.subscribe(HabitCompleted, received.append)
+    events = [_completed() for _ in range(3)]
+
+    bus.publish_many(events)
+
+    assert received == events
+    assert "boom" in caplog.text
+    # Only the newest dead letters are kept.
+    assert [dead_letter.events for dead_letter in metrics.dead_letters()] == [(events[1],), (events[2],)]
+    assert metrics.slowest(1)[0][1].calls == 3
+
+
+def test_async_bus_records_batch_handlers_once_per_batch() -> None:
+    metrics = InMemoryEventBusMetrics()
+    bus = AsyncEventBus(workers=1, metrics=metrics)
+    batches: list[int] = []
+
+    def on_batch(events: Sequence[HabitCompleted]) -> None:
+        batches.append(len(events))
+
+    bus.subscribe_batch(HabitCompleted, on_batch)
+    bus.publish_many([_completed() for _ in range(5)])
+    bus.close()
+
+    assert batches == [5]
+    assert metrics.stats()[("HabitCompleted", handler_name(on_batch))].calls == 1
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from habit_tracker.application.projections import PARTITIONS, event_partition
+from habit_tracker.application.reminder_handlers import ReminderEventHandler
+from habit_tracker.application.repositories import EventStore
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure import sqlite_repositories
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.event_codec import encode_event, pack_event, unpack_event
+from habit_tracker.infrastructure.inmemory_repositories import InMemoryEventStore
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteEventStore,
+    SQLiteHabitRepository,
+    SQLiteReminderRepository,
+    SQLiteStreakRepository,
+    SQLiteUnitOfWork,
+    SQLiteUserRepository,
+)
+from habit_tracker.interfaces.cli import main as cli_main
+
+from tests.utils import FakeClock
+
+NOW = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+
+
+def test_packed_events_roundtrip_in_a_fraction_of_their_json() -> None:
+    events: list[DomainEvent] = [
+        HabitCreated(occurred_at=NOW, habit_id=uuid4(), name="Läsa"),
+        HabitCompleted(occurred_at=NOW.replace(tzinfo=None), habit_id=uuid4(), completed_at=NOW - timedelta(hours=1)),
+    ]
+    for event in events:
+        assert unpack_event(pack_event(event)) == event
+
+    completed = pack_event(events[1])
+    assert len(completed) * 3 < len(encode_event(events[1])[1])
+    with pytest.raises(ValueError):
+        unpack_event(b"\xff" + completed[1:])
+
+
+@pytest.fixture(params=["inmemory", "sqlite"])
+def event_store(request: pytest.FixtureRequest) -> EventStore:
+    if request.param == "sqlite":
+        return SQLiteEventStore(sqlite3.connect(":memory:"))
+    return InMemoryEventStore()
+
+
+def test_events_of_a_habit_are_read_from_its_partition_in_order(event_store: EventStore) -> None:
+    habit_ids = [UUID(int=n) for n in (1, 2, 1 + PARTITIONS)]
+    events = [
+        HabitCompleted(occurred_at=NOW, habit_id=habit_id, completed_at=NOW + timedelta(minutes=minute))
+        for minute in range(3)
+        for habit_id in habit_ids
+    ]
+    event_store.append_many(events)
+
+    assert [event_partition(event) for event in events[:3]] == [1, 2, 1]
+    first = event_store.read(1, after_position=0, limit=4)
+    rest = event_store.read(1, after_position=first[-1].position, limit=100)
+    assert [stored.event for stored in first + rest] == [event for event in events if event_partition(event) == 1]
+    assert [stored.event for stored in event_store.read(2, after_position=0, limit=100)] == events[1::3]
+    assert event_store.read(3, after_position=0, limit=100) == []
+
+
+def test_migration_seeds_the_store_with_existing_history(monkeypatch: pytest.MonkeyPatch) -> None:
+    conn = sqlite3.connect(":memory:")
+    with monkeypatch.context() as patch:
+        patch.setattr(sqlite_repositories, "_MIGRATIONS", sqlite_repositories._MIGRATIONS[:6])
+        clock = FakeClock(NOW)
+        user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+        SQLiteUserRepository(conn).add(user)
+        service = HabitTrackerService(
+            habit_repo=SQLiteHabitRepository(conn),
+            completion_repo=SQLiteCompletionRepository(conn),
+            clock=clock,
+            event_bus=InMemoryEventBus(),
+        )
+        habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=user.id)
+        clock.set(NOW + timedelta(days=1))
+        service.complete_habit(habit.id, user_id=user.id)
+
+    store = SQLiteEventStore(conn)
+    partition = habit.id.bytes[-1] % PARTITIONS
+
+    assert [stored.event for stored in store.read(partition, after_position=0, limit=10)] == [
+        HabitCreated(occurred_at=NOW, habit_id=habit.id, name="Read"),
+        HabitCompleted(occurred_at=NOW + timedelta(days=1), habit_id=habit.id, completed_at=NOW + timedelta(days=1)),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_rebuild_projections_replays_the_store(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], workers: int
+) -> None:
+    path = str(tmp_path / "habits.db")
+    pool = SQLiteConnectionPool(path)
+    clock = FakeClock(NOW)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    habit_repo, reminder_repo, streak_repo = (
+        SQLiteHabitRepository(pool),
+        SQLiteReminderRepository(pool),
+        SQLiteStreakRepository(pool),
+    )
+    event_bus = InMemoryEventBus()
+    reminder_handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+    event_bus.subscribe(HabitCreated, reminder_handler.on_habit_created)
+    event_bus.subscribe_batch(HabitCompleted, reminder_handler.on_habits_completed)
+    event_bus.subscribe_batch(DomainEvent, SQLiteEventStore(pool).append_many)
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=SQLiteCompletionRepository(pool),
+        reminder_repo=reminder_repo,
+        clock=clock,
+        event_bus=event_bus,
+        streak_projection=streak_repo,
+        unit_of_work=SQLiteUnitOfWork(pool),
+    )
+    habits = [service.create_habit(name=f"h{n}", schedule=Schedule("daily"), user_id=user.id) for n in range(20)]
+    for day in range(1, 4):
+        clock.set(NOW + timedelta(days=day, hours=day))
+        for habit in habits[day:]:
+            service.complete_habit(habit.id, user_id=user.id)
+
+    def projections() -> list[tuple[object, ...]]:
+        rows: list[tuple[object, ...]] = []
+        for habit in habits:
+            reminder = reminder_repo.get_by_habit_id(habit.id)
+            assert reminder is not None
+            rows.append((reminder.next_due_at, streak_repo.get_streak(habit), streak_repo.get_longest_streak(habit.id)))
+        return rows
+
+    before = projections()
+    pool.close()
+
+    assert cli_main(["--database-path", path, "rebuild-projections", "--workers", str(workers)]) == 0
+
+    assert projections() == before
+    assert "Rebuilt reminders, streaks from 74 events" in capsys.readouterr().out
+
+
+def test_replayed_streaks_count_out_of_order_and_duplicate_events_once(tmp_path: Path) -> None:
+    path = str(tmp_path / "habits.db")
+    pool = SQLiteConnectionPool(path)
+    monday = datetime(2025, 1, 6, 8, 0, 0, tzinfo=UTC)
+    clock = FakeClock(monday)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    event_store = SQLiteEventStore(pool)
+    event_bus = InMemoryEventBus()
+    event_bus.subscribe_batch(DomainEvent, event_store.append_many)
+    service = HabitTrackerService(
+        habit_repo=SQLiteHabitRepository(pool),
+        completion_repo=SQLiteCompletionRepository(pool),
+        clock=clock,
+        event_bus=event_bus,
+        unit_of_work=SQLiteUnitOfWork(pool),
+    )
+    habit = service.create_habit(name="Read", schedule=Schedule("times_per_week:3"), user_id=user.id)
+    clock.set(monday + timedelta(days=1))
+    service.complete_habit(habit.id, user_id=user.id)
+    # Monday's completion is synced offline after Tuesday's.
+    service.complete_habits_bulk([(habit.id, monday + timedelta(hours=2))], user_id=user.id)
+    clock.set(monday + timedelta(days=2))
+    wednesday = service.complete_habit(habit.id, user_id=user.id)
+    # The outbox may deliver an event twice.
+    event_store.append_many(
+        [HabitCompleted(occurred_at=wednesday.completed_at, habit_id=habit.id, completed_at=wednesday.completed_at)]
+    )
+    pool.close()
+
+    def streak_row() -> tuple[object, ...]:
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute(
+                """
+                SELECT current_streak, longest_streak, last_completed_at, period, period_completions, prior_periods
+                FROM habit_streaks WHERE habit_id = ?
+                """,
+                (habit.id.bytes,),
+            ).fetchone()
+        finally:
+            conn.close()
+
+    assert cli_main(["--database-path", path, "rebuild-projections", "--projection", "streaks", "--workers", "1"]) == 0
+    replayed = streak_row()
+    assert cli_main(["--database-path", path, "rebuild-streaks"]) == 0
+
+    assert replayed == streak_row()
+    # Three completions that week: the current period meets the target once.
+    assert (replayed[0], replayed[4]) == (1, 3)
+
+
+@pytest.mark.parametrize("workers", ["0", "-1", "two"])
+def test_rebuild_projections_rejects_bad_worker_counts_before_resetting(tmp_path: Path, workers: str) -> None:
+    path = str(tmp_path / "habits.db")
+    pool = SQLiteConnectionPool(path)
+    clock = FakeClock(NOW)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    habit_repo, reminder_repo = SQLiteHabitRepository(pool), SQLiteReminderRepository(pool)
+    event_bus = InMemoryEventBus()
+    reminder_handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+    event_bus.subscribe(HabitCreated, reminder_handler.on_habit_created)
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=SQLiteCompletionRepository(pool),
+        reminder_repo=reminder_repo,
+        clock=clock,
+        event_bus=event_bus,
+    )
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=user.id)
+    pool.close()
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli_main(["--database-path", path, "rebuild-projections", "--workers", workers])
+
+    assert exc_info.value.code == 2
+    assert reminder_repo.get_by_habit_id(habit.id) is not None
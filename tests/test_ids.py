@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain import Completion, Habit, User, UUIDv7Generator
+from habit_tracker.infrastructure.inmemory_repositories import (
+    InMemoryCompletionRepository,
+    InMemoryHabitRepository,
+)
+
+from .utils import FakeClock, test_schedule
+
+
+class CountingIdGenerator:
+    def __init__(self) -> None:
+        self.issued = 0
+
+    def new_id(self) -> UUID:
+        self.issued += 1
+        return UUID(int=self.issued)
+
+
+def test_uuid7_layout_and_timestamp() -> None:
+    before_ms = time.time_ns() // 1_000_000
+    value = UUIDv7Generator().new_id()
+    after_ms = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before_ms <= value.int >> 80 <= after_ms
+
+
+def test_uuid7_ids_strictly_increase(monkeypatch: pytest.MonkeyPatch) -> None:
+    generator = UUIDv7Generator()
+    ids = [generator.new_id() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert ids[0].bytes < ids[-1].bytes
+    assert len(set(ids)) == len(ids)
+
+    # A clock that steps back does not break the order.
+    monkeypatch.setattr(time, "time_ns", lambda: 0)
+    assert generator.new_id() > ids[-1]
+
+
+def test_factories_and_services_use_injected_generator() -> None:
+    ids = CountingIdGenerator()
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock, id_generator=ids)
+    habit, _event = Habit.create(name="Read", user_id=user.id, schedule=test_schedule, clock=clock, id_generator=ids)
+    completion, _completed = Completion.record(habit=habit, clock=clock, id_generator=ids)
+    assert [user.id, habit.id, completion.id] == [UUID(int=1), UUID(int=2), UUID(int=3)]
+
+    service = HabitTrackerService(
+        habit_repo=InMemoryHabitRepository(),
+        completion_repo=InMemoryCompletionRepository(),
+        clock=clock,
+        id_generator=ids,
+    )
+    habit = service.create_habit(name="Run", schedule=test_schedule, user_id=user.id)
+    assert habit.id == UUID(int=4)
+    assert service.complete_habit(habit.id, user_id=user.id).id == UUID(int=5)
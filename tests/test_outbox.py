@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from habit_tracker.application.outbox import OutboxEventBus, OutboxRelay
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain.events import DomainEvent, HabitCompleted, HabitCreated
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.event_codec import decode_event, encode_event
+from habit_tracker.infrastructure.inmemory_repositories import InMemoryOutboxRepository
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteOutboxRepository,
+    SQLiteReminderRepository,
+    SQLiteUnitOfWork,
+    SQLiteUserRepository,
+)
+from habit_tracker.interfaces.cli import main as cli_main
+
+from tests.utils import FakeClock
+
+NOW = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+
+
+def _service(pool: SQLiteConnectionPool, clock: FakeClock) -> tuple[HabitTrackerService, InMemoryEventBus]:
+    delivery_bus = InMemoryEventBus()
+    service = HabitTrackerService(
+        habit_repo=SQLiteHabitRepository(pool),
+        completion_repo=SQLiteCompletionRepository(pool),
+        clock=clock,
+        event_bus=OutboxEventBus(outbox=SQLiteOutboxRepository(pool), delivery_bus=delivery_bus),
+        unit_of_work=SQLiteUnitOfWork(pool),
+    )
+    return service, delivery_bus
+
+
+def test_event_codec_roundtrip() -> None:
+    events: list[DomainEvent] = [
+        HabitCreated(occurred_at=NOW, habit_id=uuid4(), name="Read"),
+        HabitCompleted(occurred_at=NOW.replace(tzinfo=None), habit_id=uuid4(), completed_at=NOW - timedelta(hours=1)),
+    ]
+    for event in events:
+        assert decode_event(*encode_event(event)) == event
+
+    with pytest.raises(ValueError):
+        decode_event("HabitDeleted", "{}")
+
+
+def test_events_are_stored_with_the_entity_and_relayed_in_batches(tmp_path: Path) -> None:
+    pool = SQLiteConnectionPool(str(tmp_path / "habits.db"))
+    clock = FakeClock(NOW)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    service, delivery_bus = _service(pool, clock)
+    received: list[DomainEvent] = []
+    delivery_bus.subscribe(HabitCreated, received.append)
+    delivery_bus.subscribe(HabitCompleted, received.append)
+
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=user.id)
+    service.complete_habit(habit.id, user_id=user.id)
+    assert received == []
+
+    outbox = SQLiteOutboxRepository(pool)
+    relay = OutboxRelay(
+        outbox=outbox, event_bus=delivery_bus, clock=clock, unit_of_work=SQLiteUnitOfWork(pool), batch_size=10
+    )
+    statements: list[str] = []
+    pool.connection().set_trace_callback(statements.append)
+    assert relay.relay_once() == 2
+    pool.connection().set_trace_callback(None)
+
+    assert [type(event) for event in received] == [HabitCreated, HabitCompleted]
+    assert sum(sql.strip().upper() == "COMMIT" for sql in statements) == 1
+    assert outbox.list_pending(10) == []
+    assert relay.relay_once() == 0
+    pool.close()
+
+
+def test_failed_delivery_is_retried() -> None:
+    outbox = InMemoryOutboxRepository()
+    bus = InMemoryEventBus()
+    events = [HabitCreated(occurred_at=NOW, habit_id=uuid4(), name=name) for name in ("a", "b", "c")]
+    for event in events:
+        outbox.add(event)
+    received: list[HabitCreated] = []
+    # b fails in the batch and again when the batch is retried one by one.
+    failures = iter([True, True])
+
+    def flaky(event: HabitCreated) -> None:
+        if event.name == "b" and next(failures, False):
+            raise RuntimeError("handler down")
+        received.append(event)
+
+    bus.subscribe(HabitCreated, flaky)
+    relay = OutboxRelay(outbox=outbox, event_bus=bus, clock=FakeClock(NOW))
+
+    assert relay.relay_once() == 1
+    assert [message.event for message in outbox.list_pending(10)] == events[1:]
+    assert relay.relay_once() == 2
+    # Without a unit of work, a's handler also ran in the failed batch: delivery is at least once.
+    assert received == [events[0], *events]
+
+
+def test_poison_event_is_set_aside_without_its_writes(tmp_path: Path) -> None:
+    pool = SQLiteConnectionPool(str(tmp_path / "habits.db"))
+    outbox = SQLiteOutboxRepository(pool)
+    conn = pool.connection()
+    conn.execute("CREATE TABLE side_effects (name TEXT NOT NULL)")
+    conn.commit()
+    outbox.add_many([HabitCreated(occurred_at=NOW, habit_id=uuid4(), name=name) for name in ("poison", "next")])
+    bus = InMemoryEventBus()
+
+    def write_then_fail(event: HabitCreated) -> None:
+        conn.execute("INSERT INTO side_effects (name) VALUES (?)", (event.name,))
+        if event.name == "poison":
+            raise RuntimeError("cannot handle this event")
+
+    bus.subscribe(HabitCreated, write_then_fail)
+    relay = OutboxRelay(
+        outbox=outbox, event_bus=bus, clock=FakeClock(NOW), unit_of_work=SQLiteUnitOfWork(pool), max_attempts=3
+    )
+
+    # The event behind the poison one waits until the poison one is given up on.
+    assert [relay.relay_once() for _ in range(3)] == [0, 0, 1]
+    assert conn.execute("SELECT name FROM side_effects").fetchall() == [("next",)]
+    assert outbox.list_pending(10) == []
+    attempts, failed, last_error = conn.execute(
+        "SELECT attempts, failed_at IS NOT NULL, last_error FROM outbox ORDER BY id LIMIT 1"
+    ).fetchone()
+    assert (attempts, failed) == (3, 1)
+    assert "cannot handle this event" in last_error
+    pool.close()
+
+
+def test_outbox_survives_restart_and_cli_relays_it(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    db_path = tmp_path / "habits.db"
+    pool = SQLiteConnectionPool(str(db_path))
+    clock = FakeClock(NOW)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    service, _delivery_bus = _service(pool, clock)
+    habits = [service.create_habit(name=f"Habit {i}", schedule=Schedule("daily"), user_id=user.id) for i in range(3)]
+    # The process dies before anything is delivered.
+    pool.close()
+
+    assert cli_main(["--database-path", str(db_path), "relay-outbox", "--drain"]) == 0
+    assert "Relayed 3 events" in capsys.readouterr().out
+
+    pool = SQLiteConnectionPool(str(db_path))
+    reminder_repo = SQLiteReminderRepository(pool)
+    assert all(reminder_repo.get_by_habit_id(habit.id) is not None for habit in habits)
+    assert SQLiteOutboxRepository(pool).list_pending(10) == []
+    pool.close()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import threading
+from datetime import UTC, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from habit_tracker.application import security
+from habit_tracker.application.security import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    calibrate_bcrypt_rounds,
+    hash_password,
+    password_needs_rehash,
+    set_bcrypt_rounds,
+)
+from habit_tracker.application.services import (
+    AuthenticationService,
+    EmailAlreadyRegisteredError,
+    UserRegistrationService,
+)
+from habit_tracker.application.token_cache import TokenCache
+from habit_tracker.domain.events import UserUpdated
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.inmemory_repositories import InMemoryUserRepository
+from habit_tracker.infrastructure.settings import get_settings
+
+from tests.utils import FakeClock
+
+# The package re-exports the FastAPI instance as `app`, shadowing the module.
+app_module = importlib.import_module("habit_tracker.interfaces.api.app")
+NOW = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+
+
+def test_async_registration_and_login_hash_on_the_hasher_threads() -> None:
+    repo = InMemoryUserRepository()
+    hasher = PasswordHasher(max_workers=2)
+    registration = UserRegistrationService(user_repo=repo, clock=FakeClock(NOW), password_hasher=hasher)
+    authentication = AuthenticationService(user_repo=repo, password_hasher=hasher)
+
+    async def scenario() -> None:
+        user = await registration.register_user_async("test@example.com", "password")
+        assert user.hashed_password != "password"
+        assert await authentication.authenticate_async("test@example.com", "password") == user
+        assert await authentication.authenticate_async("test@example.com", "wrong") is None
+        assert await authentication.authenticate_async("other@example.com", "password") is None
+        with pytest.raises(EmailAlreadyRegisteredError):
+            await registration.register_user_async("test@example.com", "password")
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hasher.close()
+
+
+def test_calls_beyond_max_pending_are_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+
+    def slow_hash(password: str) -> str:
+        release.wait(5)
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(security, "hash_password", slow_hash)
+    hasher = PasswordHasher(max_workers=1, max_pending=2)
+
+    async def scenario() -> list[str]:
+        running = [asyncio.create_task(hasher.hash(password)) for password in ("a", "b")]
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.hash("c")
+        release.set()
+        done = await asyncio.gather(*running)
+        # The finished calls gave their slots back.
+        return [*done, await hasher.hash("d")]
+
+    try:
+        assert asyncio.run(scenario()) == ["hashed:a", "hashed:b", "hashed:d"]
+    finally:
+        hasher.close()
+
+
+@pytest.fixture
+def pwd_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Let the test change the bcrypt cost without affecting the others."""
+    monkeypatch.setattr(security, "_pwd_context", security._pwd_context.copy())
+
+
+def test_calibration_stays_within_the_floor_and_the_ceiling() -> None:
+    calibrate = calibrate_bcrypt_rounds.__wrapped__
+
+    assert calibrate(0.0, min_rounds=4, max_rounds=6) == 4
+    assert calibrate(60.0, min_rounds=4, max_rounds=6) == 6
+
+
+def test_only_hashes_outside_the_bounds_need_a_rehash(pwd_context: None) -> None:
+    set_bcrypt_rounds(4, min_rounds=4, max_rounds=6)
+    cost_4 = hash_password("password")
+    set_bcrypt_rounds(5, min_rounds=4, max_rounds=6)
+    cost_5 = hash_password("password")
+
+    assert cost_5.startswith("$2b$05$")
+    # Processes calibrated to neighbouring costs keep each other's hashes.
+    assert password_needs_rehash(cost_4) is False
+    set_bcrypt_rounds(4, min_rounds=4, max_rounds=6)
+    assert password_needs_rehash(cost_5) is False
+
+    set_bcrypt_rounds(5, min_rounds=5, max_rounds=6)
+    assert password_needs_rehash(cost_4) is True
+
+
+def test_login_replaces_an_outdated_hash_in_the_background(pwd_context: None) -> None:
+    set_bcrypt_rounds(4, min_rounds=4)
+    repo = InMemoryUserRepository()
+    user = User.create(email="test@example.com", hashed_password=hash_password("password"), clock=FakeClock(NOW))
+    repo.add(user)
+    hasher = PasswordHasher(max_workers=1)
+    authentication = AuthenticationService(user_repo=repo, password_hasher=hasher)
+
+    assert asyncio.run(authentication.authenticate_async("test@example.com", "password")) == user
+    hasher.close()
+    assert repo.get(user.id) == user
+
+    # Raising the floor outdates the existing hash.
+    set_bcrypt_rounds(5, min_rounds=5)
+    hasher = PasswordHasher(max_workers=1)
+    authentication.password_hasher = hasher
+    assert asyncio.run(authentication.authenticate_async("test@example.com", "password")) == user
+    hasher.close()
+
+    rehashed = repo.get(user.id).hashed_password
+    assert rehashed.startswith("$2b$05$")
+    assert authentication.authenticate("test@example.com", "password") is not None
+    assert authentication.authenticate("test@example.com", "wrong") is None
+
+
+def test_a_rehashed_password_drops_the_users_cached_tokens(pwd_context: None) -> None:
+    set_bcrypt_rounds(4, min_rounds=4)
+    clock = FakeClock(NOW)
+    repo = InMemoryUserRepository()
+    bus = InMemoryEventBus()
+    cache = TokenCache(clock=clock)
+    bus.subscribe(UserUpdated, cache.on_user_changed)
+    registration = UserRegistrationService(user_repo=repo, clock=clock, event_bus=bus)
+    user = registration.register_user("test@example.com", "password")
+    cache.put("token", {"sub": str(user.id)}, user)
+
+    set_bcrypt_rounds(5, min_rounds=5)
+    hasher = PasswordHasher(max_workers=1)
+    authentication = AuthenticationService(user_repo=repo, password_hasher=hasher, user_registration=registration)
+    try:
+        assert asyncio.run(authentication.authenticate_async("test@example.com", "password")) == user
+    finally:
+        hasher.close()
+
+    assert repo.get(user.id).hashed_password.startswith("$2b$05$")
+    assert cache.get("token") is None
+
+
+def test_the_app_calibrates_when_it_starts_not_when_it_is_created(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HABIT_TRACKER_DATABASE_MODE", "inmemory")
+    calls: list[tuple[int, int, int]] = []
+    monkeypatch.setattr(app_module, "calibrate_bcrypt_rounds", lambda target, min_rounds, max_rounds: 14)
+    monkeypatch.setattr(
+        app_module,
+        "set_bcrypt_rounds",
+        lambda rounds, min_rounds, max_rounds: calls.append((rounds, min_rounds, max_rounds)),
+    )
+    get_settings.cache_clear()
+    try:
+        app = app_module.create_app()
+    finally:
+        get_settings.cache_clear()
+    assert calls == []
+
+    with TestClient(app):
+        pass
+
+    # The configured floor stays the floor, whatever this process calibrated to.
+    assert calls == [(14, 12, 16)]
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from habit_tracker.application.reminder_dispatcher import ReminderDispatcher
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.reminder import Reminder
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.inmemory_repositories import (
+    InMemoryHabitRepository,
+    InMemoryReminderRepository,
+)
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteHabitRepository,
+    SQLiteReminderRepository,
+    SQLiteUserRepository,
+)
+from habit_tracker.interfaces.cli import main as cli_main
+
+from tests.utils import FakeClock
+
+NOW = datetime(2025, 1, 10, 9, 0, 0, tzinfo=UTC)
+
+
+class RecordingNotifier:
+    def __init__(self, fail_for: set[UUID] | None = None) -> None:
+        self.delivered: list[UUID] = []
+        self._fail_for = fail_for or set()
+        self._lock = threading.Lock()
+
+    def notify(self, reminder: Reminder, habit: Habit) -> None:
+        if reminder.id in self._fail_for:
+            raise RuntimeError("delivery failed")
+        with self._lock:
+            self.delivered.append(reminder.id)
+
+
+def _add_habit_with_reminder(
+    habit_repo: InMemoryHabitRepository | SQLiteHabitRepository,
+    reminder_repo: InMemoryReminderRepository | SQLiteReminderRepository,
+    user_id: UUID,
+    due_at: datetime,
+) -> Reminder:
+    habit, _event = Habit.create(
+        name="Read", user_id=user_id, schedule=Schedule("daily"), clock=FakeClock(NOW - timedelta(days=30))
+    )
+    habit_repo.add(habit)
+    reminder = Reminder(id=uuid4(), habit_id=habit.id, next_due_at=due_at)
+    reminder_repo.add(reminder)
+    return reminder
+
+
+def test_dispatch_delivers_due_reminders_and_schedules_the_next_one() -> None:
+    habit_repo = InMemoryHabitRepository()
+    reminder_repo = InMemoryReminderRepository()
+    due = [
+        _add_habit_with_reminder(habit_repo, reminder_repo, UUID(int=1), NOW - timedelta(hours=h)) for h in (1, 2, 3)
+    ]
+    later = _add_habit_with_reminder(habit_repo, reminder_repo, UUID(int=1), NOW + timedelta(hours=1))
+
+    notifier = RecordingNotifier()
+    dispatcher = ReminderDispatcher(
+        reminder_repo=reminder_repo, habit_repo=habit_repo, notifier=notifier, clock=FakeClock(NOW), batch_size=2
+    )
+
+    assert dispatcher.dispatch_once() == 2
+    assert dispatcher.dispatch_once() == 1
+    assert dispatcher.dispatch_once() == 0
+
+    # Earliest first, each exactly once, and moved to the next day.
+    assert notifier.delivered == [r.id for r in reversed(due)]
+    for reminder in due:
+        stored = reminder_repo.get_by_habit_id(reminder.habit_id)
+        assert stored is not None
+        assert stored.next_due_at == NOW + timedelta(days=1)
+    assert reminder_repo.get_by_habit_id(later.habit_id) == later
+
+
+def test_failed_delivery_stays_leased_until_the_lease_expires() -> None:
+    habit_repo = InMemoryHabitRepository()
+    reminder_repo = InMemoryReminderRepository()
+    reminder = _add_habit_with_reminder(habit_repo, reminder_repo, UUID(int=1), NOW - timedelta(hours=1))
+    clock = FakeClock(NOW)
+
+    failing = ReminderDispatcher(
+        reminder_repo=reminder_repo,
+        habit_repo=habit_repo,
+        notifier=RecordingNotifier(fail_for={reminder.id}),
+        clock=clock,
+        lease=timedelta(minutes=5),
+        worker_id="failing",
+    )
+    notifier = RecordingNotifier()
+    other = ReminderDispatcher(
+        reminder_repo=reminder_repo, habit_repo=habit_repo, notifier=notifier, clock=clock, worker_id="other"
+    )
+
+    assert failing.dispatch_once() == 0
+    assert other.dispatch_once() == 0
+
+    clock.set(NOW + timedelta(minutes=5))
+    assert other.dispatch_once() == 1
+    assert notifier.delivered == [reminder.id]
+
+
+@pytest.mark.parametrize("database", ["inmemory", "sqlite"])
+def test_next_due_at_stored_during_the_lease_is_kept(database: str) -> None:
+    habit_repo: InMemoryHabitRepository | SQLiteHabitRepository
+    reminder_repo: InMemoryReminderRepository | SQLiteReminderRepository
+    if database == "sqlite":
+        conn = sqlite3.connect(":memory:")
+        habit_repo, reminder_repo = SQLiteHabitRepository(conn), SQLiteReminderRepository(conn)
+        user = User.create(email="test@example.com", hashed_password="hashed", clock=FakeClock(NOW))
+        SQLiteUserRepository(conn).add(user)
+        user_id = user.id
+    else:
+        habit_repo, reminder_repo, user_id = InMemoryHabitRepository(), InMemoryReminderRepository(), UUID(int=1)
+    reminder = _add_habit_with_reminder(habit_repo, reminder_repo, user_id, NOW - timedelta(hours=1))
+    completed_due_at = NOW + timedelta(days=3)
+
+    class CompletingNotifier:
+        def notify(self, reminder: Reminder, habit: Habit) -> None:
+            # The habit is completed while its reminder is being delivered.
+            reminder_repo.add(Reminder(id=reminder.id, habit_id=habit.id, next_due_at=completed_due_at))
+
+    clock = FakeClock(NOW)
+    dispatcher = ReminderDispatcher(
+        reminder_repo=reminder_repo, habit_repo=habit_repo, notifier=CompletingNotifier(), clock=clock
+    )
+
+    assert dispatcher.dispatch_once() == 1
+
+    stored = reminder_repo.get_by_habit_id(reminder.habit_id)
+    assert stored is not None
+    assert stored.next_due_at == completed_due_at
+    # The lease was released all the same.
+    clock.set(completed_due_at)
+    assert dispatcher.dispatch_once() == 1
+
+
+def test_concurrent_sqlite_workers_never_deliver_twice(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "habits.db")
+    setup = sqlite3.connect(db_path)
+    habit_repo = SQLiteHabitRepository(setup)
+    reminder_repo = SQLiteReminderRepository(setup)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=FakeClock(NOW))
+    SQLiteUserRepository(setup).add(user)
+    due = [_add_habit_with_reminder(habit_repo, reminder_repo, user.id, NOW - timedelta(minutes=m)) for m in range(300)]
+    setup.close()
+
+    notifier = RecordingNotifier()
+    errors: list[BaseException] = []
+
+    def work() -> None:
+        conn = sqlite3.connect(db_path, timeout=10)
+        try:
+            dispatcher = ReminderDispatcher(
+                reminder_repo=SQLiteReminderRepository(conn),
+                habit_repo=SQLiteHabitRepository(conn),
+                notifier=notifier,
+                clock=FakeClock(NOW),
+                batch_size=7,
+            )
+            while dispatcher.dispatch_once() > 0:
+                pass
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            conn.close()
+
+    workers = [threading.Thread(target=work) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    counts = Counter(notifier.delivered)
+    assert set(counts) == {r.id for r in due}
+    assert max(counts.values()) == 1
+
+
+def test_dispatch_cli_reports_throughput(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    db_path = tmp_path / "habits.db"
+    conn = sqlite3.connect(db_path)
+    habit_repo = SQLiteHabitRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=FakeClock(NOW))
+    SQLiteUserRepository(conn).add(user)
+    for minutes in range(5):
+        _add_habit_with_reminder(habit_repo, reminder_repo, user.id, datetime.now(tz=UTC) - timedelta(minutes=minutes))
+
+    assert cli_main(["--database-path", str(db_path), "dispatch-reminders", "--drain"]) == 0
+
+    assert "Dispatched 5 reminders" in capsys.readouterr().out
+    assert reminder_repo.list_due(datetime.now(tz=UTC)) == []
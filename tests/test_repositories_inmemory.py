@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import random
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from habit_tracker.domain.completion import Completion
 from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.reminder import Reminder
 from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
 from habit_tracker.infrastructure.inmemory_repositories import (
     InMemoryCompletionRepository,
     InMemoryHabitRepository,
+    InMemoryReminderRepository,
+    InMemoryUserRepository,
 )
 
 from tests.utils import FakeClock
@@ -62,6 +68,46 @@ def test_inmemory_habit_repository_remove() -> None:
     assert habit not in all_habits
 
 
+def test_inmemory_habit_repository_user_index() -> None:
+    repo = InMemoryHabitRepository()
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+
+    first = _create_habit(clock)
+    second = _create_habit(clock)
+    moved = _create_habit(clock)
+    for habit in (first, second, moved):
+        repo.add(habit)
+
+    # Re-adding a habit under another user moves it between the indexes.
+    repo.add(replace(moved, user_id=UUID(int=2)))
+    assert repo.list_by_user_id(UUID(int=1)) == [first, second]
+    assert [h.id for h in repo.list_by_user_id(UUID(int=2))] == [moved.id]
+    assert repo.get_by_user_id(UUID(int=1)) == first
+
+    repo.remove(first.id)
+    repo.remove(second.id)
+    assert repo.list_by_user_id(UUID(int=1)) == []
+    assert repo.get_by_user_id(UUID(int=1)) is None
+
+
+def test_inmemory_user_repository_email_index() -> None:
+    repo = InMemoryUserRepository()
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+
+    user = User.create(email="a@example.com", hashed_password="hashed", clock=clock)
+    repo.add(user)
+    assert repo.get_by_email("a@example.com") == user
+    assert repo.get_by_email("b@example.com") is None
+
+    renamed = replace(user, email="b@example.com")
+    repo.add(renamed)
+    assert repo.get_by_email("a@example.com") is None
+    assert repo.get_by_email("b@example.com") == renamed
+
+    repo.remove(user.id)
+    assert repo.get_by_email("b@example.com") is None
+
+
 def test_inmemory_completion_repository_basic_queries() -> None:
     habit_repo = InMemoryHabitRepository()
     completion_repo = InMemoryCompletionRepository()
@@ -90,3 +136,87 @@ def test_inmemory_completion_repository_basic_queries() -> None:
         end=end,
     )
     assert between == [c1]
+
+    newest_first = list(completion_repo.iter_for_habit_newest_first(habit.id))
+    assert newest_first == [c2, c1]
+    assert completion_repo.get_latest_for_habit(habit.id) == c2
+
+
+def test_inmemory_completion_repository_keeps_habits_sorted() -> None:
+    completion_repo = InMemoryCompletionRepository()
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    habit = _create_habit(clock)
+    other = _create_habit(clock)
+
+    # Completions arrive out of order and interleaved with another habit.
+    for day in (3, 0, 4, 1, 2):
+        clock.set(datetime(2025, 1, 1, 9, 0, 0) + timedelta(days=day))
+        completion_repo.add(_record_completion(habit, clock))
+        completion_repo.add(_record_completion(other, clock))
+
+    completed_at = [c.completed_at for c in completion_repo.list_for_habit(habit.id)]
+    assert completed_at == sorted(completed_at)
+    assert all(c.habit_id == habit.id for c in completion_repo.list_for_habit(habit.id))
+
+    between = completion_repo.list_for_habit_between(
+        habit_id=habit.id,
+        start=datetime(2025, 1, 2, 9, 0, 0),
+        end=datetime(2025, 1, 4, 9, 0, 0),
+    )
+    assert [c.completed_at.day for c in between] == [2, 3, 4]
+
+    latest = completion_repo.get_latest_for_habit(habit.id)
+    assert latest is not None
+    assert latest.completed_at == datetime(2025, 1, 5, 9, 0, 0)
+    assert completion_repo.get_latest_for_habit(UUID(int=99)) is None
+    assert completion_repo.list_for_habit_between(UUID(int=99), start=datetime.min, end=datetime.max) == []
+
+
+def test_inmemory_reminder_repository_due_index_matches_scan() -> None:
+    rng = random.Random(5)
+    repo = InMemoryReminderRepository()
+    start = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+    habit_ids = [UUID(int=i) for i in range(50)]
+    current: dict[UUID, Reminder] = {}
+
+    for step in range(2000):
+        habit_id = rng.choice(habit_ids)
+        reminder = Reminder(
+            id=UUID(int=10_000 + step),
+            habit_id=habit_id,
+            next_due_at=start + timedelta(hours=rng.randint(0, 24 * 30)),
+            active=rng.random() > 0.1,
+        )
+        repo.add(reminder)
+        current[habit_id] = reminder
+
+        if step % 100 == 0:
+            before = start + timedelta(hours=rng.randint(0, 24 * 30))
+            expected = [r for r in current.values() if r.active and r.next_due_at <= before]
+            due = repo.list_due(before)
+            assert sorted(due, key=lambda r: r.id) == sorted(expected, key=lambda r: r.id)
+            assert [r.next_due_at for r in due] == sorted(r.next_due_at for r in due)
+
+    # Overwritten entries are dropped once they pile up.
+    assert len(repo._due_heap) <= 2 * len(habit_ids) + 64
+
+
+def test_inmemory_reminder_repository_pages_due_reminders() -> None:
+    repo = InMemoryReminderRepository()
+    due_at = datetime(2025, 1, 2, 9, 0, 0, tzinfo=UTC)
+    for i in range(7):
+        # Several reminders share a due time; the id breaks the tie.
+        repo.add(Reminder(id=UUID(int=100 - i), habit_id=UUID(int=i), next_due_at=due_at + timedelta(hours=i // 3)))
+
+    before = due_at + timedelta(days=1)
+    everything = repo.list_due(before)
+    assert [(r.next_due_at, r.id) for r in everything] == sorted((r.next_due_at, r.id) for r in everything)
+
+    pages: list[list[Reminder]] = []
+    after = None
+    while page := repo.list_due(before, limit=3, after=after):
+        pages.append(page)
+        after = (page[-1].next_due_at, page[-1].id)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [r for page in pages for r in page] == everything
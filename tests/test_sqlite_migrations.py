@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from habit_tracker.infrastructure import sqlite_repositories
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteReminderRepository,
+    SQLiteUserRepository,
+)
+
+
+def test_text_database_is_migrated_to_compact_columns(monkeypatch: pytest.MonkeyPatch) -> None:
+    conn = sqlite3.connect(":memory:")
+    with monkeypatch.context() as patch:
+        patch.setattr(sqlite_repositories, "_MIGRATIONS", sqlite_repositories._MIGRATIONS[:3])
+        SQLiteUserRepository(conn)
+
+    # Rows as versions before 4 stored them: UUIDs and datetimes as text.
+    user_id, habit_id, reminder_id = uuid4(), uuid4(), uuid4()
+    created_at = datetime(2025, 1, 1, 9, 0, 0)
+    completed_at = datetime(2025, 1, 2, 9, 30, 0, 250, tzinfo=timezone(timedelta(hours=2)))
+    conn.execute(
+        "INSERT INTO users VALUES (?, ?, ?, ?, 1)", (str(user_id), "a@example.com", "hashed", created_at.isoformat())
+    )
+    conn.execute(
+        "INSERT INTO habits VALUES (?, ?, 'Read', 'daily', ?, 1)", (str(habit_id), str(user_id), created_at.isoformat())
+    )
+    conn.execute("INSERT INTO completions VALUES (?, ?, ?)", (str(uuid4()), str(habit_id), completed_at.isoformat()))
+    conn.execute(
+        "INSERT INTO reminders VALUES (?, ?, ?, 1, 'worker', ?)",
+        (str(reminder_id), str(habit_id), created_at.isoformat(), (created_at + timedelta(hours=1)).isoformat()),
+    )
+    conn.execute("INSERT INTO habit_streaks VALUES (?, 1, 1, ?, 0, 1, 0)", (str(habit_id), completed_at.isoformat()))
+    conn.commit()
+
+    habit_repo = SQLiteHabitRepository(conn)
+    completion_repo = SQLiteCompletionRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+
+    assert conn.execute("PRAGMA user_version").fetchone() == (len(sqlite_repositories._MIGRATIONS),)
+    assert conn.execute("PRAGMA foreign_keys").fetchone() == (1,)
+    assert conn.execute("SELECT typeof(id), typeof(completed_at) FROM completions").fetchone() == ("blob", "integer")
+    assert conn.execute("SELECT typeof(lease_expires_at) FROM reminders").fetchone() == ("integer",)
+
+    assert SQLiteUserRepository(conn).get(user_id).created_at == created_at
+    assert habit_repo.list_by_user_id(user_id) == [habit_repo.get(habit_id)]
+    [completion] = completion_repo.list_for_habit(habit_id)
+    assert completion.completed_at == completed_at
+    # The offset is not kept: the row now counts for its UTC date.
+    assert completion.completed_at.tzinfo == UTC
+    assert completion.completed_at.date() == completed_at.astimezone(UTC).date()
+    reminder = reminder_repo.get_by_habit_id(habit_id)
+    assert reminder is not None and reminder.id == reminder_id
+    # The copied lease is still honoured.
+    assert reminder_repo.claim_due(created_at, 10, "other", created_at + timedelta(minutes=1)) == []
+
+    # Cascades survive the rebuilt tables.
+    SQLiteUserRepository(conn).remove(user_id)
+    assert conn.execute("SELECT count(*) FROM completions").fetchone() == (0,)
+    assert conn.execute("SELECT count(*) FROM habit_streaks").fetchone() == (0,)
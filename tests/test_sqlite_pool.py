@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.sqlite_pool import SQLiteConnectionPool
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteUnitOfWork,
+    SQLiteUserRepository,
+)
+
+from tests.utils import FakeClock
+
+
+@pytest.fixture
+def pool(tmp_path: Path):
+    pool = SQLiteConnectionPool(str(tmp_path / "habits.db"), busy_timeout_ms=1234, mmap_size=1 << 20, cache_size=-4096)
+    yield pool
+    pool.close()
+
+
+def _create_habit(pool: SQLiteConnectionPool, clock: FakeClock) -> Habit:
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(pool).add(user)
+    habit, _event = Habit.create(name="Read", user_id=user.id, schedule=Schedule("daily"), clock=clock)
+    SQLiteHabitRepository(pool).add(habit)
+    return habit
+
+
+def test_pool_gives_each_thread_its_own_configured_connection(pool: SQLiteConnectionPool) -> None:
+    conn = pool.connection()
+    assert pool.connection() is conn
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(pool.connection).result()
+    assert other is not conn
+
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone() == (1234,)
+    assert conn.execute("PRAGMA cache_size").fetchone() == (-4096,)
+    assert conn.execute("PRAGMA mmap_size").fetchone() == (1 << 20,)
+    assert conn.execute("PRAGMA foreign_keys").fetchone() == (1,)
+
+
+def test_connection_of_finished_thread_is_closed(pool: SQLiteConnectionPool) -> None:
+    opened: list[sqlite3.Connection] = []
+    thread = threading.Thread(target=lambda: opened.append(pool.connection()))
+    thread.start()
+    thread.join()
+
+    pool.connection()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+
+
+def test_reads_are_not_blocked_by_an_open_write(pool: SQLiteConnectionPool) -> None:
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    habit = _create_habit(pool, clock)
+    completion_repo = SQLiteCompletionRepository(pool)
+
+    write_open = threading.Event()
+    release = threading.Event()
+
+    def hold_write_transaction() -> None:
+        with SQLiteUnitOfWork(pool).transaction():
+            completion, _event = Completion.record(habit=habit, clock=clock)
+            completion_repo.add(completion)
+            write_open.set()
+            release.wait(timeout=5)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        writer = executor.submit(hold_write_transaction)
+        assert write_open.wait(timeout=5)
+
+        # The reader sees the last committed state instead of waiting for the writer.
+        assert completion_repo.list_for_habit(habit.id) == []
+
+        release.set()
+        writer.result()
+
+    assert len(completion_repo.list_for_habit(habit.id)) == 1
+
+
+def test_concurrent_writes_from_many_threads(pool: SQLiteConnectionPool) -> None:
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    habit = _create_habit(pool, clock)
+    completion_repo = SQLiteCompletionRepository(pool)
+
+    completions = [
+        Completion.record(habit=habit, clock=FakeClock(clock.now() + timedelta(hours=i)))[0] for i in range(50)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(completion_repo.add, completions))
+
+    assert len(completion_repo.list_for_habit(habit.id)) == 50
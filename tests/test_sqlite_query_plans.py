@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.reminder import Reminder
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteDeadLetterRepository,
+    SQLiteEventStore,
+    SQLiteHabitRepository,
+    SQLiteOutboxRepository,
+    SQLiteReminderRepository,
+    SQLiteStreakRepository,
+    SQLiteUserRepository,
+)
+
+from tests.utils import FakeClock
+
+
+def _capture_queries(conn: sqlite3.Connection) -> list[str]:
+    """Run every lookup the repositories offer and return the SQL they issued.
+
+    list_all() is left out on purpose: it reads the whole table.
+    """
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    habit_repo = SQLiteHabitRepository(conn)
+    completion_repo = SQLiteCompletionRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+    streak_repo = SQLiteStreakRepository(conn)
+    user_repo = SQLiteUserRepository(conn)
+    outbox = SQLiteOutboxRepository(conn)
+    dead_letters = SQLiteDeadLetterRepository(conn)
+    event_store = SQLiteEventStore(conn)
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    user_repo.add(user)
+    habit, _created = Habit.create(name="Read", user_id=user.id, schedule=Schedule("daily"), clock=clock)
+    habit_repo.add(habit)
+    outbox.add(_created)
+    dead_letters.add(_created, "handler", "error", clock.now(), clock.now())
+    event_store.append_many([_created])
+    for day in range(3):
+        clock.set(datetime(2025, 1, 1, 9, 0, 0) + timedelta(days=day))
+        completion, _completed = Completion.record(habit=habit, clock=clock)
+        completion_repo.add(completion)
+    reminder_repo.add(Reminder(id=uuid4(), habit_id=habit.id, next_due_at=clock.now()))
+
+    user_repo.get(user.id)
+    user_repo.get_by_email(user.email)
+    habit_repo.get(habit.id)
+    habit_repo.get_many([habit.id, uuid4()])
+    habit_repo.get_by_user_id(user.id)
+    habit_repo.list_by_user_id(user.id)
+    completion_repo.list_for_habit(habit.id)
+    completion_repo.list_for_habit_between(habit.id, start=clock.now() - timedelta(days=1), end=clock.now())
+    list(completion_repo.iter_for_habit_newest_first(habit.id))
+    reminder_repo.get_by_habit_id(habit.id)
+    reminder_repo.get_many_by_habit_ids([habit.id])
+    reminder_repo.list_due(before=clock.now())
+    claimed = reminder_repo.claim_due(now=clock.now(), limit=10, worker_id="w", lease_until=clock.now())
+    reminder_repo.complete_claimed("w", [(reminder, clock.now()) for reminder in claimed])
+    streak_repo.get_streak(habit)
+    streak_repo.get_longest_streak(habit.id)
+    outbox.record_failure(1, "error", clock.now(), give_up=False)
+    outbox.mark_delivered([message.id for message in outbox.list_pending(10)], clock.now())
+    for delivery in dead_letters.list_due(clock.now(), 10):
+        dead_letters.record_failure(delivery.id, "error", clock.now(), None)
+    dead_letters.get_many([1, 2])
+    dead_letters.list_all(10, after_id=1)
+    dead_letters.remove(1)
+    event_store.read(habit.id.bytes[-1], after_position=0, limit=10)
+    habit_repo.remove(habit.id)
+    user_repo.remove(user.id)
+
+    conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))]
+
+
+def test_migrations_record_schema_version() -> None:
+    conn = sqlite3.connect(":memory:")
+    SQLiteHabitRepository(conn)
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+
+    # Opening the same database again is a no-op.
+    SQLiteCompletionRepository(conn)
+
+    assert version >= 1
+    assert conn.execute("PRAGMA user_version").fetchone() == (version,)
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {
+        "ix_completions_habit_id_completed_at",
+        "ix_habits_user_id",
+        "ix_reminders_active_next_due_at_id",
+        "ix_outbox_pending",
+        "ix_dead_letters_due",
+        "ix_event_store_partition_position",
+    } <= indexes
+
+
+def test_repository_queries_use_an_index() -> None:
+    conn = sqlite3.connect(":memory:")
+    queries = _capture_queries(conn)
+    assert queries
+
+    for sql in queries:
+        plan = [detail for *_ids, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        for detail in plan:
+            if detail.startswith("SCAN") and "INDEX" not in detail:
+                pytest.fail(f"full table scan ({detail}) for query: {' '.join(sql.split())}")
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import sqlite3
 from datetime import datetime, timedelta
+from uuid import uuid4
 
+from habit_tracker.application.reminder_handlers import ReminderEventHandler
 from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.events import HabitCompleted
 from habit_tracker.domain.habit import Habit
 from habit_tracker.domain.reminder import Reminder
 from habit_tracker.domain.schedule import Schedule
@@ -103,6 +106,10 @@ def test_sqlite_completion_repository_roundtrip() -> None:
     )
     assert [c.completed_at for c in between] == [c1.completed_at]
 
+    newest_first = list(completion_repo.iter_for_habit_newest_first(habit.id))
+    assert newest_first == [c2, c1]
+    assert completion_repo.get_latest_for_habit(habit.id) == c2
+
 
 def test_sqlite_reminder_repository_roundtrip() -> None:
     conn = _make_connection()
@@ -153,6 +160,37 @@ def test_sqlite_reminder_repository_roundtrip() -> None:
     assert any(r.habit_id == habit.id for r in due)
 
 
+def test_sqlite_reminder_repository_pages_due_reminders() -> None:
+    conn = _make_connection()
+    reminder_repo = SQLiteReminderRepository(conn)
+    habit_repo = SQLiteHabitRepository(conn)
+    user_repo = SQLiteUserRepository(conn)
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    user_repo.add(user)
+
+    due_times = [datetime(2025, 1, 2, 9, 0, 0)] * 3 + [datetime(2025, 1, 2, 10, 0, 0)] * 2
+    due_times.append(datetime(2025, 1, 9, 9, 0, 0))  # not due yet
+    for i, due_at in enumerate(due_times):
+        habit, _ = Habit.create(name=f"Habit {i}", user_id=user.id, schedule=Schedule("daily"), clock=clock)
+        habit_repo.add(habit)
+        reminder_repo.add(Reminder(id=uuid4(), habit_id=habit.id, next_due_at=due_at))
+
+    before = datetime(2025, 1, 3, 0, 0, 0)
+    everything = reminder_repo.list_due(before)
+    assert [(r.next_due_at, r.id) for r in everything] == sorted((r.next_due_at, r.id) for r in everything)
+    assert len(everything) == 5
+
+    pages: list[list[Reminder]] = []
+    after = None
+    while page := reminder_repo.list_due(before, limit=2, after=after):
+        pages.append(page)
+        after = (page[-1].next_due_at, page[-1].id)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [r for page in pages for r in page] == everything
+
+
 def test_sqlite_user_repository_roundtrip() -> None:
     conn = _make_connection()
     user_repo = SQLiteUserRepository(conn)
@@ -174,3 +212,62 @@ def test_sqlite_user_repository_roundtrip() -> None:
     user_repo.remove(user.id)
     all_after_remove = user_repo.list_all()
     assert user not in all_after_remove
+
+
+def test_reminder_batch_handler_uses_one_round_trip_per_table() -> None:
+    conn = _make_connection()
+    habit_repo = SQLiteHabitRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+    user_repo = SQLiteUserRepository(conn)
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    user_repo.add(user)
+    habits = [
+        Habit.create(name=f"Habit {i}", user_id=user.id, schedule=Schedule("daily"), clock=clock)[0] for i in range(3)
+    ]
+    for habit in habits:
+        habit_repo.add(habit)
+    reminder_repo.add(Reminder(id=uuid4(), habit_id=habits[0].id, next_due_at=datetime(2025, 1, 1)))
+
+    assert habit_repo.get_many([habits[0].id, uuid4()]) == {habits[0].id: habits[0]}
+
+    handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+    events = [
+        HabitCompleted(occurred_at=clock.now(), habit_id=habit.id, completed_at=clock.now())
+        for habit in (*habits, habits[0])
+    ]
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    handler.on_habits_completed(events)
+    conn.set_trace_callback(None)
+
+    assert sum("FROM habits" in sql for sql in statements) == 1
+    assert sum("FROM reminders" in sql for sql in statements) == 1
+    assert sum(sql.strip().upper() == "COMMIT" for sql in statements) == 1
+    reminders = reminder_repo.get_many_by_habit_ids(habit.id for habit in habits)
+    assert {habit_id: r.next_due_at for habit_id, r in reminders.items()} == {
+        habit.id: datetime(2025, 1, 2, 9, 0, 0) for habit in habits
+    }
+
+
+def test_reminder_batch_handler_skips_unknown_habits() -> None:
+    conn = _make_connection()
+    habit_repo = SQLiteHabitRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    SQLiteUserRepository(conn).add(user)
+    habit, _created = Habit.create(name="Read", user_id=user.id, schedule=Schedule("daily"), clock=clock)
+    habit_repo.add(habit)
+    handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+
+    handler.on_habits_completed(
+        [
+            HabitCompleted(occurred_at=clock.now(), habit_id=habit_id, completed_at=clock.now())
+            for habit_id in (uuid4(), habit.id)
+        ]
+    )
+
+    reminder = reminder_repo.get_by_habit_id(habit.id)
+    assert reminder is not None
+    assert reminder.next_due_at == datetime(2025, 1, 2, 9, 0, 0)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.streak_factory import make_streak_rule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteStreakRepository,
+    SQLiteUserRepository,
+)
+from habit_tracker.interfaces.cli import main as cli_main
+
+from tests.utils import FakeClock
+
+
+def _setup(
+    conn: sqlite3.Connection, schedule: str = "daily"
+) -> tuple[HabitTrackerService, SQLiteStreakRepository, Habit, FakeClock]:
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    user_repo = SQLiteUserRepository(conn)
+    habit_repo = SQLiteHabitRepository(conn)
+    streak_repo = SQLiteStreakRepository(conn)
+
+    user = User.create(email="test@example.com", hashed_password="hashed", clock=clock)
+    user_repo.add(user)
+
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=SQLiteCompletionRepository(conn),
+        clock=clock,
+        streak_projection=streak_repo,
+    )
+    habit = service.create_habit(name="Read", schedule=Schedule(schedule), user_id=user.id)
+    return service, streak_repo, habit, clock
+
+
+def test_materialized_streak_matches_rule_and_tracks_longest() -> None:
+    rng = random.Random(11)
+
+    for schedule in ("daily", "times_per_week:2"):
+        conn = sqlite3.connect(":memory:")
+        service, streak_repo, habit, clock = _setup(conn, schedule)
+        rule = make_streak_rule(habit.schedule)
+
+        longest = 0
+        when = clock.now()
+        for _ in range(120):
+            when += timedelta(hours=rng.choice([3, 22, 26, 60]))
+            clock.set(when)
+            service.complete_habit(habit.id, user_id=habit.user_id)
+
+            completions = service.completion_repo.list_for_habit(habit.id)
+            expected = rule.calculate(habit=habit, completions=completions, now=when)
+            longest = max(longest, expected.count)
+
+            assert streak_repo.get_streak(habit) == expected
+            assert streak_repo.get_longest_streak(habit.id) == longest
+
+
+def test_streak_read_is_a_single_lookup() -> None:
+    conn = sqlite3.connect(":memory:")
+    service, _streak_repo, habit, clock = _setup(conn)
+    for day in range(3):
+        clock.set(datetime(2025, 1, 1, 9, 0, 0) + timedelta(days=day))
+        service.complete_habit(habit.id, user_id=habit.user_id)
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    streak = service.calculate_streak(habit.id, user_id=habit.user_id)
+    conn.set_trace_callback(None)
+
+    assert streak.count == 3
+    assert not any("FROM completions" in sql for sql in statements)
+    assert sum("FROM habit_streaks" in sql for sql in statements) == 1
+
+
+def test_out_of_order_completion_recomputes_streak() -> None:
+    conn = sqlite3.connect(":memory:")
+    service, streak_repo, habit, clock = _setup(conn)
+    day1 = datetime(2025, 1, 1, 9, 0, 0)
+
+    for when in (day1, day1 + timedelta(days=2)):
+        clock.set(when)
+        service.complete_habit(habit.id, user_id=habit.user_id)
+    assert streak_repo.get_longest_streak(habit.id) == 1
+
+    # The missing day 2 arrives late and joins both days into one run.
+    clock.set(day1 + timedelta(days=1))
+    completion, _event = Completion.record(habit=habit, clock=clock)
+    service.completion_repo.add(completion)
+
+    streak = streak_repo.get_streak(habit)
+    assert streak is not None
+    assert streak.count == 3
+    assert streak.last_completed_at == day1 + timedelta(days=2)
+    assert streak_repo.get_longest_streak(habit.id) == 3
+
+
+def test_rebuild_command_restores_table(tmp_path: Path) -> None:
+    db_path = tmp_path / "habits.db"
+    conn = sqlite3.connect(db_path)
+    service, streak_repo, habit, clock = _setup(conn)
+    for day in range(4):
+        clock.set(datetime(2025, 1, 1, 9, 0, 0) + timedelta(days=day))
+        service.complete_habit(habit.id, user_id=habit.user_id)
+    expected = streak_repo.get_streak(habit)
+
+    conn.execute("DELETE FROM habit_streaks")
+    conn.commit()
+    assert streak_repo.get_streak(habit) is None
+    # Without a row the service still answers from the completion history.
+    assert service.calculate_streak(habit.id, user_id=habit.user_id) == expected
+
+    assert cli_main(["--database-path", str(db_path), "rebuild-streaks"]) == 0
+
+    assert streak_repo.get_streak(habit) == expected
+    assert streak_repo.get_longest_streak(habit.id) == 4
+
+
+def test_add_many_writes_in_one_commit_and_updates_streaks() -> None:
+    conn = sqlite3.connect(":memory:")
+    service, streak_repo, habit, clock = _setup(conn)
+    day1 = datetime(2025, 1, 1, 9, 0, 0)
+    clock.set(day1 + timedelta(days=4))
+    service.complete_habit(habit.id, user_id=habit.user_id)
+
+    # Days 1-3 arrive late, in one batch and out of order; day 5 already exists.
+    late = [
+        Completion.record(habit=habit, clock=clock, completed_at=day1 + timedelta(days=d))[0] for d in (2, 0, 1)
+    ]
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    service.completion_repo.add_many(late)
+    conn.set_trace_callback(None)
+
+    assert sum(sql.strip().upper() == "COMMIT" for sql in statements) == 1
+    assert len(service.completion_repo.list_for_habit(habit.id)) == 4
+    assert streak_repo.get_longest_streak(habit.id) == 3
+
+    # A batch of newer completions advances the stored state in place.
+    clock.set(day1 + timedelta(days=6))
+    newer = [Completion.record(habit=habit, clock=clock, completed_at=day1 + timedelta(days=d))[0] for d in (6, 5)]
+    service.completion_repo.add_many(newer)
+
+    streak = streak_repo.get_streak(habit)
+    assert streak is not None
+    assert streak.count == 3
+    assert streak.last_completed_at == day1 + timedelta(days=6)
+
+
+def test_aware_completions_count_for_their_utc_date() -> None:
+    conn = sqlite3.connect(":memory:")
+    _service, streak_repo, habit, _clock = _setup(conn)
+    completion_repo = SQLiteCompletionRepository(conn)
+    # 2025-01-02 locally, but 2025-01-01 in UTC, as the row stores it.
+    tokyo_morning = datetime(2025, 1, 2, 1, 0, 0, tzinfo=timezone(timedelta(hours=9)))
+    completion_repo.add(
+        Completion(id=uuid4(), habit_id=habit.id, completed_at=datetime(2025, 1, 1, 10, 0, 0, tzinfo=UTC))
+    )
+    completion_repo.add(Completion(id=uuid4(), habit_id=habit.id, completed_at=tokyo_morning))
+
+    assert completion_repo.list_for_habit(habit.id)[-1].completed_at == datetime(2025, 1, 1, 16, 0, 0, tzinfo=UTC)
+    live = streak_repo.get_streak(habit)
+    assert live is not None and live.count == 1
+    streak_repo.rebuild()
+    assert streak_repo.get_streak(habit) == live
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+from habit_tracker.application.reminder_handlers import ReminderEventHandler
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.domain.events import HabitCompleted, HabitCreated
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.sqlite_repositories import (
+    SQLiteCompletionRepository,
+    SQLiteHabitRepository,
+    SQLiteReminderRepository,
+    SQLiteUnitOfWork,
+    SQLiteUserRepository,
+)
+
+from tests.utils import FakeClock
+
+
+def _make_service(conn: sqlite3.Connection, with_unit_of_work: bool) -> tuple[HabitTrackerService, InMemoryEventBus]:
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+    habit_repo = SQLiteHabitRepository(conn)
+    reminder_repo = SQLiteReminderRepository(conn)
+    event_bus = InMemoryEventBus()
+
+    handler = ReminderEventHandler(habit_repo=habit_repo, reminder_repo=reminder_repo, clock=clock)
+    event_bus.subscribe(HabitCreated, handler.on_habit_created)
+    event_bus.subscribe(HabitCompleted, handler.on_habit_completed)
+
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=SQLiteCompletionRepository(conn),
+        reminder_repo=reminder_repo,
+        clock=clock,
+        event_bus=event_bus,
+        unit_of_work=SQLiteUnitOfWork(conn) if with_unit_of_work else None,
+    )
+    return service, event_bus
+
+
+def _create_user(conn: sqlite3.Connection) -> User:
+    user = User.create(
+        email="test@example.com",
+        hashed_password="hashed",
+        clock=FakeClock(datetime(2025, 1, 1, 9, 0, 0)),
+    )
+    SQLiteUserRepository(conn).add(user)
+    return user
+
+
+def _count_commits(conn: sqlite3.Connection, action) -> int:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        conn.set_trace_callback(None)
+    return sum(sql.strip().upper() == "COMMIT" for sql in statements)
+
+
+@pytest.mark.parametrize(("with_unit_of_work", "expected_commits"), [(False, 2), (True, 1)])
+def test_complete_habit_commits_once(with_unit_of_work: bool, expected_commits: int) -> None:
+    conn = sqlite3.connect(":memory:")
+    service, _bus = _make_service(conn, with_unit_of_work)
+    user = _create_user(conn)
+
+    create_commits = _count_commits(
+        conn, lambda: service.create_habit(name="Read", schedule=Schedule("daily"), user_id=user.id)
+    )
+    habit = service.list_habits_for_user(user.id)[0]
+    complete_commits = _count_commits(conn, lambda: service.complete_habit(habit.id, user_id=user.id))
+
+    assert create_commits == expected_commits
+    assert complete_commits == expected_commits
+    assert len(service.completion_repo.list_for_habit(habit.id)) == 1
+    assert service.get_reminder(habit.id) is not None
+
+
+def test_failing_handler_rolls_back_the_whole_call() -> None:
+    conn = sqlite3.connect(":memory:")
+    service, event_bus = _make_service(conn, with_unit_of_work=True)
+    user = _create_user(conn)
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=user.id)
+    reminder_before = service.get_reminder(habit.id)
+
+    def fail(event: HabitCompleted) -> None:
+        raise RuntimeError("handler failed")
+
+    event_bus.subscribe(HabitCompleted, fail)
+
+    with pytest.raises(RuntimeError):
+        service.complete_habit(habit.id, user_id=user.id)
+
+    assert service.completion_repo.list_for_habit(habit.id) == []
+    assert service.get_reminder(habit.id) == reminder_before
+
+
+def test_nested_units_commit_with_the_outermost() -> None:
+    conn = sqlite3.connect(":memory:")
+    unit_of_work = SQLiteUnitOfWork(conn)
+    user_repo = SQLiteUserRepository(conn)
+    clock = FakeClock(datetime(2025, 1, 1, 9, 0, 0))
+
+    def write_two_users() -> None:
+        with unit_of_work.transaction():
+            user_repo.add(User.create(email="a@example.com", hashed_password="x", clock=clock))
+            with unit_of_work.transaction():
+                user_repo.add(User.create(email="b@example.com", hashed_password="x", clock=clock))
+            assert conn.in_transaction
+
+    assert _count_commits(conn, write_two_users) == 1
+    assert not conn.in_transaction
+    assert len(user_repo.list_all()) == 2
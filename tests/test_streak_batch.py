@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.streak_rules import (
+    AtLeastNDaysInLastMDaysRule,
+    CompletionBatch,
+    DailyStreakRule,
+    TimesPerWeekStreakRule,
+)
+
+from tests.utils import FakeClock
+
+pytest.importorskip("numpy")
+
+
+def _make_habits_and_completions(start: datetime, n_habits: int, seed: int) -> tuple[list[Habit], list[Completion]]:
+    rng = random.Random(seed)
+    clock = FakeClock(start)
+    habits: list[Habit] = []
+    completions: list[Completion] = []
+
+    for _ in range(n_habits):
+        habit, _created = Habit.create(
+            name="Habit",
+            user_id=UUID(int=1),
+            schedule=Schedule("daily"),
+            clock=clock,
+        )
+        habits.append(habit)
+
+        when = start
+        for _ in range(rng.randint(0, 60)):
+            when += timedelta(hours=rng.choice([2, 20, 26, 40, 90]))
+            clock.set(when)
+            completion, _completed = Completion.record(habit=habit, clock=clock)
+            completions.append(completion)
+        clock.set(start)
+
+    # Completions arrive in no particular order.
+    rng.shuffle(completions)
+    return habits, completions
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        DailyStreakRule(),
+        TimesPerWeekStreakRule(times_per_week=1),
+        TimesPerWeekStreakRule(times_per_week=3),
+        AtLeastNDaysInLastMDaysRule(n=3, m=7),
+    ],
+)
+@pytest.mark.parametrize("tz", [None, UTC])
+def test_batch_matches_scalar_rule(rule, tz) -> None:
+    start = datetime(2024, 12, 20, 7, 0, 0, tzinfo=tz)
+    habits, completions = _make_habits_and_completions(start, n_habits=40, seed=7)
+    batch = CompletionBatch.from_completions([h.id for h in habits], completions)
+
+    for now in (start + timedelta(days=20), start + timedelta(days=60), start + timedelta(days=200)):
+        expected = [rule.calculate(habit=h, completions=completions, now=now) for h in habits]
+        assert rule.calculate_batch(batch, now=now) == expected
+
+
+def test_batch_with_no_completions() -> None:
+    habit_ids = [UUID(int=1), UUID(int=2)]
+    batch = CompletionBatch.from_completions(habit_ids, [])
+
+    streaks = DailyStreakRule().calculate_batch(batch, now=datetime(2025, 1, 1))
+
+    assert [s.habit_id for s in streaks] == habit_ids
+    assert all(s.count == 0 and s.last_completed_at is None for s in streaks)
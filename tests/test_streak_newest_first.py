@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.habit import Habit
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.streak_rules import DailyStreakRule, TimesPerWeekStreakRule
+
+from tests.utils import FakeClock
+
+
+class CountingIterator:
+    """Wraps an iterable and counts how many items were pulled from it."""
+
+    def __init__(self, items: Iterable[Completion]) -> None:
+        self._items = iter(items)
+        self.pulled = 0
+
+    def __iter__(self) -> Iterator[Completion]:
+        return self
+
+    def __next__(self) -> Completion:
+        item = next(self._items)
+        self.pulled += 1
+        return item
+
+
+def _create_habit(clock: FakeClock, schedule: str) -> Habit:
+    habit, _event = Habit.create(
+        name="Habit",
+        user_id=UUID(int=1),
+        schedule=Schedule(schedule),
+        clock=clock,
+    )
+    return habit
+
+
+def _newest_first(completions: list[Completion]) -> list[Completion]:
+    return sorted(completions, key=lambda c: c.completed_at, reverse=True)
+
+
+def test_daily_streak_reads_only_the_current_run() -> None:
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    clock = FakeClock(start)
+    habit = _create_habit(clock, "daily")
+
+    # Five years of daily completions, a missed day, then a 3-day streak.
+    completions: list[Completion] = []
+    for day in range(5 * 365):
+        completions.append(Completion(id=UUID(int=day), habit_id=habit.id, completed_at=start + timedelta(days=day)))
+    streak_start = start + timedelta(days=5 * 365 + 1)
+    for day in range(3):
+        completions.append(
+            Completion(id=UUID(int=10_000 + day), habit_id=habit.id, completed_at=streak_start + timedelta(days=day))
+        )
+
+    rule = DailyStreakRule()
+    now = streak_start + timedelta(days=2, hours=1)
+    rows = CountingIterator(_newest_first(completions))
+
+    streak = rule.streak_from_state(rule.state_from_newest_first(habit.id, rows, now=now))
+
+    assert streak.count == 3
+    assert streak.last_completed_at == streak_start + timedelta(days=2)
+    # The 3 streak days plus the first row past the gap.
+    assert rows.pulled == 4
+
+
+@pytest.mark.parametrize(
+    ("schedule", "rule"),
+    [
+        ("daily", DailyStreakRule()),
+        ("times_per_week:1", TimesPerWeekStreakRule(times_per_week=1)),
+        ("times_per_week:3", TimesPerWeekStreakRule(times_per_week=3)),
+    ],
+)
+def test_newest_first_matches_full_calculation(schedule, rule) -> None:
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1, 8, 0, 0)
+    clock = FakeClock(start)
+    habit = _create_habit(clock, schedule)
+
+    completions: list[Completion] = []
+    when = start
+    for i in range(300):
+        when += timedelta(hours=rng.choice([2, 20, 26, 40, 100]))
+        completions.append(Completion(id=UUID(int=i), habit_id=habit.id, completed_at=when))
+
+    for now in (start + timedelta(days=30), start + timedelta(days=200), when):
+        expected = rule.calculate(habit=habit, completions=completions, now=now)
+        state = rule.state_from_newest_first(habit.id, _newest_first(completions), now=now)
+        assert rule.streak_from_state(state) == expected
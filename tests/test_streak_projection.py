@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from habit_tracker.application.services import HabitTrackerService
+from habit_tracker.application.streak_projection import StreakProjection
+from habit_tracker.domain.completion import Completion
+from habit_tracker.domain.events import HabitCompleted, HabitCreated
+from habit_tracker.domain.schedule import Schedule
+from habit_tracker.domain.streak_factory import make_streak_rule
+from habit_tracker.infrastructure import (
+    InMemoryCompletionRepository,
+    InMemoryEventBus,
+    InMemoryHabitRepository,
+)
+
+from tests.utils import FakeClock
+
+
+class CountingCompletionRepository(InMemoryCompletionRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.history_reads = 0
+
+    def iter_for_habit_newest_first(self, habit_id: UUID) -> Iterator[Completion]:
+        self.history_reads += 1
+        return super().iter_for_habit_newest_first(habit_id)
+
+
+def _make_service(
+    start_time: datetime,
+) -> tuple[HabitTrackerService, CountingCompletionRepository, FakeClock]:
+    clock = FakeClock(start_time)
+    habit_repo = InMemoryHabitRepository()
+    completion_repo = CountingCompletionRepository()
+    bus = InMemoryEventBus()
+    projection = StreakProjection(habit_repo=habit_repo, completion_repo=completion_repo)
+    bus.subscribe(HabitCreated, projection.on_habit_created)
+    bus.subscribe(HabitCompleted, projection.on_habit_completed)
+
+    service = HabitTrackerService(
+        habit_repo=habit_repo,
+        completion_repo=completion_repo,
+        clock=clock,
+        event_bus=bus,
+        streak_projection=projection,
+    )
+    return service, completion_repo, clock
+
+
+def test_projection_matches_full_calculation() -> None:
+    rng = random.Random(42)
+    start_time = datetime(2025, 1, 1, 8, 0, 0)
+
+    for raw in ("daily", "times_per_week:1", "times_per_week:3"):
+        service, completion_repo, clock = _make_service(start_time)
+        habit = service.create_habit(name="Habit", schedule=Schedule(raw), user_id=UUID(int=1))
+        rule = make_streak_rule(habit.schedule)
+
+        when = start_time
+        for _ in range(200):
+            when += timedelta(hours=rng.choice([1, 5, 20, 30, 50, 200]))
+            clock.set(when)
+            service.complete_habit(habit.id, user_id=UUID(int=1))
+
+            expected = rule.calculate(habit, completion_repo.list_for_habit(habit.id), now=when)
+            assert service.calculate_streak(habit.id, user_id=UUID(int=1)) == expected, raw
+
+
+def test_streak_read_does_not_rescan_completions() -> None:
+    start_time = datetime(2025, 1, 1, 8, 0, 0)
+    service, completion_repo, clock = _make_service(start_time)
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+
+    for day in range(3):
+        clock.set(start_time + timedelta(days=day))
+        service.complete_habit(habit.id, user_id=UUID(int=1))
+
+    streak = service.calculate_streak(habit.id, user_id=UUID(int=1))
+
+    assert streak.count == 3
+    assert completion_repo.history_reads == 0
+
+
+def test_untracked_habit_is_rebuilt_once_then_tracked() -> None:
+    start_time = datetime(2025, 1, 1, 8, 0, 0)
+    service, completion_repo, clock = _make_service(start_time)
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+    assert service.streak_projection is not None
+
+    # Simulate a restart: the projection starts empty while history exists.
+    service.streak_projection = StreakProjection(habit_repo=service.habit_repo, completion_repo=completion_repo)
+    service.complete_habit(habit.id, user_id=UUID(int=1))
+
+    assert service.calculate_streak(habit.id, user_id=UUID(int=1)).count == 1
+    assert completion_repo.history_reads == 1
+
+    clock.set(start_time + timedelta(days=1))
+    completion, event = Completion.record(habit=habit, clock=clock)
+    completion_repo.add(completion)
+    service.streak_projection.on_habit_completed(event)
+
+    assert service.calculate_streak(habit.id, user_id=UUID(int=1)).count == 2
+    assert completion_repo.history_reads == 1
+
+
+def test_out_of_order_completion_triggers_rebuild() -> None:
+    start_time = datetime(2025, 1, 10, 8, 0, 0)
+    service, completion_repo, clock = _make_service(start_time)
+    habit = service.create_habit(name="Read", schedule=Schedule("daily"), user_id=UUID(int=1))
+    service.complete_habit(habit.id, user_id=UUID(int=1))
+
+    # A completion for the previous day arrives late.
+    clock.set(start_time - timedelta(days=1))
+    service.complete_habit(habit.id, user_id=UUID(int=1))
+
+    streak = service.calculate_streak(habit.id, user_id=UUID(int=1))
+
+    assert streak.count == 2
+    assert streak.last_completed_at == start_time
+    assert completion_repo.history_reads == 1
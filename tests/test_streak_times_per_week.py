@@ -108,3 +108,21 @@ def test_times_per_week_break_when_week_below_threshold() -> None:
 
     # Only current week counts; previous week breaks the chain.
     assert streak.count == 1
+
+
+def test_times_per_week_counts_first_week_starting_later_in_the_week() -> None:
+    first_friday = datetime(2025, 1, 10, 9, 0, 0)
+    next_monday = datetime(2025, 1, 13, 9, 0, 0)
+
+    clock = FakeClock(first_friday)
+    habit = _create_habit(clock, times_per_week=1)
+
+    completions = [_record_completion(habit, clock)]
+    clock.set(next_monday)
+    completions.append(_record_completion(habit, clock))
+
+    rule = TimesPerWeekStreakRule(times_per_week=1)
+    streak = rule.calculate(habit=habit, completions=completions, now=next_monday)
+
+    # The first week only had a Friday completion but still met the target.
+    assert streak.count == 2
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import importlib
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from habit_tracker.application.services import IncorrectPasswordError, UserRegistrationService
+from habit_tracker.application.token_cache import TokenCache
+from habit_tracker.domain.events import DomainEvent, UserDeactivated, UserUpdated
+from habit_tracker.domain.user import User
+from habit_tracker.infrastructure.event_bus import InMemoryEventBus
+from habit_tracker.infrastructure.event_codec import pack_event, unpack_event
+from habit_tracker.infrastructure.inmemory_repositories import InMemoryUserRepository
+from habit_tracker.infrastructure.settings import get_settings
+from habit_tracker.interfaces.api.app import create_app
+
+from tests.utils import FakeClock
+
+# The package re-exports the FastAPI instance as `app`, shadowing the module.
+app_module = importlib.import_module("habit_tracker.interfaces.api.app")
+NOW = datetime(2025, 1, 1, 9, 0, 0, tzinfo=UTC)
+
+
+def _user(clock: FakeClock, email: str = "test@example.com") -> User:
+    return User.create(email=email, hashed_password="hashed", clock=clock)
+
+
+def _claims(user: User, expires_in: timedelta) -> dict[str, Any]:
+    return {"sub": str(user.id), "exp": int((NOW + expires_in).timestamp())}
+
+
+def test_entries_expire_at_the_token_exp_or_after_the_ttl() -> None:
+    clock = FakeClock(NOW)
+    cache = TokenCache(clock=clock, ttl=600)
+    user = _user(clock)
+    cache.put("short", _claims(user, timedelta(minutes=5)), user)
+    cache.put("long", _claims(user, timedelta(hours=1)), user)
+
+    cached = cache.get("short")
+    assert cached is not None
+    assert cached.user == user
+    assert cached.claims["sub"] == str(user.id)
+
+    clock.set(NOW + timedelta(minutes=5))
+    assert cache.get("short") is None
+    assert cache.get("long") is not None
+    clock.set(NOW + timedelta(minutes=10))
+    assert cache.get("long") is None
+    assert len(cache) == 0
+
+
+def test_by_default_a_change_elsewhere_goes_unnoticed_for_at_most_30_seconds() -> None:
+    clock = FakeClock(NOW)
+    # Another worker process's cache: it never sees this process's events.
+    cache = TokenCache(clock=clock)
+    user = _user(clock)
+    cache.put("token", _claims(user, timedelta(hours=1)), user)
+
+    clock.set(NOW + timedelta(seconds=29))
+    assert cache.get("token") is not None
+    clock.set(NOW + timedelta(seconds=30))
+    assert cache.get("token") is None
+    with pytest.raises(ValueError):
+        TokenCache(clock=clock, ttl=0)
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    clock = FakeClock(NOW)
+    cache = TokenCache(clock=clock, max_size=2)
+    users = [_user(clock, f"user{n}@example.com") for n in range(3)]
+    cache.put("a", _claims(users[0], timedelta(hours=1)), users[0])
+    cache.put("b", _claims(users[1], timedelta(hours=1)), users[1])
+    assert cache.get("a") is not None
+
+    cache.put("c", _claims(users[2], timedelta(hours=1)), users[2])
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_user_events_drop_the_users_tokens_and_stale_puts() -> None:
+    clock = FakeClock(NOW)
+    repo = InMemoryUserRepository()
+    bus = InMemoryEventBus()
+    published: list[DomainEvent] = []
+    bus.subscribe(DomainEvent, published.append)
+    cache = TokenCache(clock=clock)
+    bus.subscribe(UserUpdated, cache.on_user_changed)
+    bus.subscribe(UserDeactivated, cache.on_user_changed)
+    service = UserRegistrationService(user_repo=repo, clock=clock, event_bus=bus)
+    user = service.register_user("test@example.com", "password")
+    other = service.register_user("other@example.com", "password")
+    for token, owner in (("t1", user), ("t2", user), ("t3", other)):
+        cache.put(token, _claims(owner, timedelta(hours=1)), owner)
+
+    with pytest.raises(IncorrectPasswordError):
+        service.change_password(user.id, "wrong", "new-password")
+    assert cache.get("t1") is not None
+
+    service.change_password(user.id, "password", "new-password")
+
+    assert (cache.get("t1"), cache.get("t2")) == (None, None)
+    assert cache.get("t3") is not None
+
+    generation = cache.generation
+    service.deactivate_user(other.id)
+    cache.put("t3", _claims(other, timedelta(hours=1)), other, generation)
+
+    assert cache.get("t3") is None
+    assert repo.get(other.id).is_active is False
+    assert published == [
+        UserUpdated(occurred_at=NOW, user_id=user.id),
+        UserDeactivated(occurred_at=NOW, user_id=other.id),
+    ]
+    for event in published:
+        assert unpack_event(pack_event(event)) == event
+
+
+def test_api_decodes_a_token_once_until_its_user_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HABIT_TRACKER_DATABASE_MODE", "inmemory")
+    monkeypatch.setenv("HABIT_TRACKER_ADMIN_EMAILS", '["admin@example.com"]')
+    get_settings.cache_clear()
+    try:
+        client = TestClient(create_app())
+    finally:
+        get_settings.cache_clear()
+    decoded: list[str] = []
+    decode = app_module.decode_access_token
+
+    def counting_decode(token: str, secret_key: str, algorithm: str) -> dict[str, Any]:
+        decoded.append(token)
+        return decode(token, secret_key, algorithm)
+
+    monkeypatch.setattr(app_module, "decode_access_token", counting_decode)
+    headers = {}
+    for email in ("admin@example.com", "user@example.com"):
+        client.post("/auth/register", json={"email": email, "password": "password"})
+        resp = client.post("/auth/login", json={"email": email, "password": "password"})
+        headers[email] = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    user_headers = headers["user@example.com"]
+
+    for _ in range(3):
+        assert client.get("/me", headers=user_headers).status_code == 200
+    assert len(decoded) == 1
+
+    wrong = {"current_password": "wrong", "new_password": "changed"}
+    assert client.put("/me/password", json=wrong, headers=user_headers).status_code == 403
+    assert len(decoded) == 1
+    change = {"current_password": "password", "new_password": "changed"}
+    assert client.put("/me/password", json=change, headers=user_headers).status_code == 204
+    assert client.get("/me", headers=user_headers).status_code == 200
+    assert len(decoded) == 2
+    login = {"email": "user@example.com", "password": "changed"}
+    assert client.post("/auth/login", json=login).status_code == 200
+
+    user_id = client.get("/me", headers=user_headers).json()["id"]
+    resp = client.post(f"/admin/users/{user_id}:deactivate", headers=headers["admin@example.com"])
+    assert resp.status_code == 200
+    assert resp.json()["is_active"] is False
+
+    assert client.get("/me", headers=user_headers).status_code == 403